@@ -0,0 +1,218 @@
+"""Benchmarks for fitting groups of power spectra."""
+
+import time
+import tracemalloc
+from multiprocessing import cpu_count
+
+import numpy as np
+
+from specparam import SpectralGroupModel
+from specparam.models.utils import fit_settings_sweep
+from specparam.algorithms.definitions import ALGORITHMS
+
+from .utils import sim_group, sim_group_clumped
+
+###################################################################################################
+###################################################################################################
+
+class TimeGroupFit:
+    """Throughput of fitting a group of power spectra, across the number of jobs."""
+
+    params = ([1, 4, -1],)
+    param_names = ['n_jobs']
+    timeout = 300
+
+    n_spectra = 200
+
+    def setup(self, n_jobs):
+
+        if n_jobs > cpu_count():
+            raise NotImplementedError("Not enough cores available for this benchmark.")
+
+        self.freqs, self.powers = sim_group(self.n_spectra)
+        self.group = SpectralGroupModel(max_n_peaks=4, verbose=False)
+
+    def time_fit(self, n_jobs):
+
+        self.group.fit(self.freqs, self.powers, n_jobs=n_jobs)
+
+
+class TimeGroupAlgorithm:
+    """Throughput of fitting a group of power spectra, across fit algorithms and group sizes."""
+
+    params = (list(ALGORITHMS), [50, 500], ['fixed', 'knee'])
+    param_names = ['algorithm', 'n_spectra', 'aperiodic_mode']
+    timeout = 300
+
+    def setup(self, algorithm, n_spectra, aperiodic_mode):
+
+        self.freqs, self.powers = sim_group(n_spectra, aperiodic_mode)
+        self.group = SpectralGroupModel(aperiodic_mode=aperiodic_mode, algorithm=algorithm,
+                                        max_n_peaks=4, verbose=False)
+
+    def time_fit(self, algorithm, n_spectra, aperiodic_mode):
+
+        self.group.fit(self.freqs, self.powers)
+
+
+class TimeGroupRefit:
+    """Time to re-fit a group of power spectra after changing a peak setting, with caching."""
+
+    params = ([False, True],)
+    param_names = ['cache']
+    timeout = 300
+
+    n_spectra = 200
+
+    def setup(self, cache):
+
+        self.freqs, self.powers = sim_group(self.n_spectra)
+        self.group = SpectralGroupModel(max_n_peaks=4, verbose=False, cache=cache)
+        self.group.fit(self.freqs, self.powers)
+
+    def time_refit(self, cache):
+
+        # Change the setting to a new value for each run, such that peaks are always re-fit
+        self.group.algorithm.settings.peak_threshold += 0.01
+        self.group.fit(self.freqs, self.powers)
+
+
+class TimeSettingsSweep:
+    """Time to fit a group of power spectra across a grid of settings, with and without a sweep."""
+
+    params = (['sweep', 'separate'],)
+    param_names = ['method']
+    timeout = 300
+
+    n_spectra = 100
+    settings = {'peak_width_limits' : [[1, 6], [2, 8]], 'peak_threshold' : [1.5, 2., 2.5]}
+
+    def setup(self, method):
+
+        self.freqs, self.powers = sim_group(self.n_spectra)
+        self.group = SpectralGroupModel(max_n_peaks=4, verbose=False)
+        self.group.add_data(self.freqs, self.powers)
+
+    def time_fit(self, method):
+
+        if method == 'sweep':
+            fit_settings_sweep(self.group, self.settings)
+        else:
+            for width in self.settings['peak_width_limits']:
+                for threshold in self.settings['peak_threshold']:
+                    self.group.algorithm.settings.peak_width_limits = width
+                    self.group.algorithm.settings.peak_threshold = threshold
+                    self.group.fit()
+
+
+class TimeGroupDedup:
+    """Throughput of fitting a group of power spectra with repeated spectra, with deduplication."""
+
+    params = ([False, True], [0, 0.5, 0.9])
+    param_names = ['dedup', 'duplicate_fraction']
+    timeout = 300
+
+    n_spectra = 200
+
+    def setup(self, dedup, duplicate_fraction):
+
+        self.freqs, self.powers = sim_group(self.n_spectra)
+        n_duplicates = int(duplicate_fraction * self.n_spectra)
+        if n_duplicates:
+            self.powers[-n_duplicates:] = self.powers[0]
+        self.group = SpectralGroupModel(max_n_peaks=4, verbose=False)
+        self.group.data.set_dedup(dedup)
+
+    def time_fit(self, dedup, duplicate_fraction):
+
+        self.group.fit(self.freqs, self.powers)
+
+
+class TimeGroupSchedule:
+    """Makespan of fitting a group of power spectra in parallel, across task scheduling orders.
+
+    Notes
+    -----
+    Makespans are simulated, by assigning the measured fit time of each power spectrum to the
+    next available of `n_jobs` workers, in the order tasks are dispatched, such that they measure
+    the scheduling order independent of the number of available cores. Orders are the data order,
+    longest-first by estimated cost, and longest-first by measured fit time, as a reference.
+    Ordering by estimated cost includes the time to estimate costs, which is run before fitting.
+    """
+
+    params = ([4, 16], ['data', 'cost', 'measured'])
+    param_names = ['n_jobs', 'order']
+    timeout = 300
+
+    n_spectra = 200
+
+    def setup(self, n_jobs, order):
+
+        freqs, powers = sim_group_clumped(self.n_spectra)
+        group = SpectralGroupModel(max_n_peaks=8, verbose=False)
+        group.fit(freqs, powers)
+
+        self.durations = np.array([info['duration'] for info in group.results.group_fit_info])
+        start = time.perf_counter()
+        costs = group.algorithm._estimate_costs(group.data.power_spectra)
+        self.overheads = {'data' : 0, 'measured' : 0, 'cost' : time.perf_counter() - start}
+        self.costs = {'data' : np.zeros(self.n_spectra), 'measured' : self.durations,
+                      'cost' : costs}
+
+    def track_makespan(self, n_jobs, order):
+
+        workers = np.zeros(n_jobs)
+        for ind in np.argsort(-self.costs[order], kind='stable'):
+            workers[np.argmin(workers)] += self.durations[ind]
+
+        return (self.overheads[order] + workers.max()) / (self.durations.sum() / n_jobs)
+
+    track_makespan.unit = 'ratio to ideal'
+
+
+class TimeGroupSelect:
+    """Selecting half of the model fits of a large group, across kinds of indices.
+
+    Notes
+    -----
+    The group is built by repeating the fits of a small group, to reach a million model fits.
+    Evenly spaced indices ('range', 'strided') select views of the power spectra,
+    and other indices ('array') select copies.
+    """
+
+    params = (['range', 'strided', 'array'],)
+    param_names = ['selection']
+    timeout = 300
+
+    n_fits = 1_000_000
+    n_repeats = 10_000
+
+    def setup(self, selection):
+
+        freqs, powers = sim_group(self.n_fits // self.n_repeats)
+        self.group = SpectralGroupModel(max_n_peaks=4, verbose=False)
+        self.group.fit(freqs, powers)
+        self.group.data.power_spectra = np.tile(self.group.data.power_spectra, (self.n_repeats, 1))
+        self.group.results.group_results = self.group.results.group_results * self.n_repeats
+
+        self.inds = {
+            'range' : range(self.n_fits // 2),
+            'strided' : range(0, self.n_fits, 2),
+            'array' : np.sort(np.random.default_rng(0).choice(\
+                self.n_fits, self.n_fits // 2, replace=False)),
+        }[selection]
+
+    def time_get_group(self, selection):
+
+        self.group.get_group(self.inds)
+
+    def track_get_group_memory(self, selection):
+
+        tracemalloc.start()
+        self.group.get_group(self.inds)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        return peak / 2**20
+
+    track_get_group_memory.unit = 'MiB'
@@ -0,0 +1,111 @@
+"""Benchmarks for saving and loading model objects."""
+
+import shutil
+import tempfile
+
+from specparam import (SpectralModel, SpectralGroupModel,
+                       SpectralTimeModel, SpectralTimeEventModel)
+from specparam.models.utils import combine_model_objs, combine_model_files
+
+from .utils import sim_spectrum, sim_group, sim_spectrograms
+
+###################################################################################################
+###################################################################################################
+
+MODELS = {
+    'model' : SpectralModel,
+    'group' : SpectralGroupModel,
+    'time' : SpectralTimeModel,
+    'event' : SpectralTimeEventModel,
+}
+
+
+def _get_data(model_type):
+    """Get data to fit for each model type."""
+
+    if model_type == 'model':
+        return sim_spectrum()
+    if model_type == 'group':
+        return sim_group(100)
+    if model_type == 'time':
+        freqs, powers = sim_group(100)
+        return freqs, powers.T
+    if model_type == 'event':
+        return sim_spectrograms(5, 20)
+
+
+class TimeSaveLoad:
+    """Saving and loading fit model objects, for each object (file) type."""
+
+    params = (['model', 'group', 'time', 'event'],)
+    param_names = ['model_type']
+
+    def setup(self, model_type):
+
+        self.temp_dir = tempfile.mkdtemp()
+
+        self.model = MODELS[model_type](max_n_peaks=4, verbose=False)
+        self.model.fit(*_get_data(model_type))
+
+        self.model.save('bench_load', self.temp_dir, save_results=True,
+                        save_settings=True, save_data=True)
+
+    def teardown(self, model_type):
+
+        shutil.rmtree(self.temp_dir)
+
+    def time_save(self, model_type):
+
+        self.model.save('bench_save', self.temp_dir, save_results=True,
+                        save_settings=True, save_data=True)
+
+    def time_load(self, model_type):
+
+        self.model.load('bench_load', self.temp_dir)
+
+
+class TimeCombine:
+    """Combining group model objects, as for merging per-subject results."""
+
+    params = ([100, 2000],)
+    param_names = ['n_objs']
+
+    n_spectra = 20
+
+    def setup(self, n_objs):
+
+        self.group = SpectralGroupModel(max_n_peaks=4, verbose=False)
+        self.group.fit(*sim_group(self.n_spectra))
+
+    def time_combine_objs(self, n_objs):
+
+        combine_model_objs([self.group] * n_objs)
+
+
+class TimeCombineFiles:
+    """Loading and combining group model files, as for merging per-subject results."""
+
+    timeout = 300
+
+    n_spectra = 20
+    n_files = 200
+
+    def setup(self):
+
+        self.temp_dir = tempfile.mkdtemp()
+
+        group = SpectralGroupModel(max_n_peaks=4, verbose=False)
+        group.fit(*sim_group(self.n_spectra))
+
+        self.file_names = ['bench_combine_{}'.format(ind) for ind in range(self.n_files)]
+        for file_name in self.file_names:
+            group.save(file_name, self.temp_dir, save_results=True,
+                       save_settings=True, save_data=True)
+
+    def teardown(self):
+
+        shutil.rmtree(self.temp_dir)
+
+    def time_combine_files(self):
+
+        combine_model_files(self.file_names, self.temp_dir)
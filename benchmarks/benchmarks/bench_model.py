@@ -0,0 +1,171 @@
+"""Benchmarks for fitting individual power spectra."""
+
+import numpy as np
+
+from specparam import SpectralModel
+from specparam.algorithms.spectral_fit import AP_FIT_METHODS, PE_FIT_METHODS
+
+from .utils import (AP_PARAMS, HIGH_RES_PE_PARAMS, sim_spectrum, sim_multi_peak_spectrum,
+                    sim_high_res_spectrum)
+
+###################################################################################################
+###################################################################################################
+
+class TimeModelFit:
+    """Latency of fitting a single power spectrum, per aperiodic & periodic mode."""
+
+    params = (['fixed', 'knee', 'doublexp'], ['gaussian', 'cauchy'])
+    param_names = ['aperiodic_mode', 'periodic_mode']
+
+    def setup(self, aperiodic_mode, periodic_mode):
+
+        self.freqs, self.powers = sim_spectrum(aperiodic_mode, periodic_mode)
+        self.model = SpectralModel(aperiodic_mode=aperiodic_mode, periodic_mode=periodic_mode,
+                                   max_n_peaks=4, verbose=False)
+
+    def time_fit(self, aperiodic_mode, periodic_mode):
+
+        self.model.fit(self.freqs, self.powers)
+
+
+class TimeAperiodicFitMethod:
+    """Latency, fit function evaluations & accuracy of the aperiodic fit methods."""
+
+    params = (['fixed', 'knee', 'doublexp'], AP_FIT_METHODS)
+    param_names = ['aperiodic_mode', 'ap_fit_method']
+
+    def setup(self, aperiodic_mode, ap_fit_method):
+
+        self.freqs, self.powers = sim_spectrum(aperiodic_mode)
+        self.model = SpectralModel(aperiodic_mode=aperiodic_mode, ap_fit_method=ap_fit_method,
+                                   max_n_peaks=4, verbose=False)
+
+    def time_fit(self, aperiodic_mode, ap_fit_method):
+
+        self.model.fit(self.freqs, self.powers)
+
+    def track_ap_nfev(self, aperiodic_mode, ap_fit_method):
+
+        self.model.algorithm.set_profile(True)
+        self.model.fit(self.freqs, self.powers)
+        profile = self.model.results.get_profile()
+
+        return profile['robust_ap_fit']['nfev'] + profile['simple_ap_fit']['nfev']
+
+    track_ap_nfev.unit = 'evaluations'
+
+    def track_ap_error(self, aperiodic_mode, ap_fit_method):
+
+        self.model.fit(self.freqs, self.powers)
+
+        return np.max(np.abs(self.model.results.params.aperiodic.params - \
+                             AP_PARAMS[aperiodic_mode]))
+
+    track_ap_error.unit = 'max abs parameter error'
+
+
+class TimePeriodicFitMethod:
+    """Latency & fit function evaluations of the periodic fit methods, for multi-peak spectra."""
+
+    params = ([2, 6, 12], ['gaussian', 'cauchy'], PE_FIT_METHODS)
+    param_names = ['n_peaks', 'periodic_mode', 'pe_fit_method']
+
+    def setup(self, n_peaks, periodic_mode, pe_fit_method):
+
+        self.freqs, self.powers = sim_multi_peak_spectrum(n_peaks, periodic_mode)
+        self.model = SpectralModel(periodic_mode=periodic_mode, pe_fit_method=pe_fit_method,
+                                   peak_width_limits=[0.5, 6], verbose=False)
+
+    def time_fit(self, n_peaks, periodic_mode, pe_fit_method):
+
+        self.model.fit(self.freqs, self.powers)
+
+    def track_pe_nfev(self, n_peaks, periodic_mode, pe_fit_method):
+
+        self.model.algorithm.set_profile(True)
+        self.model.fit(self.freqs, self.powers)
+
+        return self.model.results.get_profile().get('fit_peak_guess', {'nfev' : 0})['nfev']
+
+    track_pe_nfev.unit = 'evaluations'
+
+
+class TimePeakSearch:
+    """Latency of the iterative search for candidate peaks, for multi-peak spectra."""
+
+    params = ([2, 6, 12], ['gaussian', 'cauchy'])
+    param_names = ['n_peaks', 'periodic_mode']
+
+    def setup(self, n_peaks, periodic_mode):
+
+        freqs, powers = sim_multi_peak_spectrum(n_peaks, periodic_mode)
+        self.model = SpectralModel(periodic_mode=periodic_mode, peak_width_limits=[0.5, 6],
+                                   verbose=False)
+        self.model.fit(freqs, powers)
+        self.flatspec = self.model.results.model._spectrum_flat
+
+    def time_get_peak_guess(self, n_peaks, periodic_mode):
+
+        self.model.algorithm._get_peak_guess(self.flatspec)
+
+
+class TimeAperiodicFunction:
+    """Latency of an evaluation of the aperiodic function, with or without the frequency grid."""
+
+    params = (['fixed', 'knee', 'doublexp'], ['grid', 'array'])
+    param_names = ['aperiodic_mode', 'freqs']
+
+    def setup(self, aperiodic_mode, freqs):
+
+        model = SpectralModel(aperiodic_mode=aperiodic_mode, verbose=False)
+        model.add_data(*sim_spectrum(aperiodic_mode, 'gaussian'))
+        self.func = model.modes.aperiodic.func
+        self.ap_params = AP_PARAMS[aperiodic_mode]
+        self.freqs = model.data.freqs if freqs == 'grid' else model.data.freqs.copy()
+
+    def time_eval(self, aperiodic_mode, freqs):
+
+        self.func(self.freqs, *self.ap_params)
+
+
+class TimeCoarseToFine:
+    """Latency & parameter errors of coarse-to-fine fitting, for high resolution spectra."""
+
+    params = ([1, 2, 4, 8], [0.01, 0.05])
+    param_names = ['decimation', 'nlv']
+
+    def setup(self, decimation, nlv):
+
+        self.freqs, self.powers = sim_high_res_spectrum(nlv)
+        self.model = SpectralModel(aperiodic_mode='knee', peak_width_limits=[2, 10],
+                                   max_n_peaks=6, min_peak_height=0.1,
+                                   decimation=decimation, verbose=False)
+
+    def time_fit(self, decimation, nlv):
+
+        self.model.fit(self.freqs, self.powers)
+
+    def track_ap_error(self, decimation, nlv):
+
+        self.model.fit(self.freqs, self.powers)
+
+        return np.max(np.abs(self.model.results.params.aperiodic.params - AP_PARAMS['knee']))
+
+    track_ap_error.unit = 'max abs parameter error'
+
+    def track_cf_error(self, decimation, nlv):
+
+        self.model.fit(self.freqs, self.powers)
+        cfs = self.model.results.params.periodic.params[:, 0]
+
+        return max(np.min(np.abs(cfs - peak[0]), initial=np.inf) for peak in HIGH_RES_PE_PARAMS)
+
+    track_cf_error.unit = 'max abs center frequency error (Hz)'
+
+
+class TimeImport:
+    """Time to import the module, in a fresh interpreter."""
+
+    def timeraw_import_specparam(self):
+
+        return "import specparam"
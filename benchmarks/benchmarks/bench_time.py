@@ -0,0 +1,122 @@
+"""Benchmarks for fitting & managing time and event models."""
+
+import numpy as np
+
+from specparam import SpectralTimeModel, SpectralTimeEventModel
+from specparam import Bands
+from specparam.results.utils import CHUNKS_PER_JOB
+
+from .utils import sim_group, sim_group_clumped, sim_spectrograms
+
+###################################################################################################
+###################################################################################################
+
+BANDS = Bands({'alpha' : [7, 14], 'beta' : [15, 30]})
+
+
+class TimeTimeModel:
+    """Fitting and converting results for time models."""
+
+    n_windows = 100
+
+    def setup(self):
+
+        self.freqs, powers = sim_group(self.n_windows)
+        self.spectrogram = powers.T
+
+        self.model = SpectralTimeModel(max_n_peaks=4, verbose=False)
+        self.fit_model = SpectralTimeModel(max_n_peaks=4, verbose=False)
+        self.fit_model.fit(self.freqs, self.spectrogram, bands=BANDS)
+
+    def time_fit(self):
+
+        self.model.fit(self.freqs, self.spectrogram, bands=BANDS)
+
+    def time_convert_results(self):
+
+        self.fit_model.convert_results(BANDS)
+
+    def time_to_df(self):
+
+        self.fit_model.to_df()
+
+
+class TimeEventModel:
+    """Fitting and converting results for event models."""
+
+    n_events = 10
+    n_windows = 20
+
+    def setup(self):
+
+        self.freqs, self.spectrograms = sim_spectrograms(self.n_events, self.n_windows)
+
+        self.model = SpectralTimeEventModel(max_n_peaks=4, verbose=False)
+        self.fit_model = SpectralTimeEventModel(max_n_peaks=4, verbose=False)
+        self.fit_model.fit(self.freqs, self.spectrograms, bands=BANDS)
+
+    def time_fit(self):
+
+        self.model.fit(self.freqs, self.spectrograms, bands=BANDS)
+
+    def time_convert_results(self):
+
+        self.fit_model.convert_results(BANDS)
+
+    def time_to_df(self):
+
+        self.fit_model.to_df()
+
+
+class TimeEventParallel:
+    """Fitting event models in parallel, with tasks per event, or per chunk of windows.
+
+    Notes
+    -----
+    Parallel efficiency is simulated, by assigning the measured fit time of each task to the
+    next available of `n_jobs` workers, in the order tasks are dispatched, such that it measures
+    how work is split into tasks, independent of the number of available cores.
+    The last event is noisier than the others, and takes longer to fit. Chunks are scheduled
+    most costly first (see `Algorithm.set_schedule`).
+    """
+
+    params = ([2, 4, 8], ['event', 'chunk'])
+    param_names = ['n_jobs', 'strategy']
+    timeout = 300
+
+    n_events = 4
+    n_windows = 40
+
+    def setup(self, n_jobs, strategy):
+
+        self.freqs, powers = sim_group_clumped(self.n_events * self.n_windows, 1 / self.n_events)
+        self.spectrograms = powers.reshape(self.n_events, self.n_windows, -1).transpose(0, 2, 1)
+
+        self.model = SpectralTimeEventModel(max_n_peaks=8, verbose=False)
+        self.model.fit(self.freqs, self.spectrograms)
+        self.durations = np.array([info['duration'] for info in \
+            np.concatenate(self.model.results.event_group_fit_info)])
+        self.costs = self.model.algorithm._estimate_costs(powers)
+
+        self.chunk_size = self.n_windows if strategy == 'event' else None
+        self.model.algorithm.set_schedule(strategy == 'chunk')
+
+    def time_fit(self, n_jobs, strategy):
+
+        self.model.fit(self.freqs, self.spectrograms, n_jobs=n_jobs, chunk_size=self.chunk_size)
+
+    def track_efficiency(self, n_jobs, strategy):
+
+        if strategy == 'event':
+            tasks, order = np.array_split(np.arange(len(self.durations)), self.n_events), None
+        else:
+            tasks = np.array_split(np.arange(len(self.durations)), CHUNKS_PER_JOB * n_jobs)
+            order = np.argsort([-np.sum(self.costs[task]) for task in tasks], kind='stable')
+
+        workers = np.zeros(n_jobs)
+        for ind in range(len(tasks)) if order is None else order:
+            workers[np.argmin(workers)] += np.sum(self.durations[tasks[ind]])
+
+        return np.sum(self.durations) / (n_jobs * np.max(workers))
+
+    track_efficiency.unit = 'fraction of ideal'
@@ -0,0 +1,84 @@
+"""Shared utilities for benchmarks: simulating data to benchmark with."""
+
+import numpy as np
+
+from specparam.sim import sim_power_spectrum, sim_group_power_spectra_chunked
+
+###################################################################################################
+###################################################################################################
+
+# Shared simulation settings, so that benchmarks are comparable across runs
+SEED = 13
+FREQ_RANGE = [3, 40]
+FREQ_RES = 0.5
+NLV = 0.01
+
+# Simulation parameter definitions per fit mode
+AP_PARAMS = {
+    'fixed' : [1, 1.5],
+    'knee' : [1, 10, 2],
+    'doublexp' : [1, 1, 10, 2],
+}
+PE_PARAMS = {
+    'gaussian' : [[10, 0.5, 1], [20, 0.25, 2]],
+    'cauchy' : [[10, 0.5, 1], [20, 0.25, 2]],
+}
+
+# Simulation settings for high frequency resolution power spectra
+HIGH_RES_FREQ_RANGE = [1, 200]
+HIGH_RES_FREQ_RES = 0.1
+HIGH_RES_PE_PARAMS = [[8, 0.6, 1.5], [20, 0.4, 2.5], [45, 0.3, 3], [80, 0.25, 4]]
+
+
+def sim_spectrum(aperiodic_mode='fixed', periodic_mode='gaussian'):
+    """Simulate a power spectrum for benchmarking."""
+
+    return sim_power_spectrum(FREQ_RANGE, {aperiodic_mode : AP_PARAMS[aperiodic_mode]},
+                              {periodic_mode : PE_PARAMS[periodic_mode]},
+                              nlv=NLV, freq_res=FREQ_RES, rng=SEED)
+
+
+def sim_multi_peak_spectrum(n_peaks, periodic_mode='gaussian'):
+    """Simulate a power spectrum with peaks spaced evenly across the frequency range."""
+
+    peaks = [[cf, 0.4, 0.75] for cf in np.linspace(FREQ_RANGE[0] + 2, FREQ_RANGE[1] - 2, n_peaks)]
+
+    return sim_power_spectrum(FREQ_RANGE, {'fixed' : AP_PARAMS['fixed']}, {periodic_mode : peaks},
+                              nlv=NLV, freq_res=FREQ_RES, rng=SEED)
+
+
+def sim_high_res_spectrum(nlv=NLV):
+    """Simulate a high frequency resolution power spectrum, across a broad frequency range."""
+
+    return sim_power_spectrum(HIGH_RES_FREQ_RANGE, {'knee' : AP_PARAMS['knee']},
+                              {'gaussian' : HIGH_RES_PE_PARAMS},
+                              nlv=nlv, freq_res=HIGH_RES_FREQ_RES, rng=SEED)
+
+
+def sim_group(n_spectra, aperiodic_mode='fixed', periodic_mode='gaussian'):
+    """Simulate a group of power spectra for benchmarking."""
+
+    return sim_group_power_spectra_chunked(\
+        n_spectra, FREQ_RANGE, {aperiodic_mode : AP_PARAMS[aperiodic_mode]},
+        {periodic_mode : PE_PARAMS[periodic_mode]}, nlvs=NLV, freq_res=FREQ_RES, rng=SEED)
+
+
+def sim_spectrograms(n_events, n_windows):
+    """Simulate a set of spectrograms for benchmarking, as [n_events, n_freqs, n_windows]."""
+
+    freqs, powers = sim_group(n_events * n_windows)
+    spectrograms = powers.reshape(n_events, n_windows, -1).transpose(0, 2, 1)
+
+    return freqs, spectrograms
+
+
+def sim_group_clumped(n_spectra, noisy_fraction=0.25, noisy_nlv=0.25):
+    """Simulate a group of power spectra, with a block of noisier power spectra at the end."""
+
+    n_noisy = int(noisy_fraction * n_spectra)
+    freqs, powers = sim_group(n_spectra - n_noisy)
+    _, noisy = sim_group_power_spectra_chunked(\
+        n_noisy, FREQ_RANGE, {'fixed' : AP_PARAMS['fixed']}, {'gaussian' : PE_PARAMS['gaussian']},
+        nlvs=noisy_nlv, freq_res=FREQ_RES, rng=SEED + 1)
+
+    return freqs, np.vstack([powers, noisy])
@@ -0,0 +1,153 @@
+"""Load test asynchronous model fitting, with concurrent clients requesting single spectrum fits.
+
+This script simulates a service that fits individual power spectra for concurrent clients,
+and compares fitting each request with `SpectralModel.fit_async` to fitting requests with a
+`FitService`, which micro-batches concurrent requests into group model fits.
+
+Usage:
+
+    # Compare direct and batched fitting, with 32 clients each sending 20 requests
+    python benchmarks/load_test.py --clients 32 --requests 20
+
+    # Run only the fit service, using the batched fit algorithm
+    python benchmarks/load_test.py --mode service --algorithm spectral_fit_batch
+
+Each client sends a request, waits for the result, and then sends the next request.
+The script reports the throughput, in fits per second, and percentiles of request latency.
+"""
+
+import sys
+import time
+import asyncio
+import argparse
+
+import numpy as np
+
+from specparam import SpectralModel
+from specparam.sim import sim_group_power_spectra
+from specparam.sim.params import param_sampler
+from specparam.models.service import FitService
+
+###################################################################################################
+###################################################################################################
+
+# Simulation settings for the power spectra to request fits of
+FREQ_RANGE = [3, 40]
+AP_PARAMS = [[1, 1.5], [0.5, 1], [1.5, 2]]
+PE_PARAMS = [[10, 0.5, 1], [10, 0.5, 1, 20, 0.25, 2]]
+N_SPECTRA = 100
+NLV = 0.01
+SEED = 13
+
+# Percentiles of request latency to report
+PERCENTILES = [50, 95, 99]
+
+
+async def run_load(fit, freqs, spectra, n_clients, n_requests):
+    """Run concurrent clients, each requesting a sequence of fits.
+
+    Parameters
+    ----------
+    fit : callable
+        Coroutine function to fit a power spectrum, taking frequencies and power values.
+    freqs : 1d array
+        Frequency values for the power spectra.
+    spectra : 2d array
+        Power spectra to request fits for, taken in turn by each client.
+    n_clients : int
+        Number of concurrent clients.
+    n_requests : int
+        Number of requests sent by each client.
+
+    Returns
+    -------
+    duration : float
+        Total time, in seconds, to complete all requests.
+    latencies : 1d array
+        Time, in seconds, to complete each request.
+    """
+
+    latencies = []
+
+    async def client(ind):
+        for req_ind in range(n_requests):
+            spectrum = spectra[(ind * n_requests + req_ind) % len(spectra)]
+            start = time.perf_counter()
+            await fit(freqs, spectrum)
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*[client(ind) for ind in range(n_clients)])
+
+    return time.perf_counter() - start, np.array(latencies)
+
+
+async def run_direct(freqs, spectra, n_clients, n_requests, algorithm):
+    """Run the load test, fitting each request with `SpectralModel.fit_async`."""
+
+    async def fit(freqs, spectrum):
+        model = SpectralModel(algorithm=algorithm, verbose=False)
+        await model.fit_async(freqs, spectrum)
+        return model
+
+    return await run_load(fit, freqs, spectra, n_clients, n_requests)
+
+
+async def run_service(freqs, spectra, n_clients, n_requests, algorithm,
+                      max_batch_size, max_delay, max_queue_size):
+    """Run the load test, fitting requests with a `FitService`."""
+
+    model = SpectralModel(algorithm=algorithm, verbose=False)
+    async with FitService(model, max_batch_size=max_batch_size, max_delay=max_delay,
+                          max_queue_size=max_queue_size) as service:
+        return await run_load(service.fit, freqs, spectra, n_clients, n_requests)
+
+
+def report(label, duration, latencies):
+    """Print the throughput and latency percentiles of a load test."""
+
+    print('{:10s} {:8.1f} fits/s   '.format(label, len(latencies) / duration) + \
+        '   '.join('p{}: {:7.1f} ms'.format(perc, 1000 * np.percentile(latencies, perc)) \
+            for perc in PERCENTILES))
+
+
+def main(argv=None):
+    """Run the load test from the command line."""
+
+    parser = argparse.ArgumentParser(description='Load test asynchronous model fitting.')
+    parser.add_argument('--mode', choices=['direct', 'service', 'both'], default='both',
+                        help='Fitting approach(es) to test.')
+    parser.add_argument('--clients', type=int, default=32, help='Number of concurrent clients.')
+    parser.add_argument('--requests', type=int, default=20,
+                        help='Number of requests sent by each client.')
+    parser.add_argument('--algorithm', default='spectral_fit', help='Fit algorithm to use.')
+    parser.add_argument('--max-batch-size', type=int, default=64,
+                        help='Maximum batch size for the fit service.')
+    parser.add_argument('--max-delay', type=float, default=0.005,
+                        help='Time, in seconds, the fit service waits to collect a batch.')
+    parser.add_argument('--max-queue-size', type=int, default=1024,
+                        help='Maximum number of requests queued in the fit service.')
+
+    args = parser.parse_args(argv)
+
+    freqs, spectra = sim_group_power_spectra(\
+        N_SPECTRA, FREQ_RANGE, {'fixed' : param_sampler(AP_PARAMS)},
+        {'gaussian' : param_sampler(PE_PARAMS)}, nlvs=NLV, rng=SEED)
+
+    print('{} clients x {} requests, with algorithm: {}\n'.format(\
+        args.clients, args.requests, args.algorithm))
+
+    if args.mode in ['direct', 'both']:
+        report('direct', *asyncio.run(run_direct(\
+            freqs, spectra, args.clients, args.requests, args.algorithm)))
+
+    if args.mode in ['service', 'both']:
+        report('service', *asyncio.run(run_service(\
+            freqs, spectra, args.clients, args.requests, args.algorithm,
+            args.max_batch_size, args.max_delay, args.max_queue_size)))
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,323 @@
+"""Run specparam benchmarks offline, and save and compare benchmark results.
+
+The benchmarks in `benchmarks/benchmarks` follow the conventions of airspeed velocity (asv),
+and so can also be run with `asv run`. This script provides a minimal, dependency free runner,
+which can be used to check for performance regressions without network access or asv.
+
+Usage:
+
+    # Run all benchmarks, and save results as a baseline
+    python benchmarks/run.py run --save baseline
+
+    # Run a selection of benchmarks (matched on name) and save as a new result
+    python benchmarks/run.py run --bench ModelFit --save current
+
+    # Compare results, flagging regressions larger than a given ratio
+    python benchmarks/run.py compare baseline current --threshold 1.2
+
+Benchmarks are run against the version of specparam in this repository.
+Results are saved as JSON files in `benchmarks/baselines`, unless a path is given.
+The compare command exits with a non-zero status if any regressions are detected.
+"""
+
+import os
+import sys
+import json
+import time
+import inspect
+import argparse
+import platform
+import itertools
+import subprocess
+from statistics import median
+from importlib import import_module
+
+###################################################################################################
+###################################################################################################
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(BENCH_DIR)
+BASELINE_DIR = os.path.join(BENCH_DIR, 'baselines')
+BENCH_PREFIXES = ('time_', 'timeraw_', 'track_')
+
+
+def discover_benchmarks(select=None):
+    """Find benchmarks, as (name, class, method name, params) tuples.
+
+    Parameters
+    ----------
+    select : str, optional
+        Only return benchmarks whose names contain this string.
+
+    Returns
+    -------
+    benchmarks : list of tuple
+        Definitions of the available benchmarks.
+    """
+
+    # Benchmark the module in the current repository, rather than any installed version
+    for path in [BENCH_DIR, REPO_DIR]:
+        if path not in sys.path:
+            sys.path.insert(0, path)
+
+    benchmarks = []
+    for file_name in sorted(os.listdir(os.path.join(BENCH_DIR, 'benchmarks'))):
+        if not (file_name.startswith('bench_') and file_name.endswith('.py')):
+            continue
+
+        module = import_module('benchmarks.' + file_name[:-3])
+        for cls_name, cls in inspect.getmembers(module, inspect.isclass):
+            if cls.__module__ != module.__name__:
+                continue
+
+            params = getattr(cls, 'params', [])
+            params = list(itertools.product(*params)) if params else [()]
+
+            for method in sorted(dir(cls)):
+                if not method.startswith(BENCH_PREFIXES):
+                    continue
+                for param in params:
+                    name = '.'.join([file_name[:-3], cls_name, method])
+                    if param:
+                        name += '(' + ', '.join(str(el) for el in param) + ')'
+                    if select is None or select in name:
+                        benchmarks.append((name, cls, method, param))
+
+    return benchmarks
+
+
+def time_benchmark(cls, method, param, repeat=5, min_time=0.1):
+    """Time a benchmark, returning the median time per call, in seconds, or a tracked value.
+
+    Parameters
+    ----------
+    cls : type
+        Benchmark class.
+    method : str
+        Name of the benchmark method to time.
+    param : tuple
+        Parameter values for the benchmark.
+    repeat : int, optional, default: 5
+        Number of repeated timing measurements to take.
+    min_time : float, optional, default: 0.1
+        Minimum time, in seconds, for each measurement, which may include multiple calls.
+
+    Returns
+    -------
+    float or None
+        Median time per call, or None if the benchmark was skipped in setup.
+        For tracking benchmarks (prefixed 'track_'), the value returned by the benchmark.
+    """
+
+    bench = cls()
+    try:
+        if hasattr(bench, 'setup'):
+            bench.setup(*param)
+    except NotImplementedError:
+        return None
+
+    try:
+        func = getattr(bench, method)
+
+        # Tracking benchmarks return a value to record, rather than being timed
+        if method.startswith('track_'):
+            return float(func(*param))
+
+        if method.startswith('timeraw_'):
+            code = func(*param)
+            env = dict(os.environ, PYTHONPATH=os.pathsep.join(\
+                [REPO_DIR] + os.environ.get('PYTHONPATH', '').split(os.pathsep)))
+            func = lambda: subprocess.run([sys.executable, '-c', code], check=True, env=env)
+            number = 1
+        else:
+            func = lambda: getattr(bench, method)(*param)
+            func()
+            number = _get_number(func, min_time)
+
+        times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for _ in range(number):
+                func()
+            times.append((time.perf_counter() - start) / number)
+
+    finally:
+        if hasattr(bench, 'teardown'):
+            bench.teardown(*param)
+
+    return median(times)
+
+
+def _get_number(func, min_time):
+    """Get the number of calls needed for a timing measurement to last at least `min_time`."""
+
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        if time.perf_counter() - start >= min_time:
+            return number
+        number *= 2
+
+
+def run_benchmarks(select=None, repeat=5, min_time=0.1, verbose=True):
+    """Run benchmarks, and collect results.
+
+    Parameters
+    ----------
+    select : str, optional
+        Only run benchmarks whose names contain this string.
+    repeat : int, optional, default: 5
+        Number of repeated timing measurements to take per benchmark.
+    min_time : float, optional, default: 0.1
+        Minimum time, in seconds, for each measurement.
+    verbose : bool, optional, default: True
+        Whether to print out results as they are collected.
+
+    Returns
+    -------
+    dict
+        Benchmark results, with 'meta' information and 'results', as {name : seconds}.
+    """
+
+    benchmarks = discover_benchmarks(select)
+
+    import numpy
+    import scipy
+    import specparam
+
+    results = {}
+    for name, cls, method, param in benchmarks:
+        results[name] = time_benchmark(cls, method, param, repeat, min_time)
+        if verbose:
+            print('{:70s} {}'.format(name, _format_value(name, results[name])))
+
+    meta = {
+        'date' : time.strftime('%Y-%m-%d %H:%M:%S'),
+        'machine' : platform.node(),
+        'platform' : platform.platform(),
+        'cpu_count' : os.cpu_count(),
+        'python' : platform.python_version(),
+        'numpy' : numpy.__version__,
+        'scipy' : scipy.__version__,
+        'specparam' : specparam.__version__,
+    }
+
+    return {'meta' : meta, 'results' : results}
+
+
+def compare_results(base, new, threshold=1.2):
+    """Compare two sets of benchmark results.
+
+    Parameters
+    ----------
+    base, new : dict
+        Benchmark results, as returned by `run_benchmarks`.
+    threshold : float, optional, default: 1.2
+        Ratio of new to base time above which a benchmark is flagged as a regression,
+        and below the inverse of which a benchmark is flagged as an improvement.
+
+    Returns
+    -------
+    comparisons : list of tuple
+        Comparison per benchmark, as (name, base time, new time, ratio, flag).
+    """
+
+    comparisons = []
+    for name in sorted(set(base['results']) & set(new['results'])):
+
+        base_time, new_time = base['results'][name], new['results'][name]
+        if base_time is None or new_time is None:
+            continue
+
+        ratio = new_time / base_time
+        flag = 'regression' if ratio > threshold else \
+            'improvement' if ratio < 1 / threshold else ''
+        comparisons.append((name, base_time, new_time, ratio, flag))
+
+    return comparisons
+
+
+def _format_value(name, value):
+    """Format a benchmark result for printing, as a time, or as a tracked value."""
+
+    if value is not None and '.track_' in name:
+        return '{:10.4g}  '.format(value)
+
+    return _format_time(value)
+
+
+def _format_time(value):
+    """Format a time value, in seconds, for printing."""
+
+    if value is None:
+        return 'skipped'
+    for unit, scale in [('s', 1), ('ms', 1e-3), ('us', 1e-6)]:
+        if value >= scale:
+            break
+
+    return '{:8.3f} {}'.format(value / scale, unit)
+
+
+def _get_path(name):
+    """Get the file path for a named result."""
+
+    return name if name.endswith('.json') else os.path.join(BASELINE_DIR, name + '.json')
+
+
+def main(argv=None):
+    """Command line interface for running and comparing benchmarks."""
+
+    parser = argparse.ArgumentParser(description='Run and compare specparam benchmarks.')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = subparsers.add_parser('run', help='Run benchmarks.')
+    run_parser.add_argument('--bench', default=None, help='Select benchmarks by name.')
+    run_parser.add_argument('--save', default=None, help='Name or path to save results to.')
+    run_parser.add_argument('--repeat', type=int, default=5, help='Number of repeats.')
+    run_parser.add_argument('--min-time', type=float, default=0.1,
+                            help='Minimum time per measurement, in seconds.')
+
+    compare_parser = subparsers.add_parser('compare', help='Compare saved results.')
+    compare_parser.add_argument('base', help='Name or path of the baseline results.')
+    compare_parser.add_argument('new', help='Name or path of the new results.')
+    compare_parser.add_argument('--threshold', type=float, default=1.2,
+                                help='Ratio above which to flag a regression.')
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'run':
+
+        results = run_benchmarks(args.bench, args.repeat, args.min_time)
+
+        if args.save:
+            path = _get_path(args.save)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'w') as f_obj:
+                json.dump(results, f_obj, indent=2)
+            print('\nResults saved to: ' + path)
+
+        return 0
+
+    if args.command == 'compare':
+
+        with open(_get_path(args.base)) as f_obj:
+            base = json.load(f_obj)
+        with open(_get_path(args.new)) as f_obj:
+            new = json.load(f_obj)
+
+        comparisons = compare_results(base, new, args.threshold)
+        for name, base_time, new_time, ratio, flag in comparisons:
+            print('{:70s} {} {} {:6.2f}x {}'.format(\
+                name, _format_value(name, base_time), _format_value(name, new_time), ratio, flag))
+
+        n_regressions = sum(comp[-1] == 'regression' for comp in comparisons)
+        print('\n{} regression(s) found, at a threshold of {}x.'.format(\
+            n_regressions, args.threshold))
+
+        return 1 if n_regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
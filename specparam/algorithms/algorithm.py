@@ -1,10 +1,16 @@
 """Define object to manage algorithm implementations."""
 
+from time import time
+from contextlib import contextmanager, nullcontext
+
 import numpy as np
 
 from specparam.data.data import DATA_FORMATS
 from specparam.utils.checks import check_input_options
 from specparam.algorithms.settings import SettingsDefinition, SettingsValues
+from specparam.algorithms.profiling import FitProfiler
+from specparam.algorithms.budget import FitBudget
+from specparam.algorithms.cache import StageCache, make_key
 from specparam.modutils.docs import docs_get_section, replace_docstring_sections
 from specparam.reports.strings import gen_settings_str
 
@@ -39,13 +45,18 @@ class Algorithm():
         The model object this object is linked to, to provide access to other attributes.
     debug :  bool
         Whether to run in debug state, raising an error if encountered during fitting.
+    profile : bool, optional, default: False
+        Whether to run in profile state, recording timing information for each stage of fitting.
+    cache : bool or StageCache, optional, default: False
+        Whether to cache the outputs of stages of fitting, to reuse across model fits.
     """
 
     name = None
     description = None
 
     def __init__(self, public_settings, private_settings=None, data_format='spectrum',
-                 modes=None, data=None, results=None, model=None, debug=False):
+                 modes=None, data=None, results=None, model=None, debug=False, profile=False,
+                 cache=False):
         """Initialize Algorithm object."""
 
         if not isinstance(public_settings, SettingsDefinition):
@@ -69,6 +80,10 @@ class Algorithm():
         self._reset_subobjects(modes, data, results)
 
         self.set_debug(debug)
+        self.set_profile(profile)
+        self.set_cache(cache)
+        self.set_budget()
+        self.set_schedule(False)
 
         self._model = model
 
@@ -81,6 +96,56 @@ class Algorithm():
         """Required fit function, to be overloaded."""
 
 
+    def _fit_batch(self):
+        """Batch fit function, run across all spectra before fitting each spectrum.
+
+        Notes
+        -----
+        This is called by group fitting for algorithms with a 'spectra' data format,
+        which can overload this function, for example to precompute fits across spectra.
+        """
+
+
+    def _estimate_costs(self, spectra):
+        """Estimate the relative cost of fitting each of a group of power spectra.
+
+        Parameters
+        ----------
+        spectra : 2d array, shape=[n_spectra, n_freqs]
+            Power values, in log10 scale.
+
+        Returns
+        -------
+        costs : 1d array or None
+            Estimated relative cost of fitting each power spectrum, or None if not estimated.
+
+        Notes
+        -----
+        This is used to schedule parallel fitting, running the most costly fits first, if in
+        schedule state (see `set_schedule`). Algorithms can overload this function to provide
+        cost estimates.
+        """
+
+        return None
+
+
+    def _get_costs(self, spectra):
+        """Get the estimated costs of fitting a group of power spectra, if in schedule state.
+
+        Parameters
+        ----------
+        spectra : 2d array, shape=[n_spectra, n_freqs]
+            Power values, in log10 scale.
+
+        Returns
+        -------
+        costs : 1d array or None
+            Estimated relative cost of fitting each power spectrum, or None if not estimated.
+        """
+
+        return self._estimate_costs(spectra) if self._schedule else None
+
+
     def add_settings(self, settings):
         """Add settings into object from a ModelSettings object.
 
@@ -125,6 +190,222 @@ class Algorithm():
         self._debug = debug
 
 
+    def get_profile(self):
+        """Return object profile status."""
+
+        return self._profiler is not None
+
+
+    def set_profile(self, profile):
+        """Set profile state, which controls if timing information is recorded during fitting.
+
+        Parameters
+        ----------
+        profile : bool
+            Whether to run in profile state.
+
+        Notes
+        -----
+        When in profile state, the wall time and number of fit function evaluations are
+        recorded for each stage of each model fit, and stored in the results object.
+        """
+
+        self._profiler = FitProfiler() if profile else None
+
+
+    def _profile(self, stage):
+        """Get a context manager to profile a stage of fitting, which does nothing if not profiling.
+
+        Parameters
+        ----------
+        stage : str
+            Name of the fitting stage.
+
+        Returns
+        -------
+        context manager
+            Context manager to run the stage within.
+        """
+
+        return self._profiler.stage(stage) if self._profiler else nullcontext()
+
+
+    def get_cache(self):
+        """Return object cache status."""
+
+        return self._cache is not None
+
+
+    def set_cache(self, cache):
+        """Set cache state, which controls if the outputs of stages of fitting are reused.
+
+        Parameters
+        ----------
+        cache : bool or StageCache
+            Whether to cache the outputs of stages of fitting.
+            If a StageCache object, this object is used as the cache.
+
+        Notes
+        -----
+        When in cache state, the output of each cached stage of fitting is stored, keyed by the
+        data and the settings the stage depends on, and reused by any later fit with the same
+        keys, for example when re-fitting the same data after changing a setting of a later stage.
+        Setting the cache state resets any existing cache. Stages are not cached if a fit budget
+        is set, as then the outputs of stages depend on the time available, and outputs computed
+        when fitting in parallel are not stored, as these are fit with copies of the object.
+        """
+
+        self._cache = cache if isinstance(cache, StageCache) else StageCache() if cache else None
+
+
+    def _get_stage_key(self, *items):
+        """Get the cache key for a stage of fitting, which is None if not caching.
+
+        Parameters
+        ----------
+        *items
+            Items the output of the stage depends on, including the keys of any previous stages.
+
+        Returns
+        -------
+        str or None
+            Cache key for the stage, or None if not caching.
+        """
+
+        return make_key(*items) if self._cache is not None and not self._budget else None
+
+
+    def _run_stage(self, stage, key, func, *args, **kwargs):
+        """Run a stage of fitting, reusing the cached output of the stage, if available.
+
+        Parameters
+        ----------
+        stage : str
+            Name of the fitting stage.
+        key : str or None
+            Cache key for the stage. If None, the stage is run without caching.
+        func : callable
+            Function to run the stage, returning the output of the stage as an array.
+        *args, **kwargs
+            Inputs to the function.
+
+        Returns
+        -------
+        array
+            Output of the stage.
+        """
+
+        output = self._cache.get(stage, key) if key is not None else None
+        if output is None:
+            with self._profile(stage):
+                output = func(*args, **kwargs)
+            if key is not None:
+                self._cache.add(stage, key, output)
+
+        return output
+
+
+    def get_schedule(self):
+        """Return object schedule status."""
+
+        return self._schedule
+
+
+    def set_schedule(self, schedule):
+        """Set schedule state, which controls if parallel fits are run most costly first.
+
+        Parameters
+        ----------
+        schedule : bool
+            Whether to run in schedule state.
+
+        Notes
+        -----
+        When in schedule state, the relative cost of each model fit is estimated before
+        fitting in parallel (see `_estimate_costs`), and the most costly fits are run first,
+        which can reduce the overall time when the costs of fits vary widely. Estimating the
+        costs is run across all power spectra before any fits start, and so adds to the time
+        to fit, which may outweigh the benefit if the costs of fits are similar.
+        """
+
+        self._schedule = schedule
+
+
+    def get_budget(self):
+        """Return object budget definition."""
+
+        budget = self._budget if self._budget else FitBudget()
+
+        return {'max_time' : budget.max_time, 'max_nfev' : budget.max_nfev,
+                'deadline' : budget.deadline}
+
+
+    def set_budget(self, max_time=None, max_nfev=None, deadline=None):
+        """Set a budget, which limits the time and fit function evaluations of each model fit.
+
+        Parameters
+        ----------
+        max_time : float, optional
+            Maximum wall time for each model fit, in seconds.
+        max_nfev : int, optional
+            Maximum number of fit function evaluations for each model fit, across all stages.
+        deadline : float, optional
+            Absolute time, as returned by `time.time`, by which any model fit must finish.
+
+        Notes
+        -----
+        If all inputs are None, any existing budget is removed.
+        How a model fit proceeds if the budget is exhausted depends on the fit algorithm.
+        """
+
+        self._budget = None if max_time is None and max_nfev is None and deadline is None \
+            else FitBudget(max_time, max_nfev, deadline)
+
+
+    @contextmanager
+    def _deadline(self, deadline):
+        """Context manager to add a deadline to the fit budget, which does nothing if None.
+
+        Parameters
+        ----------
+        deadline : float or None
+            Time from now, in seconds, by which any model fit must finish.
+        """
+
+        budget = self.get_budget()
+        if deadline is not None:
+            self.set_budget(budget['max_time'], budget['max_nfev'], time() + deadline)
+
+        try:
+            yield
+        finally:
+            if deadline is not None:
+                self.set_budget(**budget)
+
+
+    def _track_func(self, func):
+        """Get a fit function, wrapped to count evaluations if profiling or budgeting.
+
+        Parameters
+        ----------
+        func : callable
+            Fit function.
+
+        Returns
+        -------
+        callable
+            Fit function, wrapped to count evaluations if profiling or budgeting,
+            or otherwise unchanged.
+        """
+
+        if self._budget:
+            func = self._budget.count(func)
+        if self._profiler:
+            func = self._profiler.count(func)
+
+        return func
+
+
     def print(self, description=False, concise=False):
         """Print out the algorithm name and fit settings.
 
@@ -184,12 +465,13 @@ class AlgorithmCF(Algorithm):
     """
 
     def __init__(self, public_settings, private_settings=None, data_format='spectrum',
-                 modes=None, data=None, results=None, model=None, debug=False):
+                 modes=None, data=None, results=None, model=None, debug=False, profile=False,
+                 cache=False):
         """Initialize Algorithm object."""
 
         Algorithm.__init__(self, public_settings, private_settings=private_settings,
-                           data_format=data_format, modes=modes, data=data,
-                           results=results, model=model, debug=debug)
+                           data_format=data_format, modes=modes, data=data, results=results,
+                           model=model, debug=debug, profile=profile, cache=cache)
 
         self._cf_settings_desc = CURVE_FIT_SETTINGS
         self._cf_settings = SettingsValues(self._cf_settings_desc.names)
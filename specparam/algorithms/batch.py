@@ -0,0 +1,176 @@
+"""Batched curve fitting, to fit a function to many sets of data at once."""
+
+import numpy as np
+
+###################################################################################################
+###################################################################################################
+
+def batch_eval(func, xs, params):
+    """Evaluate a fit function for a batch of parameters.
+
+    Parameters
+    ----------
+    func : callable
+        Fit function, with a signature of `func(xs, *params)`.
+    xs : 1d array
+        Input x-axis values.
+    params : 2d array, shape=[n_batch, n_params]
+        Parameters for each element of the batch.
+
+    Returns
+    -------
+    ys : 2d array, shape=[n_batch, n_xs]
+        Output values for each element of the batch.
+
+    Notes
+    -----
+    This requires a fit function that broadcasts across arrays of parameters, which is
+    the case for fit functions that are defined with element-wise operations.
+    """
+
+    ys = func(xs, *params.T[:, :, None])
+    if ys.shape != (len(params), len(xs)):
+        ys = np.broadcast_to(ys, (len(params), len(xs))).copy()
+
+    return ys
+
+
+def batch_jacobian(func, xs, params, jacobian=None):
+    """Compute the Jacobian of a fit function for a batch of parameters.
+
+    Parameters
+    ----------
+    func : callable
+        Fit function, with a signature of `func(xs, *params)`.
+    xs : 1d array
+        Input x-axis values.
+    params : 2d array, shape=[n_batch, n_params]
+        Parameters for each element of the batch.
+    jacobian : callable, optional
+        Jacobian function, with a signature of `jacobian(xs, *params)`.
+        If not provided, the Jacobian is computed with forward differences.
+
+    Returns
+    -------
+    jac : 3d array, shape=[n_batch, n_xs, n_params]
+        Jacobian for each element of the batch.
+    """
+
+    if jacobian is not None:
+        return jacobian(xs, *params.T[:, :, None])
+
+    ys = batch_eval(func, xs, params)
+    steps = np.sqrt(np.finfo(float).eps) * np.maximum(np.abs(params), 1)
+
+    jac = np.empty(ys.shape + (params.shape[1],))
+    for ind in range(params.shape[1]):
+        shifted = params.copy()
+        shifted[:, ind] += steps[:, ind]
+        jac[:, :, ind] = (batch_eval(func, xs, shifted) - ys) / steps[:, ind, None]
+
+    return jac
+
+
+def batch_curve_fit(func, xs, ys, guess, bounds=None, mask=None, weights=None, jacobian=None,
+                    max_iter=1000, tol=1e-5):
+    """Fit a function to a batch of data, with a vectorized, bounded Levenberg-Marquardt solver.
+
+    Parameters
+    ----------
+    func : callable
+        Fit function, with a signature of `func(xs, *params)`, that broadcasts across parameters.
+    xs : 1d array
+        Input x-axis values, shared across the batch.
+    ys : 2d array, shape=[n_batch, n_xs]
+        Data to fit, for each element of the batch.
+    guess : 2d array, shape=[n_batch, n_params]
+        Guess parameters, for each element of the batch.
+    bounds : tuple of 2d array, optional
+        Lower and upper bounds on the parameters, each with the same shape as `guess`.
+    mask : 2d array of bool, optional
+        Which parameters to fit, with the same shape as `guess`.
+        Parameters that are not fit, for example padding, are held at their guess values.
+    weights : 2d array, optional
+        Weights for each data point, with the same shape as `ys`.
+        A weight of zero excludes the data point from the fit.
+    jacobian : callable, optional
+        Jacobian function, that broadcasts across parameters.
+        If not provided, the Jacobian is computed with forward differences.
+    max_iter : int, optional, default: 1000
+        The maximum number of iterations.
+    tol : float, optional, default: 1e-5
+        Tolerance for convergence, on the relative change of the cost and of the parameters.
+
+    Returns
+    -------
+    params : 2d array, shape=[n_batch, n_params]
+        Fit parameters, for each element of the batch.
+    converged : 1d array of bool
+        Whether the fit converged, for each element of the batch.
+
+    Notes
+    -----
+    Each element of the batch is fit independently, with its own damping, and stops iterating
+    once converged, such that only unconverged elements are computed in each iteration.
+    Bounds are enforced by projecting each step into the bounds, and parameters at a bound
+    are held at the bound for any step that would otherwise move them past it.
+    """
+
+    params = np.array(guess, dtype=float)
+    mask = np.ones(params.shape, dtype=bool) if mask is None else np.asarray(mask, dtype=bool)
+    weights = np.ones(ys.shape) if weights is None else np.asarray(weights, dtype=float)
+    lower, upper = (np.full(params.shape, -np.inf), np.full(params.shape, np.inf)) \
+        if bounds is None else (np.asarray(bounds[0]), np.asarray(bounds[1]))
+    params = np.clip(params, lower, upper)
+
+    def get_resid(params, inds):
+        return weights[inds] * (ys[inds] - batch_eval(func, xs, params))
+
+    resid = get_resid(params, slice(None))
+    cost = np.sum(resid**2, axis=1)
+    damping = np.full(len(params), 1e-3)
+    converged = np.zeros(len(params), dtype=bool)
+    active = np.arange(len(params))
+
+    for _ in range(max_iter):
+
+        # Compute the damped Gauss-Newton step for each active element of the batch
+        #   Parameters at a bound, with a gradient towards the bound, are held for the step
+        jac_t = (batch_jacobian(func, xs, params[active], jacobian) * \
+            weights[active][:, :, None] * mask[active][:, None, :]).transpose(0, 2, 1)
+        grad = (jac_t @ resid[active][:, :, None])[:, :, 0]
+        held = ((params[active] <= lower[active]) & (grad < 0)) | \
+            ((params[active] >= upper[active]) & (grad > 0))
+        jac_t = jac_t * ~held[:, :, None]
+        grad[held] = 0
+        jtj = jac_t @ jac_t.transpose(0, 2, 1)
+        diag_inds = np.arange(params.shape[1])
+        jtj[:, diag_inds, diag_inds] += \
+            damping[active, None] * np.maximum(jtj[:, diag_inds, diag_inds], 1e-12)
+        step = np.linalg.solve(jtj, grad[:, :, None])[:, :, 0]
+
+        # Take the step, projected into the bounds, and check if it improves the fit
+        new_params = np.clip(params[active] + step * mask[active], lower[active], upper[active])
+        new_resid = get_resid(new_params, active)
+        new_cost = np.sum(new_resid**2, axis=1)
+        improved = new_cost < cost[active]
+
+        # Check for convergence, on the change of the cost or of the parameters
+        change = np.linalg.norm(new_params - params[active], axis=1)
+        done = (improved & (cost[active] - new_cost <= tol * cost[active])) | \
+            (change <= tol * (tol + np.linalg.norm(params[active], axis=1)))
+
+        # Update parameters & damping, reducing damping after steps that improve the fit
+        updated = active[improved]
+        params[updated], resid[updated], cost[updated] = \
+            new_params[improved], new_resid[improved], new_cost[improved]
+        damping[active] = np.where(improved, damping[active] / 10, damping[active] * 10)
+
+        # Stop once converged, or if no step improves the fit, as is the case at a minimum
+        done = done | (damping[active] > 1e10)
+        converged[active[done]] = True
+        active = active[~done]
+        if not len(active):
+            break
+
+    return params, converged
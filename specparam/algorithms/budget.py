@@ -0,0 +1,94 @@
+"""Define a budget object, to limit the time and function evaluations used by a model fit."""
+
+from time import time
+
+from specparam.modutils.errors import BudgetError
+
+###################################################################################################
+###################################################################################################
+
+class FitBudget():
+    """Tracks the wall time and function evaluations of a model fit against a budget.
+
+    Parameters
+    ----------
+    max_time : float, optional
+        Maximum wall time for each model fit, in seconds.
+    max_nfev : int, optional
+        Maximum number of fit function evaluations for each model fit, across all stages.
+    deadline : float, optional
+        Absolute time, as returned by `time.time`, by which any model fit must finish.
+
+    Attributes
+    ----------
+    nfev : int
+        Number of fit function evaluations in the current model fit.
+
+    Notes
+    -----
+    The deadline is defined in terms of the system clock, such that it is consistent
+    across processes, as is needed when fitting in parallel.
+    """
+
+    def __init__(self, max_time=None, max_nfev=None, deadline=None):
+        """Initialize budget object."""
+
+        self.max_time = max_time
+        self.max_nfev = max_nfev
+        self.deadline = deadline
+
+        self.start()
+
+
+    def start(self):
+        """Start tracking the budget, for example, at the start of a new model fit."""
+
+        self.nfev = 0
+        self._stop = self.deadline
+        if self.max_time is not None:
+            stop = time() + self.max_time
+            self._stop = stop if self._stop is None else min(stop, self._stop)
+
+
+    @property
+    def exhausted(self):
+        """Whether the budget of the current model fit is exhausted."""
+
+        return (self.max_nfev is not None and self.nfev >= self.max_nfev) or \
+            (self._stop is not None and time() >= self._stop)
+
+
+    def check(self):
+        """Check the budget, raising an error if it is exhausted.
+
+        Raises
+        ------
+        BudgetError
+            If the budget of the current model fit is exhausted.
+        """
+
+        if self.exhausted:
+            raise BudgetError("Model fitting was stopped as the fit budget was exhausted, "
+                              "after {} function evaluations.".format(self.nfev))
+
+
+    def count(self, func):
+        """Wrap a function to count its evaluations, checking the budget before each call.
+
+        Parameters
+        ----------
+        func : callable
+            Function to wrap.
+
+        Returns
+        -------
+        counted : callable
+            Wrapped function, which raises a BudgetError if the budget is exhausted.
+        """
+
+        def counted(*args, **kwargs):
+            self.check()
+            self.nfev += 1
+            return func(*args, **kwargs)
+
+        return counted
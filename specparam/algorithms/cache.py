@@ -0,0 +1,137 @@
+"""Define a stage cache object, to reuse the outputs of stages of model fitting across fits."""
+
+from hashlib import blake2b
+from collections import OrderedDict
+
+import numpy as np
+
+###################################################################################################
+###################################################################################################
+
+class StageCache():
+    """Stores the outputs of stages of model fitting, keyed by the inputs each stage depends on.
+
+    Parameters
+    ----------
+    max_size : int, optional
+        Maximum number of outputs to store for each stage, with the least recently used
+        outputs dropped first. If not provided, there is no limit.
+
+    Attributes
+    ----------
+    hits : dict
+        Number of outputs that were reused, for each stage.
+    misses : dict
+        Number of outputs that were computed, for each stage.
+
+    Notes
+    -----
+    Keys should be created with `make_key`, from everything the output of a stage depends on,
+    including the key of any stage the stage depends on, such that changing a setting of a
+    stage only invalidates the outputs of that stage, and of the stages that follow it.
+    """
+
+    def __init__(self, max_size=None):
+        """Initialize cache object."""
+
+        self.max_size = max_size
+        self.reset()
+
+
+    def reset(self):
+        """Reset the cache, removing all stored outputs."""
+
+        self._store = {}
+        self.hits = {}
+        self.misses = {}
+
+
+    def __len__(self):
+        """Define the length of the object as the total number of stored outputs."""
+
+        return sum(len(outputs) for outputs in self._store.values())
+
+
+    def get(self, stage, key):
+        """Get the stored output of a stage.
+
+        Parameters
+        ----------
+        stage : str
+            Name of the stage.
+        key : str
+            Key of the stage inputs.
+
+        Returns
+        -------
+        array or None
+            A copy of the stored output, or None if there is no stored output for the key.
+        """
+
+        outputs = self._store.get(stage, {})
+        if key not in outputs:
+            self.misses[stage] = self.misses.get(stage, 0) + 1
+            return None
+
+        outputs.move_to_end(key)
+        self.hits[stage] = self.hits.get(stage, 0) + 1
+
+        return np.copy(outputs[key])
+
+
+    def add(self, stage, key, output):
+        """Store the output of a stage.
+
+        Parameters
+        ----------
+        stage : str
+            Name of the stage.
+        key : str
+            Key of the stage inputs.
+        output : array
+            Output of the stage.
+        """
+
+        outputs = self._store.setdefault(stage, OrderedDict())
+        outputs[key] = np.copy(output)
+        outputs.move_to_end(key)
+
+        if self.max_size is not None and len(outputs) > self.max_size:
+            outputs.popitem(last=False)
+
+
+def make_key(*items):
+    """Make a cache key from a set of items.
+
+    Parameters
+    ----------
+    *items
+        Items to make the key from, such as arrays, settings values, and other keys.
+
+    Returns
+    -------
+    str
+        Key, as a hash of the items.
+    """
+
+    hasher = blake2b(digest_size=16)
+    for item in items:
+        _update_hash(hasher, item)
+
+    return hasher.hexdigest()
+
+
+def _update_hash(hasher, item):
+    """Update a hash object with an item, including the contents of arrays & sequences."""
+
+    if isinstance(item, np.ndarray):
+        hasher.update(repr((item.dtype.str, item.shape)).encode())
+        hasher.update(np.ascontiguousarray(item).tobytes())
+    elif isinstance(item, (list, tuple)):
+        hasher.update(b'(')
+        for element in item:
+            _update_hash(hasher, element)
+        hasher.update(b')')
+    else:
+        hasher.update(repr(item).encode())
+    hasher.update(b',')
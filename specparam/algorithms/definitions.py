@@ -5,6 +5,8 @@ from functools import partial
 from specparam.utils.checks import check_selection
 from specparam.algorithms.algorithm import Algorithm
 from specparam.algorithms.spectral_fit import SpectralFitAlgorithm
+from specparam.algorithms.spectral_fit_batch import SpectralFitBatchAlgorithm
+from specparam.algorithms.spectral_fit_lm import SpectralFitLMAlgorithm
 
 ###################################################################################################
 ###################################################################################################
@@ -12,6 +14,8 @@ from specparam.algorithms.spectral_fit import SpectralFitAlgorithm
 # Collect available fitting algorithms
 ALGORITHMS = {
     'spectral_fit' : SpectralFitAlgorithm,
+    'spectral_fit_batch' : SpectralFitBatchAlgorithm,
+    'spectral_fit_lm' : SpectralFitLMAlgorithm,
 }
 
 check_algorithm_definition = partial(check_selection, definition=Algorithm)
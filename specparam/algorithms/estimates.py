@@ -31,6 +31,8 @@ def estimate_fwhm(flatspec, peak_ind, freq_res):
     """
 
     # Find half height index on each side of the given peak index
+    #   Note: this scans out from the peak, stopping at the first crossing, which for typical
+    #   peaks is only a few samples, and so is faster than masking the whole spectrum
     half_height = 0.5 * flatspec[peak_ind]
     le_ind = next((val for val in range(peak_ind - 1, 0, -1) \
                   if flatspec[val] <= half_height), None)
@@ -50,3 +52,45 @@ def estimate_fwhm(flatspec, peak_ind, freq_res):
         fwhm = np.nan
 
     return fwhm
+
+
+def batch_estimate_fwhm(flatspecs, peak_inds, freq_res):
+    """Estimate the Full-Width Half Max (FWHM) of a peak in each of a batch of flattened spectra.
+
+    Parameters
+    ----------
+    flatspecs : 2d array, shape=[n_spectra, n_freqs]
+        Flattened power spectra.
+    peak_inds : 1d array of int
+        Index of the peak in each flattened spectrum to compute FWHM for.
+    freq_res : float
+        Frequency resolution.
+
+    Returns
+    -------
+    fwhms : 1d array
+        Estimated full width half maximum of the peak in each flattened spectrum.
+        Values are NaN where the FWHM could not be estimated.
+
+    Notes
+    -----
+    This is a vectorized version of `estimate_fwhm`, with the same procedure and outputs.
+    """
+
+    rows = np.arange(len(flatspecs))
+    freq_inds = np.arange(flatspecs.shape[1])
+    peak_inds = np.asarray(peak_inds)
+
+    # Find the nearest index at or below half height on each side of each peak index
+    #   Note: as in `estimate_fwhm`, the left side search does not include the first index
+    below = flatspecs <= 0.5 * flatspecs[rows, peak_inds][:, None]
+    le_inds = np.max(np.where(below & (freq_inds > 0) & (freq_inds < peak_inds[:, None]),
+                              freq_inds, -np.inf), axis=1)
+    ri_inds = np.min(np.where(below & (freq_inds > peak_inds[:, None]),
+                              freq_inds, np.inf), axis=1)
+
+    # Use the short side to estimate FWHM, which is infinite (set as NaN) if neither was found
+    short_side = np.minimum(peak_inds - le_inds, ri_inds - peak_inds)
+    fwhms = np.where(np.isinf(short_side), np.nan, short_side * 2 * freq_res)
+
+    return fwhms
@@ -0,0 +1,149 @@
+"""Define a profiler object, to collect timing information across the stages of model fitting."""
+
+from time import perf_counter
+from contextlib import contextmanager
+
+import numpy as np
+
+###################################################################################################
+###################################################################################################
+
+# Measures that are collected per stage of a model fit
+PROFILE_MEASURES = ['time', 'nfev']
+
+
+class FitProfiler():
+    """Collects wall time and function evaluation counts across the stages of a model fit.
+
+    Attributes
+    ----------
+    record : dict
+        Profile of the current model fit, as {stage : {'time' : float, 'nfev' : int}}.
+        Times are in seconds. The 'nfev' field counts calls to the fit function(s).
+
+    Notes
+    -----
+    Stages can be nested, in which case the time recorded for the outer stage excludes the time
+    spent in the inner stage(s). Function evaluations are attributed to the innermost active stage.
+    """
+
+    def __init__(self):
+        """Initialize profiler object."""
+
+        self.reset()
+
+
+    def reset(self):
+        """Reset the profile record, for example, before a new model fit."""
+
+        self.record = {}
+        self._stage = None
+        self._nested = 0.
+
+
+    @contextmanager
+    def stage(self, name):
+        """Context manager to time a stage of a model fit.
+
+        Parameters
+        ----------
+        name : str
+            Name of the stage.
+        """
+
+        outer, outer_nested = self._stage, self._nested
+        self._stage, self._nested = name, 0.
+        self.add(name)
+        start = perf_counter()
+
+        try:
+            yield
+        finally:
+            duration = perf_counter() - start
+            self.add(name, time=duration - self._nested)
+            self._stage, self._nested = outer, outer_nested + duration
+
+
+    def add(self, name, time=0., nfev=0):
+        """Add to the record of a stage.
+
+        Parameters
+        ----------
+        name : str
+            Name of the stage.
+        time : float, optional, default: 0.
+            Time to add to the stage, in seconds.
+        nfev : int, optional, default: 0
+            Number of function evaluations to add to the stage.
+        """
+
+        entry = self.record.setdefault(name, {'time' : 0., 'nfev' : 0})
+        entry['time'] += time
+        entry['nfev'] += nfev
+
+
+    def count(self, func):
+        """Wrap a function to count its evaluations, attributing them to the active stage.
+
+        Parameters
+        ----------
+        func : callable
+            Function to wrap.
+
+        Returns
+        -------
+        counted : callable
+            Wrapped function.
+        """
+
+        def counted(*args, **kwargs):
+            if self._stage is not None:
+                self.add(self._stage, nfev=1)
+            return func(*args, **kwargs)
+
+        return counted
+
+
+def summarize_profiles(profiles, percentile=95):
+    """Summarize a collection of model fit profiles, per stage.
+
+    Parameters
+    ----------
+    profiles : list of dict or None
+        Profile records, for each model fit. Any empty or None records are skipped.
+    percentile : float, optional, default: 95
+        Percentile to compute, in addition to the mean and maximum.
+
+    Returns
+    -------
+    summary : dict
+        Summary per stage, as {stage : {label : value}}, with labels for the number of fits
+        that the stage was run in ('n_fits'), and the mean, percentile & max of each measure.
+
+    Examples
+    --------
+    Summarize profiles across fits, and organize as a dataframe:
+
+    >>> import pandas as pd
+    >>> profiles = [{'stage' : {'time' : 0.1, 'nfev' : 10}},
+    ...             {'stage' : {'time' : 0.2, 'nfev' : 12}}]
+    >>> df = pd.DataFrame(summarize_profiles(profiles)).T
+    """
+
+    profiles = [profile for profile in profiles if profile]
+
+    stages = []
+    for profile in profiles:
+        stages.extend([stage for stage in profile if stage not in stages])
+
+    summary = {}
+    for stage in stages:
+        records = [profile[stage] for profile in profiles if stage in profile]
+        summary[stage] = {'n_fits' : len(records)}
+        for measure in PROFILE_MEASURES:
+            values = np.array([record[measure] for record in records])
+            summary[stage][measure + '_mean'] = np.mean(values)
+            summary[stage][measure + '_p' + str(percentile)] = np.percentile(values, percentile)
+            summary[stage][measure + '_max'] = np.max(values)
+
+    return summary
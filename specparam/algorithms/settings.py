@@ -5,6 +5,10 @@ from collections import namedtuple
 ###################################################################################################
 ###################################################################################################
 
+# Store of ModelSettings objects, indexed by the settings definitions they are created for
+_MODEL_SETTINGS = {}
+
+
 class SettingsValues():
     """Defines a set of algorithm settings values.
 
@@ -171,15 +175,26 @@ class SettingsDefinition():
 
 
     def make_model_settings(self):
-        """Create a custom ModelSettings object for the current object's settings definition."""
+        """Create a custom ModelSettings object for the current object's settings definition.
+
+        Notes
+        -----
+        ModelSettings objects are created once for each settings definition, and then reused.
+        """
+
+        key = tuple((name, definition['type'], definition['description']) \
+            for name, definition in self._definitions.items())
+
+        if key not in _MODEL_SETTINGS:
 
-        class ModelSettings(namedtuple('ModelSettings', self.names)):
-            __slots__ = ()
+            class ModelSettings(namedtuple('ModelSettings', self.names)):
+                __slots__ = ()
 
-            @property
-            def names(self):
-                return list(self._fields)
+                @property
+                def names(self):
+                    return list(self._fields)
 
-        ModelSettings.__doc__ = self.make_docstring()
+            ModelSettings.__doc__ = self.make_docstring()
+            _MODEL_SETTINGS[key] = ModelSettings
 
-        return ModelSettings
+        return _MODEL_SETTINGS[key]
@@ -5,20 +5,38 @@ from itertools import repeat
 
 import numpy as np
 from numpy.linalg import LinAlgError
-from scipy.optimize import curve_fit
+from scipy.linalg import solve_triangular
+from scipy.optimize import curve_fit, nnls
 
-from specparam.modutils.errors import FitError
+from specparam.modutils.errors import FitError, BudgetError
+from specparam.data.data import Data
+from specparam.data.grid import get_log_freqs
 from specparam.utils.select import groupby
 from specparam.data.periodic import sort_peaks
 from specparam.reports.strings import gen_width_warning_str
 from specparam.params.periodic import compute_gauss_std
 from specparam.algorithms.algorithm import AlgorithmCF
-from specparam.algorithms.estimates import estimate_fwhm
+from specparam.algorithms.batch import batch_eval
+from specparam.algorithms.estimates import estimate_fwhm, batch_estimate_fwhm
 from specparam.algorithms.settings import SettingsDefinition
+from specparam.utils.checks import check_input_options
 
 ###################################################################################################
 ###################################################################################################
 
+# Available methods for fitting the aperiodic & periodic components
+AP_FIT_METHODS = ['curve_fit', 'varpro']
+PE_FIT_METHODS = ['curve_fit', 'varpro']
+
+# Fit modes supported for batched fitting, which have fit functions that broadcast across params
+BATCH_MODES = {
+    'aperiodic' : ['fixed', 'knee', 'doublexp'],
+    'periodic' : ['gaussian', 'cauchy'],
+}
+
+# Minimum number of frequency values in a decimated power spectrum, to use coarse-to-fine fitting
+COARSE_MIN_FREQS = 20
+
 SPECTRAL_FIT_SETTINGS_DEF = SettingsDefinition({
     'peak_width_limits' : {
         'type' : 'tuple of (float, float), optional, default: (0.5, 12.0)',
@@ -72,6 +90,41 @@ SPECTRAL_FIT_PRIVATE_SETTINGS_DEF = SettingsDefinition({
             '\n        '
             'By default, aperiodic fitting is unbound, but can be restricted here.',
         },
+    'ap_fit_method' : {
+        'type' : "{'curve_fit', 'varpro'}",
+        'description' : \
+            'Method for fitting the aperiodic component.'
+            '\n        '
+            '\'curve_fit\' optimizes all parameters, and \'varpro\' (variable projection) '
+            'solves for the offset'
+            '\n        '
+            'in closed form, such that only the nonlinear parameters are optimized.',
+        },
+    'pe_fit_method' : {
+        'type' : "{'curve_fit', 'varpro'}",
+        'description' : \
+            'Method for fitting the periodic component.'
+            '\n        '
+            '\'curve_fit\' optimizes all parameters, and \'varpro\' (variable projection) '
+            'solves for peak heights'
+            '\n        '
+            'with non-negative least squares, such that only the nonlinear parameters '
+            'are optimized.',
+        },
+    'decimation' : {
+        'type' : 'int',
+        'description' : \
+            'Decimation factor for coarse-to-fine fitting. If > 1, the power spectrum is first '
+            'fit after smoothing'
+            '\n        '
+            'and decimating by this factor, and the fit is then refined at full resolution, '
+            'starting from the'
+            '\n        '
+            'coarse fit. This falls back to fitting at full resolution if the decimated power '
+            'spectrum is too'
+            '\n        '
+            'coarse or short to fit, or if the coarse-to-fine fit fails.',
+        },
     'cf_bound' : {
         'type' : 'float',
         'description' : \
@@ -108,15 +161,18 @@ class SpectralFitAlgorithm(AlgorithmCF):
 
     def __init__(self, peak_width_limits=(0.5, 12.0), max_n_peaks=np.inf, min_peak_height=0.0,
                  peak_threshold=2.0, ap_percentile_thresh=0.025, ap_guess=None, ap_bounds=None,
+                 ap_fit_method='curve_fit', pe_fit_method='curve_fit', decimation=1,
                  cf_bound=1.5, bw_std_edge=1.0, gauss_overlap_thresh=0.75, maxfev=5000,
-                 tol=0.00001, modes=None, data=None, results=None, model=None, debug=False):
+                 tol=0.00001, modes=None, data=None, results=None, model=None, debug=False,
+                 profile=False, cache=False):
         """Initialize base model object"""
 
         # Initialize base algorithm object with algorithm metadata
         super().__init__(
             public_settings=SPECTRAL_FIT_SETTINGS_DEF,
             private_settings=SPECTRAL_FIT_PRIVATE_SETTINGS_DEF,
-            modes=modes, data=data, results=results, model=model, debug=debug)
+            modes=modes, data=data, results=results, model=model, debug=debug, profile=profile,
+            cache=cache)
 
         ## Public settings
         self.settings.peak_width_limits = peak_width_limits
@@ -128,6 +184,11 @@ class SpectralFitAlgorithm(AlgorithmCF):
         self._settings.ap_percentile_thresh = ap_percentile_thresh
         self._settings.ap_guess = ap_guess
         self._settings.ap_bounds = self._get_ap_bounds(ap_bounds)
+        self._settings.ap_fit_method = check_input_options(\
+            ap_fit_method, AP_FIT_METHODS, 'ap_fit_method')
+        self._settings.pe_fit_method = check_input_options(\
+            pe_fit_method, PE_FIT_METHODS, 'pe_fit_method')
+        self._settings.decimation = decimation
         self._settings.cf_bound = cf_bound
         self._settings.bw_std_edge = bw_std_edge
         self._settings.gauss_overlap_thresh = gauss_overlap_thresh
@@ -154,18 +215,119 @@ class SpectralFitAlgorithm(AlgorithmCF):
                                             self.settings.peak_width_limits[0]))
 
 
+    def _estimate_costs(self, spectra):
+        """Estimate the relative cost of fitting each of a group of power spectra.
+
+        Parameters
+        ----------
+        spectra : 2d array, shape=[n_spectra, n_freqs]
+            Power values, in log10 scale.
+
+        Returns
+        -------
+        costs : 1d array or None
+            Estimated relative cost of fitting each power spectrum, or None if not estimated,
+            which is the case for periodic modes that are not listed in `BATCH_MODES`.
+
+        Notes
+        -----
+        The cost of a model fit mostly scales with the number of peaks that are fit. Costs are
+        estimated as one plus the number of peak candidates, from running the peak search across
+        all power spectra at once (see `_batch_peak_guess`), after a quick flattening that fits
+        lines in log-log space, refit on points below the percentile threshold of the robust
+        aperiodic fit (see `_robust_ap_fit`). Power spectra with NaN or Inf values are not fit,
+        and are estimated at the base cost of one.
+        """
+
+        if self.modes.periodic.name not in BATCH_MODES['periodic']:
+            return None
+
+        costs = np.ones(len(spectra))
+        finite = np.all(np.isfinite(spectra), axis=1)
+        spectra = spectra[finite].astype('float64')
+        log_freqs = get_log_freqs(self.data.freqs)
+
+        def fit_lines(weights):
+            # Weighted least squares fit of lines, across all power spectra, in closed form
+            sw, sx, sxx = np.sum(weights, axis=1), weights @ log_freqs, weights @ log_freqs**2
+            sy, sxy = np.sum(weights * spectra, axis=1), (weights * spectra) @ log_freqs
+            with np.errstate(divide='ignore', invalid='ignore'):
+                slope = (sw * sxy - sx * sy) / (sw * sxx - sx**2)
+                offset = (sy - slope * sx) / sw
+            return offset[:, None] + slope[:, None] * log_freqs
+
+        flatspecs = np.clip(spectra - fit_lines(np.ones(spectra.shape)), 0, None)
+        perc_thresh = np.percentile(flatspecs, self._settings.ap_percentile_thresh, axis=1)
+        flatspecs = np.nan_to_num(spectra - fit_lines(flatspecs <= perc_thresh[:, None]))
+
+        guess, n_peaks = self._batch_peak_guess(flatspecs)
+        guess, n_peaks = self._batch_drop_peak_cf(guess, n_peaks)
+        _, n_peaks = self._batch_drop_peak_overlap(guess, n_peaks)
+        costs[finite] += n_peaks
+
+        return costs
+
+
     def _fit(self):
-        """Define the full fitting algorithm."""
+        """Define the full fitting algorithm.
+
+        Notes
+        -----
+        If a fit budget is set, and is exhausted after the initial aperiodic fit, then fitting
+        stops early, with the status recorded in the fit information of the results, as:
+
+        - 'aperiodic_only': exhausted while fitting peaks, such that no peaks are returned,
+          and the aperiodic parameters are from the initial (robust) aperiodic fit
+        - 'partial': exhausted during the final aperiodic fit, such that the fit peaks are
+          returned, with the aperiodic parameters from the initial (robust) aperiodic fit
+
+        If the decimation setting is > 1, the fit is done coarse-to-fine (see `_fit_coarse`),
+        unless a fit budget is set, falling back to fitting at full resolution if needed.
+        """
+
+        if self._check_coarse():
+            try:
+                self._fit_coarse()
+                return
+            except FitError:
+                # If the coarse-to-fine fit fails, fall back to fitting at full resolution
+                pass
+
+        self._fit_spectrum()
+
+
+    def _fit_spectrum(self):
+        """Fit the power spectrum, with the full fitting procedure.
+
+        Notes
+        -----
+        If caching, the output of each stage is keyed by the inputs & settings the stage depends
+        on, such that changing a setting only re-runs the stages that use it, and any stages
+        with inputs that change as a result. For example, changing a peak setting re-runs the
+        peak search, but re-uses the peak fits if the peak guesses are unchanged.
+        """
+
+        ap_key = self._get_stage_key(\
+            self.data.freqs, self.data.power_spectrum, self.modes.aperiodic.name,
+            self._settings.ap_percentile_thresh, self._settings.ap_guess, self._settings.ap_bounds,
+            self._settings.ap_fit_method, self._cf_settings.maxfev, self._cf_settings.tol)
 
         ## FIT PROCEDURES
 
         # Take an initial fit of the aperiodic component
-        temp_aperiodic_params = self._robust_ap_fit(self.data.freqs, self.data.power_spectrum)
+        temp_aperiodic_params = self._run_stage('robust_ap_fit', ap_key, self._robust_ap_fit,
+                                                self.data.freqs, self.data.power_spectrum)
         temp_ap_fit = self.modes.aperiodic.generate(self.data.freqs, *temp_aperiodic_params)
 
         # Find peaks from the flattened power spectrum, and fit them
         temp_spectrum_flat = self.data.power_spectrum - temp_ap_fit
-        self.results.params.periodic.add_params('fit', self._fit_peaks(temp_spectrum_flat))
+        try:
+            with self._profile('peak_search'):
+                peak_params = self._fit_peaks(temp_spectrum_flat)
+        except BudgetError:
+            peak_params = np.empty([0, self.modes.periodic.n_params])
+            self.results.fit_info['status'] = 'aperiodic_only'
+        self.results.params.periodic.add_params('fit', peak_params)
 
         # Calculate the peak fit
         #   Note: if no peaks are found, this creates a flat (all zero) peak fit
@@ -177,8 +339,18 @@ class SpectralFitAlgorithm(AlgorithmCF):
             self.data.power_spectrum - self.results.model._peak_fit
 
         # Run final aperiodic fit on peak-removed power spectrum
-        self.results.params.aperiodic.add_params('fit', \
-            self._simple_ap_fit(self.data.freqs, self.results.model._spectrum_peak_rm))
+        if 'status' in self.results.fit_info:
+            aperiodic_params = temp_aperiodic_params
+        else:
+            try:
+                final_key = self._get_stage_key(ap_key, self.modes.periodic.name, peak_params)
+                aperiodic_params = self._run_stage(\
+                    'simple_ap_fit', final_key, self._simple_ap_fit,
+                    self.data.freqs, self.results.model._spectrum_peak_rm)
+            except BudgetError:
+                aperiodic_params = temp_aperiodic_params
+                self.results.fit_info['status'] = 'partial'
+        self.results.params.aperiodic.add_params('fit', aperiodic_params)
         self.results.model._ap_fit = self.modes.aperiodic.generate(\
             self.data.freqs, *self.results.params.aperiodic.params)
 
@@ -188,6 +360,107 @@ class SpectralFitAlgorithm(AlgorithmCF):
             self.results.model._peak_fit + self.results.model._ap_fit
 
 
+    def _check_coarse(self):
+        """Check whether to fit coarse-to-fine, given the decimation setting and the data.
+
+        Returns
+        -------
+        bool
+            Whether to fit coarse-to-fine.
+
+        Notes
+        -----
+        Coarse-to-fine fitting is not used if a fit budget is set, if the decimated power
+        spectrum would have fewer than `COARSE_MIN_FREQS` frequency values, or if the decimated
+        frequency resolution is too coarse for the lower peak width limit (see `_fit_prechecks`).
+        """
+
+        decimation = self._settings.decimation
+
+        return decimation > 1 and not self._budget and \
+            len(self.data.freqs) // decimation >= COARSE_MIN_FREQS and \
+            1.5 * self.data.freq_res * decimation < self.settings.peak_width_limits[0]
+
+
+    def _get_coarse_data(self):
+        """Get the current power spectrum, smoothed and decimated for coarse fitting.
+
+        Returns
+        -------
+        coarse_data : Data
+            Data object with the smoothed and decimated frequencies and power spectrum.
+
+        Notes
+        -----
+        The power spectrum is smoothed and decimated by averaging (log) power values across
+        non-overlapping windows of `decimation` frequency values, dropping any remainder.
+        """
+
+        decimation = self._settings.decimation
+        n_freqs = len(self.data.freqs) // decimation * decimation
+
+        coarse_data = Data(check_freqs=False, check_data=False)
+        coarse_data.freqs = np.mean(self.data.freqs[:n_freqs].reshape(-1, decimation), axis=1)
+        coarse_data.power_spectrum = \
+            np.mean(self.data.power_spectrum[:n_freqs].reshape(-1, decimation), axis=1)
+        coarse_data.freq_range = [coarse_data.freqs[0], coarse_data.freqs[-1]]
+        coarse_data.freq_res = self.data.freq_res * decimation
+
+        return coarse_data
+
+
+    def _fit_coarse(self):
+        """Fit the power spectrum coarse-to-fine, refining a fit to the decimated data.
+
+        Notes
+        -----
+        The power spectrum is first fit, with the full fitting procedure, after smoothing and
+        decimating (see `_get_coarse_data`). The fit is then refined at full resolution, fitting
+        the peaks and then the aperiodic component, starting from the coarse fit parameters,
+        such that the robust aperiodic fit and the peak search are only run on the coarse data.
+        Peaks that are not found in the coarse data are not fit.
+        """
+
+        # Fit the smoothed and decimated power spectrum
+        data = self.data
+        self.data = self._get_coarse_data()
+        try:
+            with self._profile('coarse_fit'):
+                self._fit_spectrum()
+        finally:
+            self.data = data
+        ap_guess = self.results.params.aperiodic.get_params('fit')
+        peak_guess = self.results.params.periodic.get_params('fit')
+
+        # Refine the peak fits, on the power spectrum flattened by the coarse aperiodic fit
+        peak_params = np.empty([0, self.modes.periodic.n_params])
+        if len(peak_guess) > 0:
+            flatspec = self.data.power_spectrum - \
+                self.modes.aperiodic.generate(self.data.freqs, *ap_guess)
+            with self._profile('fit_peak_guess'):
+                peak_params = sort_peaks(self._fit_peak_guess(flatspec, peak_guess), 'CF', 'inc')
+        self.results.params.periodic.add_params('fit', peak_params)
+
+        # Calculate the peak fit, and create peak-removed power spectrum
+        self.results.model._peak_fit = self.modes.periodic.generate(\
+            self.data.freqs, *np.ndarray.flatten(peak_params))
+        self.results.model._spectrum_peak_rm = \
+            self.data.power_spectrum - self.results.model._peak_fit
+
+        # Refine the aperiodic fit on the peak-removed power spectrum
+        with self._profile('simple_ap_fit'):
+            aperiodic_params = self._simple_ap_fit(\
+                self.data.freqs, self.results.model._spectrum_peak_rm, ap_guess)
+        self.results.params.aperiodic.add_params('fit', aperiodic_params)
+        self.results.model._ap_fit = self.modes.aperiodic.generate(\
+            self.data.freqs, *aperiodic_params)
+
+        # Create remaining model components: flatspec & full power_spectrum model fit
+        self.results.model._spectrum_flat = self.data.power_spectrum - self.results.model._ap_fit
+        self.results.model.modeled_spectrum = \
+            self.results.model._peak_fit + self.results.model._ap_fit
+
+
     def _get_ap_guess(self, freqs, power_spectrum):
         """Get the guess parameters for the aperiodic fit.
 
@@ -242,7 +515,7 @@ class SpectralFitAlgorithm(AlgorithmCF):
         return ap_bounds
 
 
-    def _simple_ap_fit(self, freqs, power_spectrum):
+    def _simple_ap_fit(self, freqs, power_spectrum, ap_guess=None):
         """Fit the aperiodic component of the power spectrum.
 
         Parameters
@@ -251,6 +524,8 @@ class SpectralFitAlgorithm(AlgorithmCF):
             Frequency values for the power_spectrum, in linear scale.
         power_spectrum : 1d array
             Power values, in log10 scale.
+        ap_guess : 1d array, optional
+            Guess parameters for the aperiodic fit. If not provided, a guess is computed.
 
         Returns
         -------
@@ -258,23 +533,16 @@ class SpectralFitAlgorithm(AlgorithmCF):
             Parameter estimates for aperiodic fit.
         """
 
-        # Get the guess and bounds for the aperiodic parameters
-        ap_guess = self._get_ap_guess(freqs, power_spectrum)
+        # Get the guess for the aperiodic parameters
+        if ap_guess is None:
+            ap_guess = self._get_ap_guess(freqs, power_spectrum)
 
         # Ignore warnings that are raised in curve_fit
         #   A runtime warning can occur while exploring parameters in curve fitting
         #     This doesn't effect outcome - it won't settle on an answer that does this
         #   It happens if / when b < 0 & |b| > x**2, as it leads to log of a negative number
         try:
-            with warnings.catch_warnings():
-                warnings.simplefilter("ignore")
-                aperiodic_params, _ = curve_fit(self.modes.aperiodic.func, freqs, power_spectrum,
-                                                p0=ap_guess, bounds=self._settings.ap_bounds,
-                                                maxfev=self._cf_settings.maxfev,
-                                                check_finite=False,
-                                                ftol=self._cf_settings.tol,
-                                                xtol=self._cf_settings.tol,
-                                                gtol=self._cf_settings.tol)
+            aperiodic_params = self._fit_ap_func(freqs, power_spectrum, ap_guess)
         except RuntimeError as excp:
             error_msg = ("Model fitting failed due to not finding parameters in "
                          "the simple aperiodic component fit.")
@@ -283,6 +551,74 @@ class SpectralFitAlgorithm(AlgorithmCF):
         return aperiodic_params
 
 
+    def _fit_ap_func(self, freqs, power_spectrum, guess):
+        """Fit the aperiodic function, with the selected aperiodic fit method.
+
+        Parameters
+        ----------
+        freqs : 1d array
+            Frequency values for the power_spectrum, in linear scale.
+        power_spectrum : 1d array
+            Power values, in log10 scale.
+        guess : 1d array
+            Guess parameters for the aperiodic fit.
+
+        Returns
+        -------
+        aperiodic_params : 1d array
+            Parameter estimates for aperiodic fit.
+
+        Notes
+        -----
+        With variable projection, the offset, which enters the aperiodic function linearly,
+        is computed in closed form as the mean residual, given the nonlinear parameters,
+        such that `curve_fit` only optimizes the nonlinear parameters (e.g. knee & exponent).
+        If the offset is bounded, the closed form solution is clipped to the bounds.
+        """
+
+        func = self._track_func(self.modes.aperiodic.func)
+        guess, bounds = np.asarray(guess, dtype=float), self._settings.ap_bounds
+
+        # Check whether to use variable projection, which requires an (additive) offset parameter
+        off_ind = self.modes.aperiodic.params.indices.get('offset')
+        varpro = self._settings.ap_fit_method == 'varpro' and off_ind is not None
+
+        # For variable projection, the offset is solved in closed form, given the other params
+        if varpro:
+            n_params = self.modes.aperiodic.n_params
+            nl_inds = [ind for ind in range(n_params) if ind != off_ind]
+            off_lo, off_hi = bounds[0][off_ind], bounds[1][off_ind]
+
+            def fit_func(xs, *nl_params, return_params=False):
+                params = np.zeros(n_params)
+                params[nl_inds] = nl_params
+                ys = func(xs, *params)
+                params[off_ind] = np.clip(np.mean(power_spectrum - ys), off_lo, off_hi)
+                return params if return_params else ys + params[off_ind]
+
+            guess = guess[nl_inds]
+            bounds = (np.asarray(bounds[0])[nl_inds], np.asarray(bounds[1])[nl_inds])
+
+        else:
+            fit_func = func
+
+        # Ignore warnings that are raised in curve_fit - see note in _simple_ap_fit
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            aperiodic_params, _ = curve_fit(fit_func, freqs, power_spectrum,
+                                            p0=guess, bounds=bounds,
+                                            maxfev=self._cf_settings.maxfev,
+                                            check_finite=False,
+                                            ftol=self._cf_settings.tol,
+                                            xtol=self._cf_settings.tol,
+                                            gtol=self._cf_settings.tol)
+
+        if varpro:
+            aperiodic_params = fit_func(freqs, *aperiodic_params, return_params=True)
+
+        return aperiodic_params
+
+
     def _robust_ap_fit(self, freqs, power_spectrum):
         """Fit the aperiodic component of the power spectrum robustly, ignoring outliers.
 
@@ -323,16 +659,7 @@ class SpectralFitAlgorithm(AlgorithmCF):
         # Second aperiodic fit - using results of first fit as guess parameters
         #  See note in _simple_ap_fit about warnings
         try:
-            with warnings.catch_warnings():
-                warnings.simplefilter("ignore")
-                aperiodic_params, _ = curve_fit(self.modes.aperiodic.func,
-                                                freqs_ignore, spectrum_ignore,
-                                                p0=popt, bounds=self._settings.ap_bounds,
-                                                maxfev=self._cf_settings.maxfev,
-                                                check_finite=False,
-                                                ftol=self._cf_settings.tol,
-                                                xtol=self._cf_settings.tol,
-                                                gtol=self._cf_settings.tol)
+            aperiodic_params = self._fit_ap_func(freqs_ignore, spectrum_ignore, popt)
         except RuntimeError as excp:
             error_msg = ("Model fitting failed due to not finding "
                          "parameters in the robust aperiodic fit.")
@@ -359,70 +686,104 @@ class SpectralFitAlgorithm(AlgorithmCF):
             Parameters that define the peak fit(s).
         """
 
+        guess = self._get_peak_guess(flatspec)
+
+        # If there are peak guesses, fit the peaks, and sort results by CF
+        if len(guess) > 0:
+            key = self._get_stage_key(\
+                self.data.freqs, self.data.freq_range, flatspec, guess, self.modes.periodic.name,
+                self.settings.peak_width_limits, self._settings.pe_fit_method,
+                self._settings.cf_bound, self._cf_settings.maxfev, self._cf_settings.tol)
+            peak_params = self._run_stage('fit_peak_guess', key,
+                                          self._fit_peak_guess, flatspec, guess)
+            peak_params = sort_peaks(peak_params, 'CF', 'inc')
+
+        else:
+            peak_params = np.empty([0, self.modes.periodic.n_params])
+
+        return peak_params
+
+
+    def _get_peak_guess(self, flatspec):
+        """Iteratively find peaks in the flattened spectrum, to use as guesses for peak fitting.
+
+        Parameters
+        ----------
+        flatspec : 1d array
+            Flattened power spectrum values.
+
+        Returns
+        -------
+        guess : 2d array, shape=[n_peaks, n_params_per_peak]
+            Guess parameters for periodic fits to peaks.
+        """
+
+        inds = self.modes.periodic.params.indices
+        n_params = self.modes.periodic.n_params
+        generate = self.modes.periodic.generate
+
+        # Collect settings & data used in each iteration, to not look them up per candidate peak
+        freqs, freq_res = self.data.freqs, self.data.freq_res
+        max_n_peaks = self.settings.max_n_peaks
+        peak_threshold = self.settings.peak_threshold
+        min_peak_height = self.settings.min_peak_height
+        width_limits = self.settings.peak_width_limits
+        default_std = np.mean(width_limits)
+
         # Take a copy of the flattened spectrum to iterate across
         flat_iter = np.copy(flatspec)
-
-        # Initialize matrix of guess parameters for peak fitting
-        guess = np.empty([0, self.modes.periodic.n_params])
+        n_freqs = len(flat_iter)
 
         # Find peak: loop through, finding a candidate peak, & fit with a guess peak
         #   Stopping procedures: limit on # of peaks, or relative or absolute height thresholds
-        while len(guess) < self.settings.max_n_peaks:
+        guess = []
+        while len(guess) < max_n_peaks:
 
             # Find candidate peak - the maximum point of the flattened spectrum
-            max_ind = np.argmax(flat_iter)
+            max_ind = flat_iter.argmax()
             max_height = flat_iter[max_ind]
 
             # Stop searching for peaks once height drops below height threshold
-            if max_height <= self.settings.peak_threshold * np.std(flat_iter):
+            #   The standard deviation is computed as in `np.std`, with fewer function calls
+            deviation = flat_iter - np.add.reduce(flat_iter) / n_freqs
+            if max_height <= peak_threshold * np.sqrt(np.add.reduce(deviation * deviation) / \
+                                                      n_freqs):
                 break
 
-            # Set the guess parameters for peak fitting, specifying the mean and height
-            guess_freq = self.data.freqs[max_ind]
-            guess_height = max_height
-
             # Halt fitting process if candidate peak drops below minimum height
-            if not guess_height > self.settings.min_peak_height:
+            if not max_height > min_peak_height:
                 break
 
             # Estimate FWHM, and use to convert to an estimated Gaussian std
             #   If estimation process fails, then default guess to average of limits
-            fwhm = estimate_fwhm(flat_iter, max_ind, self.data.freq_res)
-            guess_std = compute_gauss_std(fwhm) if not np.isnan(fwhm) else \
-                np.mean(self.settings.peak_width_limits)
+            fwhm = estimate_fwhm(flat_iter, max_ind, freq_res)
+            guess_std = compute_gauss_std(fwhm) if not np.isnan(fwhm) else default_std
 
             # Check that guess value isn't outside preset limits - restrict if so
             #   This also converts the peak_width_limits from 2-sided BW to 1-sided std
             #   Note: without this, curve_fitting fails if given guess > or < bounds
-            if guess_std < self.settings.peak_width_limits[0] / 2:
-                guess_std = self.settings.peak_width_limits[0] / 2
-            if guess_std > self.settings.peak_width_limits[1] / 2:
-                guess_std = self.settings.peak_width_limits[0] / 2
-
-            # Collect guess parameters
-            cur_guess = [0] * self.modes.periodic.n_params
-            cur_guess[self.modes.periodic.params.indices['cf']] = guess_freq
-            cur_guess[self.modes.periodic.params.indices['pw']] = guess_height
-            cur_guess[self.modes.periodic.params.indices['bw']] = guess_std
+            if guess_std < width_limits[0] / 2:
+                guess_std = width_limits[0] / 2
+            if guess_std > width_limits[1] / 2:
+                guess_std = width_limits[0] / 2
+
+            # Collect guess parameters, specifying the mean, height and width
+            cur_guess = [0] * n_params
+            cur_guess[inds['cf']] = freqs[max_ind]
+            cur_guess[inds['pw']] = max_height
+            cur_guess[inds['bw']] = guess_std
+            guess.append(cur_guess)
 
             # Fit and subtract guess peak from the spectrum
-            guess = np.vstack((guess, cur_guess))
-            peak_fit = self.modes.periodic.generate(self.data.freqs, *cur_guess)
-            flat_iter = flat_iter - peak_fit
+            flat_iter -= generate(freqs, *cur_guess)
+
+        guess = np.array(guess, dtype=float).reshape(-1, n_params)
 
         # Check peaks based on edges, and on overlap, dropping any that violate requirements
         guess = self._drop_peak_cf(guess)
         guess = self._drop_peak_overlap(guess)
 
-        # If there are peak guesses, fit the peaks, and sort results by CF
-        if len(guess) > 0:
-            peak_params = self._fit_peak_guess(flatspec, guess)
-            peak_params = sort_peaks(peak_params, 'CF', 'inc')
-
-        else:
-            peak_params = np.empty([0, self.modes.periodic.n_params])
-
-        return peak_params
+        return guess
 
 
     def _get_pe_bounds(self, guess):
@@ -491,15 +852,27 @@ class SpectralFitAlgorithm(AlgorithmCF):
         -------
         pe_params : 2d array, shape=[n_peaks, n_params_per_peak]
             Parameters for periodic fits to peaks.
+
+        Notes
+        -----
+        With variable projection, the peak heights, which enter the peak functions linearly,
+        are solved with non-negative least squares, given the nonlinear parameters,
+        such that `curve_fit` only optimizes the nonlinear parameters (e.g. center & width).
         """
 
+        func, jac = self.modes.periodic.func, self.modes.periodic.jacobian
+        p0, bounds = np.ndarray.flatten(guess), self._get_pe_bounds(guess)
+
+        # For variable projection, the peak heights are solved linearly, given the other params
+        varpro = self._settings.pe_fit_method == 'varpro'
+        if varpro:
+            func, jac, p0, bounds = self._get_pe_varpro(flatspec, len(guess), p0, bounds)
+
         # Fit the peaks
         try:
-            pe_params, _ = curve_fit(self.modes.periodic.func,
+            pe_params, _ = curve_fit(self._track_func(func),
                                      self.data.freqs, flatspec,
-                                     p0=np.ndarray.flatten(guess),
-                                     bounds=self._get_pe_bounds(guess),
-                                     jac=self.modes.periodic.jacobian,
+                                     p0=p0, bounds=bounds, jac=jac,
                                      maxfev=self._cf_settings.maxfev,
                                      check_finite=False,
                                      ftol=self._cf_settings.tol,
@@ -516,12 +889,94 @@ class SpectralFitAlgorithm(AlgorithmCF):
                          "to a large number of guess peaks that cannot be fit together.")
             raise FitError(error_msg) from excp
 
+        if varpro:
+            pe_params = func(self.data.freqs, *pe_params, return_params=True)
+
         # Re-organize params into 2d matrix
         pe_params = np.array(groupby(pe_params, self.modes.periodic.n_params))
 
         return pe_params
 
 
+    def _get_pe_varpro(self, flatspec, n_peaks, guess, bounds):
+        """Get the fit function & definitions for fitting peaks with variable projection.
+
+        Parameters
+        ----------
+        flatspec : 1d array
+            Flattened power spectrum values.
+        n_peaks : int
+            Number of peaks to fit.
+        guess : 1d array
+            Guess parameters for all peaks.
+        bounds : tuple of array
+            Bounds for all peak parameters.
+
+        Returns
+        -------
+        fit_func : callable
+            Fit function of the nonlinear parameters, which solves for the peak heights.
+            If called with `return_params=True`, returns the full set of parameters.
+        fit_jac : callable or None
+            Jacobian of the fit function, if the periodic mode defines a Jacobian.
+        guess : 1d array
+            Guess parameters for the nonlinear parameters.
+        bounds : tuple of array
+            Bounds for the nonlinear parameters.
+
+        Notes
+        -----
+        Since each peak function is linear in its height, if the periodic mode defines a Jacobian,
+        the columns for the peak heights, computed at unit height, are the basis functions of
+        each peak, and the columns for other parameters scale with the height. From these, the
+        Jacobian of the fit function is computed (following Golub & Pereyra), treating any peaks
+        with heights at the lower bound of zero as fixed.
+        """
+
+        func, jacobian = self.modes.periodic.func, self.modes.periodic.jacobian
+        n_params = self.modes.periodic.n_params
+        pw_inds = np.arange(n_peaks) * n_params + self.modes.periodic.params.indices['pw']
+        nl_inds = np.setdiff1d(np.arange(n_peaks * n_params), pw_inds)
+
+        # Solve for the heights, caching the most recent solution, for use by the Jacobian
+        cache = {}
+        def solve(xs, nl_params):
+            key = tuple(nl_params)
+            if cache.get('key') != key:
+                params = np.ones(n_peaks * n_params)
+                params[nl_inds] = nl_params
+                if jacobian:
+                    unit_jac = jacobian(xs, *params)
+                    basis = unit_jac[:, pw_inds]
+                else:
+                    unit_jac = None
+                    basis = np.stack([func(xs, *peak) for peak in \
+                        groupby(params, n_params)], axis=1)
+                params[pw_inds] = nnls(basis, flatspec)[0]
+                cache.update(key=key, params=params, basis=basis, unit_jac=unit_jac)
+            return cache['params'], cache['basis']
+
+        def fit_func(xs, *nl_params, return_params=False):
+            params, basis = solve(xs, nl_params)
+            return params if return_params else basis @ params[pw_inds]
+
+        def fit_jac(xs, *nl_params):
+            params, basis = solve(xs, nl_params)
+            heights = params[pw_inds]
+            unit_jac = cache['unit_jac'][:, nl_inds]
+            nl_jac = unit_jac * np.repeat(heights, n_params - 1)
+            q_mat, r_mat = np.linalg.qr(basis[:, heights > 0])
+            pinv_t = np.zeros_like(basis)
+            pinv_t[:, heights > 0] = \
+                solve_triangular(r_mat, q_mat.T, trans='T', check_finite=False).T
+            resid = flatspec - basis @ heights
+            return nl_jac - q_mat @ (q_mat.T @ nl_jac) + \
+                np.repeat(pinv_t, n_params - 1, axis=1) * (resid @ unit_jac)
+
+        return fit_func, fit_jac if jacobian else None, \
+            guess[nl_inds], (bounds[0][nl_inds], bounds[1][nl_inds])
+
+
     def _drop_peak_cf(self, guess):
         """Check whether to drop peaks based on center's proximity to the edge of the spectrum.
 
@@ -536,18 +991,7 @@ class SpectralFitAlgorithm(AlgorithmCF):
             Guess parameters for periodic peak fits. Shape: [n_peaks, n_params_per_peak].
         """
 
-        cf_params = guess[:, self.modes.periodic.params.indices['cf']]
-        bw_params = guess[:, self.modes.periodic.params.indices['bw']] * self._settings.bw_std_edge
-
-        # Check if peaks within drop threshold from the edge of the frequency range
-        keep_peak = \
-            (np.abs(np.subtract(cf_params, self.data.freq_range[0])) > bw_params) & \
-            (np.abs(np.subtract(cf_params, self.data.freq_range[1])) > bw_params)
-
-        # Drop peaks that fail the center frequency edge criterion
-        guess = np.array([gu for (gu, keep) in zip(guess, keep_peak) if keep])
-
-        return guess
+        return guess[self._check_peak_cf(guess)]
 
 
     def _drop_peak_overlap(self, guess):
@@ -568,33 +1012,218 @@ class SpectralFitAlgorithm(AlgorithmCF):
         For any peaks with an overlap >  threshold, the lowest height guess peak is dropped.
         """
 
+        # Sort the peak guesses by increasing frequency, so adjacent peaks can be compared
+        guess = guess[np.argsort(guess[:, self.modes.periodic.params.indices['cf']], kind='stable')]
+
+        return guess[self._check_peak_overlap(guess)]
+
+
+    def _batch_peak_guess(self, flatspecs):
+        """Iteratively find peaks across a batch of flattened spectra.
+
+        Parameters
+        ----------
+        flatspecs : 2d array, shape=[n_spectra, n_freqs]
+            Flattened power spectrum values.
+
+        Returns
+        -------
+        guess : 3d array, shape=[n_spectra, n_max_peaks, n_params_per_peak]
+            Guess parameters for periodic fits to peaks, padded with zeros.
+        n_peaks : 1d array of int
+            Number of peaks found for each power spectrum.
+
+        Notes
+        -----
+        This follows the procedure of `_get_peak_guess`, run on all spectra at once,
+        with the search stopping for each spectrum when a stopping criterion is reached.
+        """
+
         inds = self.modes.periodic.params.indices
+        rows = np.arange(len(flatspecs))
+        flat_iter = np.copy(flatspecs)
+        guesses, n_peaks = [], np.zeros(len(flatspecs), dtype=int)
+
+        searching = np.ones(len(flatspecs), dtype=bool)
+        while len(guesses) < self.settings.max_n_peaks:
+
+            # Find candidate peaks, and stop searching in spectra where a threshold is reached
+            max_inds = np.argmax(flat_iter, axis=1)
+            max_heights = flat_iter[rows, max_inds]
+            searching &= (max_heights > self.settings.peak_threshold * np.std(flat_iter, axis=1))
+            searching &= (max_heights > self.settings.min_peak_height)
+            if not np.any(searching):
+                break
+
+            # Estimate the peak width, restricted to the width limits (as in `_get_peak_guess`)
+            fwhms = batch_estimate_fwhm(flat_iter, max_inds, self.data.freq_res)
+            guess_std = np.where(np.isnan(fwhms), np.mean(self.settings.peak_width_limits),
+                                 compute_gauss_std(fwhms))
+            guess_std[guess_std < self.settings.peak_width_limits[0] / 2] = \
+                self.settings.peak_width_limits[0] / 2
+            guess_std[guess_std > self.settings.peak_width_limits[1] / 2] = \
+                self.settings.peak_width_limits[0] / 2
+
+            cur_guess = np.zeros([len(flatspecs), self.modes.periodic.n_params])
+            cur_guess[:, inds['cf']] = self.data.freqs[max_inds]
+            cur_guess[:, inds['pw']] = max_heights
+            cur_guess[:, inds['bw']] = guess_std
+            cur_guess[~searching] = 0
+
+            # Collect guesses, and subtract guess peaks from the spectra that are searching
+            guesses.append(cur_guess)
+            n_peaks += searching
+            flat_iter[searching] -= \
+                batch_eval(self.modes.periodic.func, self.data.freqs, cur_guess[searching])
+
+        guess = np.stack(guesses, axis=1) if guesses else \
+            np.zeros([len(flatspecs), 0, self.modes.periodic.n_params])
+
+        return guess, n_peaks
+
+
+    def _batch_drop_peak_cf(self, guess, n_peaks):
+        """Drop peaks based on center's proximity to the edge, across a batch of spectra.
+
+        Parameters
+        ----------
+        guess : 3d array, shape=[n_spectra, n_max_peaks, n_params_per_peak]
+            Guess parameters for periodic peak fits, padded with zeros.
+        n_peaks : 1d array of int
+            Number of peaks for each power spectrum.
+
+        Returns
+        -------
+        guess : 3d array, shape=[n_spectra, n_max_peaks, n_params_per_peak]
+            Guess parameters for periodic peak fits, padded with zeros.
+        n_peaks : 1d array of int
+            Number of peaks for each power spectrum.
+        """
+
+        valid = np.arange(guess.shape[1]) < n_peaks[:, None]
+
+        return self._batch_keep_peaks(guess, valid & self._check_peak_cf(guess))
+
+
+    def _batch_drop_peak_overlap(self, guess, n_peaks):
+        """Drop peaks based on amount of overlap, across a batch of spectra.
+
+        Parameters
+        ----------
+        guess : 3d array, shape=[n_spectra, n_max_peaks, n_params_per_peak]
+            Guess parameters for periodic peak fits, padded with zeros.
+        n_peaks : 1d array of int
+            Number of peaks for each power spectrum.
+
+        Returns
+        -------
+        guess : 3d array, shape=[n_spectra, n_max_peaks, n_params_per_peak]
+            Guess parameters for periodic peak fits, padded with zeros, sorted by frequency.
+        n_peaks : 1d array of int
+            Number of peaks for each power spectrum.
+        """
+
+        valid = np.arange(guess.shape[1]) < n_peaks[:, None]
+
+        # Sort the peak guesses by increasing frequency, with padding at the end
+        cf_params = np.where(valid, guess[:, :, self.modes.periodic.params.indices['cf']], np.inf)
+        order = np.argsort(cf_params, axis=1, kind='stable')
+        guess = np.take_along_axis(guess, order[:, :, None], axis=1)
+
+        return self._batch_keep_peaks(guess, valid & self._check_peak_overlap(guess, valid))
+
+
+    def _check_peak_cf(self, guess):
+        """Check which peaks to keep, based on center's proximity to the edge of the spectrum.
+
+        Parameters
+        ----------
+        guess : array, shape=[..., n_peaks, n_params_per_peak]
+            Guess parameters for periodic peak fits.
 
-        # Sort the peak guesses by increasing frequency
-        #   This is so adjacent peaks can be compared from right to left
-        guess = sorted(guess, key=lambda x: float(x[inds['cf']]))
+        Returns
+        -------
+        keep_peak : array of bool, shape=[..., n_peaks]
+            Whether to keep each peak.
+        """
+
+        cf_params = guess[..., self.modes.periodic.params.indices['cf']]
+        bw_params = guess[..., self.modes.periodic.params.indices['bw']] * \
+            self._settings.bw_std_edge
+
+        # Check if peaks within drop threshold from the edge of the frequency range
+        keep_peak = \
+            (np.abs(np.subtract(cf_params, self.data.freq_range[0])) > bw_params) & \
+            (np.abs(np.subtract(cf_params, self.data.freq_range[1])) > bw_params)
+
+        return keep_peak
+
+
+    def _check_peak_overlap(self, guess, valid=None):
+        """Check which peaks to keep, based on amount of overlap with adjacent peaks.
+
+        Parameters
+        ----------
+        guess : array, shape=[..., n_peaks, n_params_per_peak]
+            Guess parameters for periodic peak fits, sorted by increasing center frequency.
+        valid : array of bool, shape=[..., n_peaks], optional
+            Which peaks are valid, for padded guess parameters, with padding at the end.
+
+        Returns
+        -------
+        keep_peak : array of bool, shape=[..., n_peaks]
+            Whether to keep each peak.
+
+        Notes
+        -----
+        For any adjacent peaks with an overlap > threshold, the lowest height guess peak is dropped.
+        If the heights are equal, the lower frequency peak is dropped.
+        """
+
+        inds = self.modes.periodic.params.indices
 
         # Calculate standard deviation bounds for checking amount of overlap
         #   The bounds are the center frequency +/- width (standard deviation)
-        bounds = [[peak[inds['cf']] - peak[inds['bw']] * self._settings.gauss_overlap_thresh,
-                   peak[inds['cf']] + peak[inds['bw']] * self._settings.gauss_overlap_thresh]\
-                   for peak in guess]
+        bounds_lo = guess[..., inds['cf']] - guess[..., inds['bw']] * \
+            self._settings.gauss_overlap_thresh
+        bounds_hi = guess[..., inds['cf']] + guess[..., inds['bw']] * \
+            self._settings.gauss_overlap_thresh
 
-        # Loop through peak bounds, comparing current bound to that of next peak
+        # Compare each peak's upper bound to the lower bound of the next peak
         #   If the left peak's upper bound extends pass the right peaks lower bound,
-        #   then drop the Gaussian with the lower height
-        drop_inds = []
-        for ind, b_0 in enumerate(bounds[:-1]):
-            b_1 = bounds[ind + 1]
+        #   then drop the peak with the lower height
+        overlap = bounds_hi[..., :-1] > bounds_lo[..., 1:]
+        if valid is not None:
+            overlap &= valid[..., 1:]
+        drop_left = guess[..., :-1, inds['pw']] <= guess[..., 1:, inds['pw']]
 
-            # Check if bound of current peak extends into next peak
-            if b_0[1] > b_1[0]:
+        keep_peak = np.ones(guess.shape[:-1], dtype=bool)
+        keep_peak[..., :-1] &= ~(overlap & drop_left)
+        keep_peak[..., 1:] &= ~(overlap & ~drop_left)
 
-                # If so, get the index of the peak with the lowest height (to drop)
-                drop_inds.append([ind, ind + 1][np.argmin([guess[ind][1], guess[ind + 1][1]])])
+        return keep_peak
 
-        # Drop any peaks guesses that overlap too much, based on threshold
-        keep_peak = [not ind in drop_inds for ind in range(len(guess))]
-        guess = np.array([gu for (gu, keep) in zip(guess, keep_peak) if keep])
 
-        return guess
+    @staticmethod
+    def _batch_keep_peaks(guess, keep_peak):
+        """Keep selected peaks across a batch of spectra, moving kept peaks to the front.
+
+        Parameters
+        ----------
+        guess : 3d array, shape=[n_spectra, n_max_peaks, n_params_per_peak]
+            Guess parameters for periodic peak fits.
+        keep_peak : 2d array of bool, shape=[n_spectra, n_max_peaks]
+            Whether to keep each peak.
+
+        Returns
+        -------
+        guess : 3d array, shape=[n_spectra, n_max_peaks, n_params_per_peak]
+            Guess parameters for kept periodic peak fits, in original order, padded with zeros.
+        n_peaks : 1d array of int
+            Number of kept peaks for each power spectrum.
+        """
+
+        order = np.argsort(~keep_peak, axis=1, kind='stable')
+        guess = np.take_along_axis(guess * keep_peak[:, :, None], order[:, :, None], axis=1)
+
+        return guess, np.sum(keep_peak, axis=1)
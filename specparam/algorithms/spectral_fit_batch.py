@@ -0,0 +1,188 @@
+"""Define spectral fitting algorithm object, with fitting steps run across power spectra."""
+
+import warnings
+from collections import deque
+
+import numpy as np
+
+from specparam.modutils.errors import FitError
+from specparam.data.periodic import sort_peaks
+from specparam.algorithms.batch import batch_curve_fit, batch_eval
+from specparam.algorithms.spectral_fit import SpectralFitAlgorithm, BATCH_MODES
+
+###################################################################################################
+###################################################################################################
+
+class SpectralFitBatchAlgorithm(SpectralFitAlgorithm):
+    """Spectral parameterization algorithm, running each fitting step across a group of spectra.
+
+    Parameters
+    ----------
+    % public settings described in Spectral Fit Algorithm Settings
+
+    Notes
+    -----
+    - When fitting a group of power spectra, each step of the 'spectral_fit' procedure is run
+      across all power spectra at once: the robust aperiodic fit, flattening, the search for peak
+      candidates, the checks to drop peaks, and the final aperiodic fit. Aperiodic fits use a
+      vectorized, bounded Levenberg-Marquardt solver, in place of `curve_fit`.
+    - Peak candidates are collected as padded arrays, with the number of peaks per spectrum,
+      and the nonlinear fit of the peaks is run for each power spectrum individually.
+    - Results match those of the 'spectral_fit' algorithm within fitting tolerance.
+    - Individual power spectra, fit modes that are not listed in `BATCH_MODES`, and fits with a
+      fit budget, with decimation, with caching, or in parallel are fit with the same procedure
+      as the 'spectral_fit' algorithm.
+    """
+
+    name = 'spectral_fit_batch'
+    description = 'Spectral parameterization algorithm, with fitting steps run across spectra.'
+
+    def __init__(self, *args, **kwargs):
+        """Initialize algorithm object."""
+
+        super().__init__(*args, **kwargs)
+        self.data_format = 'spectra'
+        self._batch = None
+
+
+    def _fit(self):
+        """Fit the current power spectrum, using the batch fit results, if available."""
+
+        batch = self._batch.popleft() if self._batch else None
+        if batch is None or not np.array_equal(batch[0], self.data.power_spectrum):
+            self._batch = None
+            super()._fit()
+            return
+
+        _, aperiodic_params, peak_params, error = batch
+        if error:
+            raise FitError(error)
+
+        self.results.params.periodic.add_params('fit', peak_params)
+        self.results.params.aperiodic.add_params('fit', aperiodic_params)
+
+        self.results.model._peak_fit = self.modes.periodic.generate(\
+            self.data.freqs, *np.ndarray.flatten(peak_params))
+        self.results.model._ap_fit = self.modes.aperiodic.generate(\
+            self.data.freqs, *aperiodic_params)
+
+        self.results.model._spectrum_peak_rm = \
+            self.data.power_spectrum - self.results.model._peak_fit
+        self.results.model._spectrum_flat = self.data.power_spectrum - self.results.model._ap_fit
+        self.results.model.modeled_spectrum = \
+            self.results.model._peak_fit + self.results.model._ap_fit
+
+
+    def _fit_batch(self):
+        """Fit all power spectra in the current data, storing the results to be used by `_fit`.
+
+        Notes
+        -----
+        Power spectra with any NaN or Inf values are skipped, as these are not fit.
+        """
+
+        self._batch = None
+        if self._budget or self._cache is not None or self._settings.decimation > 1 or \
+            self.modes.aperiodic.name not in BATCH_MODES['aperiodic'] or \
+            self.modes.periodic.name not in BATCH_MODES['periodic']:
+            return
+
+        freqs = self.data.freqs
+        spectra = self.data.power_spectra[\
+            np.all(np.isfinite(self.data.power_spectra), axis=1)].astype('float64')
+        if not len(spectra):
+            return
+
+        # Initial aperiodic fit, refit robustly on points below a percentile threshold of the
+        #   flattened spectrum (see `_robust_ap_fit`), then find peaks in the flattened spectra
+        popt, converged = self._batch_ap_fit(spectra)
+        flatspecs = np.clip(spectra - batch_eval(self.modes.aperiodic.func, freqs, popt), 0, None)
+        perc_thresh = np.percentile(flatspecs, self._settings.ap_percentile_thresh, axis=1)
+        popt, robust_converged = self._batch_ap_fit(\
+            spectra, popt, weights=flatspecs <= perc_thresh[:, None])
+        flatspecs = spectra - batch_eval(self.modes.aperiodic.func, freqs, popt)
+
+        # Find peak candidates, drop candidates that violate requirements, and fit peaks
+        guess, n_peaks = self._batch_peak_guess(flatspecs)
+        guess, n_peaks = self._batch_drop_peak_cf(guess, n_peaks)
+        guess, n_peaks = self._batch_drop_peak_overlap(guess, n_peaks)
+        peak_params, errors = self._batch_pe_fit(flatspecs, guess, n_peaks)
+
+        # Run the final aperiodic fit on the peak-removed spectra
+        peak_fits = np.array([self.modes.periodic.generate(\
+            freqs, *np.ndarray.flatten(params)) for params in peak_params])
+        aperiodic_params, final_converged = self._batch_ap_fit(spectra - peak_fits)
+
+        for ind in np.flatnonzero(~(converged & robust_converged & final_converged)):
+            errors[ind] = errors[ind] or ("Model fitting failed due to not finding "
+                                          "parameters in the batch aperiodic fit.")
+        self._batch = deque(zip(spectra, aperiodic_params, peak_params, errors))
+
+
+    def _batch_ap_fit(self, spectra, guess=None, weights=None):
+        """Fit the aperiodic component across a batch of power spectra.
+
+        Parameters
+        ----------
+        spectra : 2d array, shape=[n_spectra, n_freqs]
+            Power values, in log10 scale.
+        guess : 2d array, shape=[n_spectra, n_params], optional
+            Guess parameters. If not provided, computed for each power spectrum.
+        weights : 2d array, shape=[n_spectra, n_freqs], optional
+            Weights for each point of each power spectrum.
+
+        Returns
+        -------
+        aperiodic_params : 2d array, shape=[n_spectra, n_params]
+            Parameter estimates for aperiodic fits.
+        converged : 1d array of bool
+            Whether each fit converged.
+        """
+
+        if guess is None:
+            guess = [self._get_ap_guess(self.data.freqs, spectrum) for spectrum in spectra]
+        bounds = tuple(np.tile(bound, (len(spectra), 1)) for bound in self._settings.ap_bounds)
+
+        # Ignore warnings that are raised while exploring parameters - see `_simple_ap_fit`
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            return batch_curve_fit(self.modes.aperiodic.func, self.data.freqs, spectra, guess,
+                                   bounds=bounds, weights=weights,
+                                   max_iter=self._cf_settings.maxfev, tol=self._cf_settings.tol)
+
+
+    def _batch_pe_fit(self, flatspecs, guess, n_peaks):
+        """Fit peaks across a batch of flattened power spectra.
+
+        Parameters
+        ----------
+        flatspecs : 2d array, shape=[n_spectra, n_freqs]
+            Flattened power spectrum values.
+        guess : 3d array, shape=[n_spectra, n_max_peaks, n_params_per_peak]
+            Guess parameters for periodic peak fits, padded with zeros.
+        n_peaks : 1d array of int
+            Number of peaks for each power spectrum.
+
+        Returns
+        -------
+        peak_params : list of 2d array
+            Parameters for the peak fits of each power spectrum, sorted by center frequency.
+        errors : list of str or None
+            Error message for each power spectrum for which fitting failed, or None.
+
+        Notes
+        -----
+        The nonlinear fit of the peaks is run for each power spectrum individually.
+        """
+
+        peak_params = [np.empty([0, self.modes.periodic.n_params]) for _ in flatspecs]
+        errors = [None] * len(flatspecs)
+
+        for ind in np.flatnonzero(n_peaks):
+            try:
+                peak_params[ind] = sort_peaks(self._fit_peak_guess(\
+                    flatspecs[ind], guess[ind, :n_peaks[ind]]), 'CF', 'inc')
+            except FitError as fit_error:
+                errors[ind] = str(fit_error)
+
+        return peak_params, errors
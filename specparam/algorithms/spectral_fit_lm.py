@@ -0,0 +1,88 @@
+"""Define spectral fitting algorithm object, with batched fitting across power spectra."""
+
+import numpy as np
+
+from specparam.data.periodic import sort_peaks
+from specparam.algorithms.batch import batch_curve_fit
+from specparam.algorithms.spectral_fit_batch import SpectralFitBatchAlgorithm
+
+###################################################################################################
+###################################################################################################
+
+class SpectralFitLMAlgorithm(SpectralFitBatchAlgorithm):
+    """Spectral parameterization algorithm, fitting groups of spectra with a batched solver.
+
+    Parameters
+    ----------
+    % public settings described in Spectral Fit Algorithm Settings
+
+    Notes
+    -----
+    - When fitting a group of power spectra, each fitting step is run across all power spectra
+      at once, with a vectorized, bounded Levenberg-Marquardt solver, in place of `curve_fit`.
+      Peak parameters are fit as padded arrays, with a mask per power spectrum.
+    - Results match those of the 'spectral_fit' algorithm within fitting tolerance.
+    - Individual power spectra, fit modes that are not listed in `BATCH_MODES`, and fits with a
+      fit budget, with decimation, with caching, or in parallel are fit with the same procedure
+      as the 'spectral_fit' algorithm.
+    """
+
+    name = 'spectral_fit_lm'
+    description = 'Spectral parameterization algorithm, with batched fitting across spectra.'
+
+
+    def _batch_pe_fit(self, flatspecs, guess, n_peaks):
+        """Fit peaks across a batch of flattened power spectra, with a batched solver.
+
+        Parameters
+        ----------
+        flatspecs : 2d array, shape=[n_spectra, n_freqs]
+            Flattened power spectrum values.
+        guess : 3d array, shape=[n_spectra, n_max_peaks, n_params_per_peak]
+            Guess parameters for periodic peak fits, padded with zeros.
+        n_peaks : 1d array of int
+            Number of peaks for each power spectrum.
+
+        Returns
+        -------
+        peak_params : list of 2d array
+            Parameters for the peak fits of each power spectrum, sorted by center frequency.
+        errors : list of str or None
+            Error message for each power spectrum for which fitting failed, or None.
+        """
+
+        n_params = self.modes.periodic.n_params
+        peak_params = [np.empty([0, n_params]) for _ in flatspecs]
+        errors = [None] * len(flatspecs)
+
+        inds = np.flatnonzero(n_peaks)
+        if not len(inds):
+            return peak_params, errors
+
+        # Pad peak parameters to the maximum number of peaks, with padded peaks of zero height
+        n_max = np.max(n_peaks)
+        pad = np.ones(n_params)
+        pad[self.modes.periodic.params.indices['pw']] = 0
+        params = np.tile(pad, (len(inds), n_max))
+        lower, upper = np.full(params.shape, -np.inf), np.full(params.shape, np.inf)
+        mask = np.zeros(params.shape, dtype=bool)
+        for row, ind in enumerate(inds):
+            n_fit = n_peaks[ind] * n_params
+            params[row, :n_fit] = np.ndarray.flatten(guess[ind, :n_peaks[ind]])
+            lower[row, :n_fit], upper[row, :n_fit] = \
+                self._get_pe_bounds(guess[ind, :n_peaks[ind]])
+            mask[row, :n_fit] = True
+
+        params, converged = batch_curve_fit(\
+            self.modes.periodic.func, self.data.freqs, flatspecs[inds], params,
+            bounds=(lower, upper), mask=mask, jacobian=self.modes.periodic.jacobian,
+            max_iter=self._cf_settings.maxfev, tol=self._cf_settings.tol)
+
+        for row, ind in enumerate(inds):
+            peak_params[ind] = sort_peaks(\
+                params[row, :n_peaks[ind] * n_params].reshape(-1, n_params), 'CF', 'inc')
+            if not converged[row]:
+                errors[ind] = ("Model fitting failed due to not finding "
+                               "parameters in the batch peak fit.")
+
+        return peak_params, errors
@@ -90,7 +90,7 @@ def model_to_dataframe(fit_results, modes, bands):
     return pd.Series(model_to_dict(fit_results, modes, check_bands(bands)))
 
 
-def group_to_dict(group_results, modes, bands):
+def group_to_dict(group_results, modes, bands, dtype='float64'):
     """Convert a group of model fit results into a dictionary.
 
     Parameters
@@ -102,6 +102,8 @@ def group_to_dict(group_results, modes, bands):
     bands : Bands or dict or int
         How to organize peaks, based on band definitions.
         Can be Bands object or object that can be converted into a Bands object.
+    dtype : {'float64', 'float32'}, optional
+        The data type for the arrays of results.
 
     Returns
     -------
@@ -112,7 +114,8 @@ def group_to_dict(group_results, modes, bands):
     bands = check_bands(bands)
 
     nres = len(group_results)
-    fr_dict = {ke : np.zeros(nres) for ke in model_to_dict(group_results[0], modes, bands)}
+    fr_dict = {ke : np.zeros(nres, dtype=dtype) \
+        for ke in model_to_dict(group_results[0], modes, bands)}
     for ind, f_res in enumerate(group_results):
         for key, val in model_to_dict(f_res, modes, bands).items():
             fr_dict[key][ind] = val
@@ -143,7 +146,7 @@ def group_to_dataframe(group_results, modes, bands):
     return pd.DataFrame(group_to_dict(group_results, modes, check_bands(bands)))
 
 
-def event_group_to_dict(event_group_results, modes, bands):
+def event_group_to_dict(event_group_results, modes, bands, dtype='float64'):
     """Convert the event results to be organized across across and time windows.
 
     Parameters
@@ -155,6 +158,8 @@ def event_group_to_dict(event_group_results, modes, bands):
     bands : Bands or dict or int
         How to organize peaks, based on band definitions.
         Can be Bands object or object that can be converted into a Bands object.
+    dtype : {'float64', 'float32'}, optional
+        The data type for the arrays of results.
 
     Returns
     -------
@@ -169,12 +174,12 @@ def event_group_to_dict(event_group_results, modes, bands):
         event_time_results[key] = []
 
     for gres in event_group_results:
-        dictres = group_to_dict(gres, modes, bands)
+        dictres = group_to_dict(gres, modes, bands, dtype)
         for key, val in dictres.items():
             event_time_results[key].append(val)
 
     for key in event_time_results:
-        event_time_results[key] = np.array(event_time_results[key])
+        event_time_results[key] = np.array(event_time_results[key], dtype=dtype)
 
     return event_time_results
 
@@ -1,12 +1,14 @@
 """Define data objects."""
 
 from warnings import warn
+from hashlib import blake2b
 from functools import wraps
 
 import numpy as np
 
 from specparam.sim.gen import gen_freqs
 from specparam.data import SpectrumMetaData, ModelChecks
+from specparam.data.grid import FreqGrid, get_grid
 from specparam.utils.array import unlog
 from specparam.utils.spectral import trim_spectrum
 from specparam.utils.checks import check_input_options
@@ -25,6 +27,7 @@ META_DATA_FIELDS = ['freq_range', 'freq_res']
 DATA_FORMATS = ['spectrum', 'spectra', 'spectrogram', 'spectrograms']
 DATA_FIELDS = ['power_spectrum', 'freq_range', 'freq_res']
 DATA_UNITS = ['power']
+DATA_DTYPES = ['float64', 'float32']
 
 
 class Data():
@@ -38,6 +41,9 @@ class Data():
         Whether to check the spectral data. If so, raises an error for any NaN / Inf values.
     format : {'power'}
         The representation format of the data.
+    dtype : {'float64', 'float32'}
+        The data type for storing power values.
+        Reduced precision data are converted to 'float64' for fitting, per power spectrum.
     model : SpectralModel, optional
         The model object this object is linked to, to provide access to other attributes.
 
@@ -47,6 +53,8 @@ class Data():
         Specifiers for which aspects of the data to run checks on.
     freqs : 1d array
         Frequency values for the spectral data.
+    grid : FreqGrid
+        Frequency grid for the frequency values, which caches derived frequency axes.
     freq_range : list of [float, float]
         Frequency range of the spectral data, as [lowest_freq, highest_freq].
     freq_res : float
@@ -59,7 +67,8 @@ class Data():
     All power values are stored internally in log10 scale.
     """
 
-    def __init__(self, check_freqs=True, check_data=True, units='power', model=None):
+    def __init__(self, check_freqs=True, check_data=True, units='power', dtype='float64',
+                 model=None):
         """Initialize Data object."""
 
         self._reset_data(True, True)
@@ -74,8 +83,25 @@ class Data():
         check_input_options(units, DATA_UNITS, 'units')
         self.units = units
 
+        self.set_dtype(dtype)
+
         self._model = model
 
+    @property
+    def freqs(self):
+        """Frequency values for the spectral data."""
+
+        return self._freqs
+
+
+    @freqs.setter
+    def freqs(self, freqs):
+        """Set frequency values, and the frequency grid for them."""
+
+        self._freqs = freqs
+        self.grid = (get_grid(freqs) or FreqGrid(freqs)) if freqs is not None else None
+
+
     @property
     def has_data(self):
         """Indicator for if the object contains data."""
@@ -132,7 +158,8 @@ class Data():
         for meta_dat in self._meta_fields:
             setattr(self, meta_dat, getattr(meta_data, meta_dat))
 
-        self._regenerate_freqs()
+        if self.freq_range is not None:
+            self._regenerate_freqs()
 
 
     def get_checks(self):
@@ -245,6 +272,28 @@ class Data():
             self.checks['data'] = check_data
 
 
+    def set_dtype(self, dtype):
+        """Set the data type for storing power values.
+
+        Parameters
+        ----------
+        dtype : {'float64', 'float32'}
+            The data type for storing power values.
+
+        Notes
+        -----
+        This applies to data added after it is set, and to model results stored from fitting.
+        Storing data as 'float32' halves the memory used by the data, which can be useful for
+        large datasets, at the cost of precision. Model fitting is always done as 'float64'.
+        The data type is set on the data object of a model object, for example with
+        `model.data.set_dtype('float32')`, rather than when initializing the model object.
+        It is saved with the base information of the object, and restored when loading.
+        """
+
+        check_input_options(dtype, DATA_DTYPES, 'dtype')
+        self.dtype = dtype
+
+
     def _reset_data(self, clear_freqs=False, clear_spectrum=False):
         """Set, or reset, data attributes to empty.
 
@@ -328,8 +377,9 @@ class Data():
 
         # Force data to be dtype of float64
         #   If they end up as float32, or less, scipy curve_fit fails (sometimes implicitly)
-        if freqs.dtype != 'float64':
-            freqs = freqs.astype('float64')
+        #   Power values are converted to the storage dtype after logging (see below)
+        #   Frequencies are always copied, as derived axes are cached in the frequency grid
+        freqs = freqs.astype('float64')
         if powers.dtype != 'float64':
             powers = powers.astype('float64')
 
@@ -349,8 +399,10 @@ class Data():
         freq_range = [freqs.min(), freqs.max()]
         freq_res = freqs[1] - freqs[0]
 
-        # Log power values
-        powers = np.log10(powers)
+        # Log power values, and convert to the storage dtype
+        #   Logging is done as float64, to keep the dynamic range of small linear power values
+        #   Power values stored as float32 are converted back to float64 for fitting
+        powers = np.log10(powers).astype(self.dtype, copy=False)
 
         ## Data checks - run checks on inputs based on check statuses
 
@@ -381,6 +433,9 @@ class Data2D(Data):
     ----------
     % copied in from Data
 
+    dedup : bool
+        Whether to fit only unique power spectra, sharing results across duplicates.
+
     Attributes
     ----------
     % copied in from Data
@@ -392,12 +447,13 @@ class Data2D(Data):
     All power values are stored internally in log10 scale.
     """
 
-    def __init__(self, *args, **kwargs):
+    def __init__(self, *args, dedup=False, **kwargs):
         """Initialize Data2D object."""
 
         Data.__init__(self, *args, **kwargs)
 
         self.power_spectra = None
+        self.set_dedup(dedup)
 
 
     @property
@@ -449,6 +505,59 @@ class Data2D(Data):
                      log_powers=False, **data_kwargs)
 
 
+    def get_unique(self):
+        """Get the unique power spectra, identifying duplicates by hashing each power spectrum.
+
+        Returns
+        -------
+        unique_inds : 1d array of int
+            Indices of the first instance of each unique power spectrum.
+        inverse : 1d array of int
+            For each power spectrum, the index within `unique_inds` of its unique power spectrum.
+
+        Notes
+        -----
+        Power spectra are compared as stored, after any trimming & logging, and are duplicates
+        only if all values are exactly equal, such that sharing results across duplicates
+        gives the same results as fitting each power spectrum.
+        """
+
+        # Hashes are stored as {hash : [indices within unique_inds]}, checking values on a match
+        hashes = {}
+        unique_inds, inverse = [], np.empty(len(self.power_spectra), dtype=int)
+        for ind, spectrum in enumerate(self.power_spectra):
+            spectrum = spectrum.tobytes()
+            matches = hashes.setdefault(blake2b(spectrum, digest_size=16).digest(), [])
+            for match in matches:
+                if self.power_spectra[unique_inds[match]].tobytes() == spectrum:
+                    inverse[ind] = match
+                    break
+            else:
+                matches.append(len(unique_inds))
+                inverse[ind] = len(unique_inds)
+                unique_inds.append(ind)
+
+        return np.array(unique_inds, dtype=int), inverse
+
+
+    def set_dedup(self, dedup):
+        """Set deduplication status, which controls if only unique power spectra are fit.
+
+        Parameters
+        ----------
+        dedup : bool
+            Whether to fit only unique power spectra, sharing results across duplicates.
+
+        Notes
+        -----
+        Deduplication can speed up fitting data with repeated power spectra, for example from
+        padded windows, flat-lined channels, or duplicated epochs, at the cost of hashing each
+        power spectrum before fitting (see `get_unique`).
+        """
+
+        self.dedup = dedup
+
+
     def _reset_data(self, clear_freqs=False, clear_spectrum=False, clear_spectra=False):
         """Set, or reset, data attributes to empty.
 
@@ -0,0 +1,97 @@
+"""Define frequency grid object, which caches derived frequency axes."""
+
+from weakref import WeakValueDictionary
+
+import numpy as np
+
+###################################################################################################
+###################################################################################################
+
+# Registry of frequency grids, indexed by the id of their frequency arrays
+_GRIDS = WeakValueDictionary()
+
+
+class FreqGrid():
+    """Object for a frequency grid, caching axes derived from the frequency values.
+
+    Parameters
+    ----------
+    freqs : 1d array
+        Frequency values, in linear space.
+
+    Attributes
+    ----------
+    freqs : 1d array
+        Frequency values, in linear space.
+
+    Notes
+    -----
+    - Derived axes are computed once, when first requested, and then reused for all
+      evaluations of fit functions on the same frequency values, including across spectra.
+    - Fit functions that are given the `freqs` array of a frequency grid can access the grid
+      with `get_grid`. The frequency values should therefore not be modified in place.
+    """
+
+    def __init__(self, freqs):
+        """Initialize FreqGrid object."""
+
+        self.freqs = freqs
+
+        self._log_freqs = None
+
+        _GRIDS[id(freqs)] = self
+
+
+    def __setstate__(self, state):
+        """Set state, for copies of the object, registering the grid for its frequencies."""
+
+        self.__dict__.update(state)
+        _GRIDS[id(self.freqs)] = self
+
+
+    @property
+    def log_freqs(self):
+        """Frequency values, in log10 space."""
+
+        if self._log_freqs is None:
+            self._log_freqs = np.log10(self.freqs)
+
+        return self._log_freqs
+
+
+def get_grid(xs):
+    """Get the frequency grid for an array of frequency values, if one exists.
+
+    Parameters
+    ----------
+    xs : 1d array
+        Frequency values.
+
+    Returns
+    -------
+    FreqGrid or None
+        Frequency grid for the frequency values, or None if there is not one.
+    """
+
+    grid = _GRIDS.get(id(xs))
+
+    return grid if grid is not None and grid.freqs is xs else None
+
+
+def get_log_freqs(xs):
+    """Get frequency values in log10 space, using a cached frequency grid if available.
+
+    Parameters
+    ----------
+    xs : 1d array
+        Frequency values, in linear space.
+
+    Returns
+    -------
+    1d array
+        Frequency values, in log10 space.
+    """
+
+    grid = get_grid(xs)
+
+    return grid.log_freqs if grid is not None else np.log10(xs)
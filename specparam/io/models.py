@@ -81,7 +81,7 @@ def save_model(model, file_name, file_path=None, append=False,
     #   Note that results also saves frequency information to be able to recreate freq vector
     keep = set(\
         (mode_labels + bands_label if save_base else []) + \
-        (model.data._meta_fields if save_base or base_only else []) + \
+        (model.data._meta_fields + ['dtype'] if save_base or base_only else []) + \
         (results_labels + ['metrics'] if save_results else []) + \
         (model.algorithm.settings.names if save_settings else []) + \
         (model.data._fields if save_data else []))
@@ -3,6 +3,7 @@
 import numpy as np
 
 from specparam.sim.gen import gen_model
+from specparam.data.stores import FitResults
 from specparam.plts.error import plot_spectral_error
 from specparam.modutils.errors import NoModelError, NoDataError
 
@@ -78,6 +79,11 @@ def compute_pointwise_error_group(group, plot_errors=True, return_errors=False,
         If there is no data available to calculate model errors from.
     NoModelError
         If there are no model results available to calculate model errors from.
+
+    Notes
+    -----
+    Null model fits, such as failed fits, have errors of NaN, and are excluded from the
+    mean and standard deviation of the errors, whether or not the errors are returned.
     """
 
     if not group.data.has_data:
@@ -85,6 +91,13 @@ def compute_pointwise_error_group(group, plot_errors=True, return_errors=False,
     if not group.results.has_model:
         raise NoModelError("No model is available to use, can not proceed.")
 
+    # If the full matrix of errors is not requested, use single-pass summary statistics
+    if not return_errors:
+        if plot_errors:
+            stats = compute_pointwise_error_stats(group)
+            plot_spectral_error(group.data.freqs, stats.mean, stats.std, **plt_kwargs)
+        return
+
     errors = np.zeros_like(group.data.power_spectra)
 
     for ind, (res, data) in enumerate(zip(group.results, group.data.power_spectra)):
@@ -93,14 +106,85 @@ def compute_pointwise_error_group(group, plot_errors=True, return_errors=False,
                           group.modes.periodic, res.peak_fit)
         errors[ind, :] = np.abs(model - data)
 
-    mean = np.mean(errors, 0)
-    standard_dev = np.std(errors, 0)
+    # Exclude any null model fits, as is done when computing single-pass summary statistics
+    mean = np.nanmean(errors, 0)
+    standard_dev = np.nanstd(errors, 0)
 
     if plot_errors:
         plot_spectral_error(group.data.freqs, mean, standard_dev, **plt_kwargs)
 
-    if return_errors:
-        return errors
+    return errors
+
+
+def compute_pointwise_error_stats(model, inds=None, chunk_size=256, quantiles=None,
+                                  accumulator=None):
+    """Calculate summary statistics of frequency by frequency error, in a single pass.
+
+    Parameters
+    ----------
+    model : SpectralGroupModel or SpectralTimeModel or SpectralTimeEventModel
+        Object containing the data and model fit results.
+    inds : array_like of int, optional
+        Indices of the model fits to include. If None, all available fits are used.
+        For event objects, indices are applied to events.
+    chunk_size : int, optional, default: 256
+        Number of model fits to regenerate and add to the statistics at a time.
+    quantiles : list of float, optional
+        Quantiles, in the range [0, 1], to track with a histogram sketch.
+        Only used if `accumulator` is not provided.
+    accumulator : PointwiseErrorAccumulator, optional
+        An existing accumulator to update. If not provided, a new one is initialized.
+
+    Returns
+    -------
+    accumulator : PointwiseErrorAccumulator
+        Accumulator with the error statistics, for example in the `mean` and `std` attributes.
+
+    Raises
+    ------
+    NoDataError
+        If there is no data available to calculate model errors from.
+    NoModelError
+        If there are no model results available to calculate model errors from.
+
+    Notes
+    -----
+    Model fits are regenerated and compared to the data in chunks, such that memory use scales
+    with the number of frequencies, rather than with the number of model fits.
+    Entries that are not (yet) fit, or that are null model fits, are skipped. This means
+    this function can be called on an object for which fitting is in progress, and that an
+    accumulator can be updated incrementally, by passing it back in with new indices.
+    """
+
+    if not model.data.has_data:
+        raise NoDataError("Data must be available in the object to calculate errors.")
+    if not model.results.has_model:
+        raise NoModelError("No model is available to use, can not proceed.")
+
+    if accumulator is None:
+        accumulator = PointwiseErrorAccumulator(len(model.data.freqs), quantiles=quantiles)
+
+    chunk = np.zeros([chunk_size, len(model.data.freqs)])
+    n_chunk = 0
+    for res, data in _iter_results_data(model, inds):
+
+        # Skip entries that have not been fit yet, or that failed to fit
+        if not isinstance(res, FitResults) or np.isnan(res.aperiodic_fit[0]):
+            continue
+
+        chunk[n_chunk, :] = np.abs(gen_model(model.data.freqs, model.modes.aperiodic,
+                                             res.aperiodic_fit, model.modes.periodic,
+                                             res.peak_fit) - data)
+        n_chunk += 1
+
+        if n_chunk == chunk_size:
+            accumulator.update(chunk)
+            n_chunk = 0
+
+    if n_chunk:
+        accumulator.update(chunk[:n_chunk, :])
+
+    return accumulator
 
 
 def compute_pointwise_error_arr(model, data):
@@ -120,3 +204,256 @@ def compute_pointwise_error_arr(model, data):
     """
 
     return np.abs(model - data)
+
+
+class PointwiseErrorAccumulator():
+    """Streaming accumulator for frequency by frequency error statistics.
+
+    Parameters
+    ----------
+    n_freqs : int
+        Number of frequency values of the errors to accumulate.
+    quantiles : list of float, optional
+        Quantiles, in the range [0, 1], to estimate from a histogram sketch of the errors.
+        If None, no sketch is kept, and quantiles are not available.
+    error_range : tuple of (float, float), optional
+        Initial range of error values covered by the histogram sketch.
+        If None, the range is set from the first errors that are added, as from 0 to a power of 2.
+        Values below the range are counted in the first bin.
+    n_bins : int, optional, default: 1000
+        Number of bins to use for the histogram sketch.
+
+    Attributes
+    ----------
+    count : int
+        Number of error vectors that have been accumulated.
+    mean : 1d array
+        Mean error per frequency.
+    max : 1d array
+        Maximum error per frequency.
+
+    Notes
+    -----
+    Mean and variance are updated in chunks, using Welford's algorithm as generalized
+    for combining sets (Chan et al.), so that memory use is independent of the number
+    of accumulated error vectors.
+
+    The histogram sketch is extended, by doubling the width of its range and merging pairs of
+    bins, whenever errors above the range are added, such that no error values are clipped.
+    The resolution of the estimated quantiles is therefore between 1 and 2 times the
+    maximum error, divided by the number of bins.
+    """
+
+    def __init__(self, n_freqs, quantiles=None, error_range=None, n_bins=1000):
+        """Initialize accumulator."""
+
+        self.count = 0
+        self.mean = np.zeros(n_freqs)
+        self.max = np.zeros(n_freqs)
+        self._m2 = np.zeros(n_freqs)
+
+        self.quantiles = quantiles
+        self._edges = np.linspace(*error_range, n_bins + 1) if error_range else None
+        self._counts = np.zeros([n_freqs, n_bins], dtype=int) if quantiles else None
+
+
+    @property
+    def var(self):
+        """Variance of the error per frequency."""
+
+        return self._m2 / self.count if self.count else np.full(len(self.mean), np.nan)
+
+
+    @property
+    def std(self):
+        """Standard deviation of the error per frequency."""
+
+        return np.sqrt(self.var)
+
+
+    def update(self, errors):
+        """Add a set of error values to the accumulator.
+
+        Parameters
+        ----------
+        errors : 1d or 2d array
+            Error values, as [n_freqs] or [n_errors, n_freqs].
+        """
+
+        errors = np.atleast_2d(errors)
+        n_new = errors.shape[0]
+        if not n_new:
+            return
+
+        new_mean = errors.mean(0)
+        new_m2 = ((errors - new_mean) ** 2).sum(0)
+
+        total = self.count + n_new
+        delta = new_mean - self.mean
+        self.mean = self.mean + delta * (n_new / total)
+        self._m2 = self._m2 + new_m2 + delta ** 2 * (self.count * n_new / total)
+        self.max = np.maximum(self.max, errors.max(0))
+        self.count = total
+
+        if self._counts is not None:
+            self._extend_sketch(np.max(errors, initial=0, where=np.isfinite(errors)))
+            n_freqs, n_bins = self._counts.shape
+            bins = np.clip(np.searchsorted(self._edges, errors, side='right') - 1, 0, n_bins - 1)
+            flat_bins = (bins + np.arange(n_freqs) * n_bins).ravel()
+            self._counts += np.bincount(flat_bins, minlength=n_freqs * n_bins).reshape(\
+                n_freqs, n_bins)
+
+
+    def merge(self, other):
+        """Merge another accumulator into the current one.
+
+        Parameters
+        ----------
+        other : PointwiseErrorAccumulator
+            Accumulator to merge in. Should have the same frequencies, and number of sketch bins.
+
+        Raises
+        ------
+        ValueError
+            If the histogram sketches of the accumulators can not be aligned to be merged.
+        """
+
+        if not other.count:
+            return
+
+        if self._counts is not None and other._counts is not None and other._edges is not None:
+
+            # Extend the sketch with the smaller range, so that the bins of both sketches align
+            counts, edges = other._counts, other._edges
+            if self._edges is None:
+                self._edges = edges.copy()
+            self._extend_sketch(edges[-1])
+            while _get_width(edges) < _get_width(self._edges) and \
+                not np.isclose(_get_width(edges), _get_width(self._edges)):
+                counts, edges = _double_sketch(counts, edges)
+
+            if not np.allclose(edges, self._edges):
+                raise ValueError("Accumulators have histogram sketches that can not be merged.")
+            self._counts += counts
+
+        total = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean = self.mean + delta * (other.count / total)
+        self._m2 = self._m2 + other._m2 + delta ** 2 * (self.count * other.count / total)
+        self.max = np.maximum(self.max, other.max)
+        self.count = total
+
+
+    def _extend_sketch(self, max_value):
+        """Extend the range of the histogram sketch to cover a maximum value."""
+
+        if self._edges is None:
+            width = 2. ** np.ceil(np.log2(max_value)) if max_value > 0 else 1.
+            self._edges = np.linspace(0, width, self._counts.shape[1] + 1)
+
+        while max_value > self._edges[-1] and not np.isclose(max_value, self._edges[-1]):
+            self._counts, self._edges = _double_sketch(self._counts, self._edges)
+
+
+    def get_quantiles(self, quantiles=None):
+        """Estimate quantiles of the error per frequency, from the histogram sketch.
+
+        Parameters
+        ----------
+        quantiles : list of float, optional
+            Quantiles to estimate. If None, uses the quantiles defined at initialization.
+
+        Returns
+        -------
+        2d array
+            Estimated quantile values, as [n_quantiles, n_freqs].
+
+        Raises
+        ------
+        ValueError
+            If the accumulator was initialized without a quantile sketch.
+        """
+
+        if self._counts is None:
+            raise ValueError("Accumulator was initialized without a quantile sketch.")
+
+        quantiles = self.quantiles if quantiles is None else quantiles
+
+        cumulative = np.cumsum(self._counts, 1)
+        bin_width = self._edges[1] - self._edges[0]
+
+        outputs = np.zeros([len(quantiles), self._counts.shape[0]])
+        for q_ind, quantile in enumerate(quantiles):
+            target = quantile * self.count
+            bin_inds = np.argmax(cumulative >= target, 1)
+            n_in_bin = self._counts[np.arange(len(bin_inds)), bin_inds]
+            n_below = cumulative[np.arange(len(bin_inds)), bin_inds] - n_in_bin
+            frac = np.divide(target - n_below, n_in_bin,
+                             out=np.zeros(len(bin_inds)), where=n_in_bin > 0)
+            outputs[q_ind, :] = self._edges[bin_inds] + frac * bin_width
+
+        return outputs
+
+
+def _get_width(edges):
+    """Get the width of the range covered by a set of bin edges."""
+
+    return edges[-1] - edges[0]
+
+
+def _double_sketch(counts, edges):
+    """Double the width of the range of a histogram sketch, by merging pairs of bins.
+
+    Parameters
+    ----------
+    counts : 2d array
+        Histogram counts, as [n_freqs, n_bins].
+    edges : 1d array
+        Bin edges, with length n_bins + 1.
+
+    Returns
+    -------
+    counts : 2d array
+        Histogram counts, for the extended range.
+    edges : 1d array
+        Bin edges, for the extended range.
+    """
+
+    n_freqs, n_bins = counts.shape
+    paired = np.pad(counts, [(0, 0), (0, n_bins % 2)]).reshape(n_freqs, -1, 2).sum(2)
+
+    new_counts = np.zeros_like(counts)
+    new_counts[:, :paired.shape[1]] = paired
+    new_edges = np.linspace(edges[0], edges[0] + 2 * _get_width(edges), n_bins + 1)
+
+    return new_counts, new_edges
+
+
+def _iter_results_data(model, inds=None):
+    """Iterate across paired model fit results and data, without reorganizing the data.
+
+    Parameters
+    ----------
+    model : SpectralGroupModel or SpectralTimeModel or SpectralTimeEventModel
+        Object containing the data and model fit results.
+    inds : array_like of int, optional
+        Indices to iterate across. If None, iterates across all.
+
+    Yields
+    ------
+    result : FitResults
+        Model fit results.
+    data : 1d array
+        Power spectrum corresponding to the model fit results.
+    """
+
+    if getattr(model.results, 'event_group_results', None) is not None:
+        einds = range(len(model.results.event_group_results)) if inds is None else inds
+        for eind in einds:
+            for wind, res in enumerate(model.results.event_group_results[eind]):
+                yield res, model.data.spectrograms[eind][:, wind]
+
+    else:
+        inds = range(len(model.results.group_results)) if inds is None else inds
+        for ind in inds:
+            yield model.results.group_results[ind], model.data.power_spectra[ind]
@@ -5,4 +5,5 @@ from .group import SpectralGroupModel
 from .time import SpectralTimeModel
 from .event import SpectralTimeEventModel
 from .utils import (compare_model_objs, average_group, average_reconstructions,
-                    combine_model_objs, fit_models_3d)
+                    combine_model_objs, combine_model_files, fit_models_3d,
+                    fit_settings_sweep)
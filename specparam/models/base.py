@@ -110,9 +110,13 @@ class BaseModel():
                            periodic_mode=data.pop('periodic_mode'))
         if 'bands' in data.keys():
             self.results.add_bands(data.pop('bands'))
+        if 'dtype' in data.keys():
+            self.data.set_dtype(data.pop('dtype'))
         if 'metrics' in data.keys():
             tmetrics = data.pop('metrics')
-            self.results.add_metrics(list(tmetrics.keys()))
+            # Only re-define metrics if they differ, as when loading many results in a row
+            if list(tmetrics.keys()) != self.results.metrics.labels:
+                self.results.add_metrics(list(tmetrics.keys()))
             self.results.metrics.add_results(tmetrics)
         # TODO
         for label, params in {ke : va for ke, va in data.items() if '_fit' in ke or '_converted' in ke}.items():
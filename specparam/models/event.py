@@ -1,8 +1,12 @@
 """Event model object and associated code for fitting the model to spectrograms across events."""
 
+from time import perf_counter
+from functools import partial
+
 import numpy as np
 
 from specparam.models import SpectralModel, SpectralTimeModel
+from specparam.models.observers import check_observers, notify_event
 from specparam.results.results import Results3D
 from specparam.results.utils import run_parallel_event, pbar
 from specparam.data.data import Data3D
@@ -15,7 +19,10 @@ from specparam.reports.strings import gen_event_results_str
 from specparam.plts.event import plot_event_model
 from specparam.io.utils import get_files
 from specparam.io.models import save_event
+from specparam.utils.array import select_view
+from specparam.utils.select import list_select
 from specparam.utils.checks import check_inds
+from specparam.modutils.errors import ParallelError
 
 ###################################################################################################
 ###################################################################################################
@@ -97,7 +104,8 @@ class SpectralTimeEventModel(SpectralTimeModel):
 
 
     def fit(self, freqs=None, spectrograms=None, freq_range=None, bands=None,
-            n_jobs=1, progress=None, prechecks=True, convert_results=True):
+            n_jobs=1, progress=None, prechecks=True, convert_results=True, observers=None,
+            deadline=None, timeout=None, retries=0, chunk_size=None):
         """Fit a set of events.
 
         Parameters
@@ -122,10 +130,29 @@ class SpectralTimeEventModel(SpectralTimeModel):
             Whether to run model fitting pre-checks.
         convert_results : bool, optional, default: True
             Whether to convert results per spectrogram window to be organized over time.
+        observers : FitObserver or list of FitObserver, optional
+            Observer(s) to notify of the start and end of fitting, and of each model fit.
+            Each model fit is indexed by a tuple of (event, window) indices.
+        deadline : float, optional
+            Maximum time, in seconds, to fit all events. Model fits that are still running at the
+            deadline are stopped early, and any remaining model fits are recorded as failed.
+        timeout : float, optional
+            Maximum time, in seconds, for each parallel task,
+            where each task fits a chunk of windows. Only used if running in parallel.
+            Model fits of tasks that time out, or whose worker process crashes,
+            are recorded as null results.
+        retries : int, optional, default: 0
+            Number of times to retry parallel tasks that fail. Only used if running in parallel.
+        chunk_size : int, optional
+            Number of windows to fit in each parallel task. Only used if running in parallel.
+            If not provided, windows are split into chunks of balanced size, with a few per job.
 
         Notes
         -----
-        Data is optional, if data has already been added to the object.
+        - Data is optional, if data has already been added to the object.
+        - When running in parallel, model fits are run across the windows of all events, such
+          that work is balanced across workers, whatever the number and length of the events.
+          Setting `chunk_size` to the number of windows runs each event as a task.
         """
 
         if spectrograms is not None:
@@ -139,20 +166,62 @@ class SpectralTimeEventModel(SpectralTimeModel):
             print('Fitting model across {} events of {} windows.'.format(\
                 len(self.data.spectrograms), self.data.n_time_windows))
 
-        if n_jobs == 1:
-            self.results._reset_event_results(len(self.data.spectrograms))
-            for ind, spectrogram in \
-                pbar(enumerate(self.data.spectrograms), progress, len(self.results)):
-                self.data.power_spectra = spectrogram.T
-                super().fit(prechecks=False, convert_results=False)
-                self.results.event_group_results[ind] = self.results.group_results
-                self.results._reset_group_results()
-                self._reset_data_results(clear_spectra=True)
-
-        else:
-            fg = self.get_group(None, None, 'group')
-            self.results.event_group_results = run_parallel_event(\
-                fg, self.data.spectrograms, n_jobs, progress)
+        observers = check_observers(observers)
+        for observer in observers:
+            observer.on_fit_start(self, self.data.n_events * self.data.n_time_windows)
+        start = perf_counter()
+
+        # Record information about each model fit, if needed to notify observers
+        record_fit_info = self._record_fit_info
+        self._record_fit_info = record_fit_info or bool(observers)
+
+        try:
+            with self.algorithm._deadline(deadline):
+
+                if n_jobs == 1:
+                    self.results._reset_event_results(len(self.data.spectrograms))
+                    for ind, spectrogram in \
+                        pbar(enumerate(self.data.spectrograms), progress, len(self.results)):
+                        self.data.power_spectra = spectrogram.T
+                        super().fit(prechecks=False, convert_results=False)
+                        self.results.event_group_results[ind] = self.results.group_results
+                        self.results.event_group_fit_info[ind] = self.results.group_fit_info
+                        if observers:
+                            notify_event(observers, ind, (self.results.group_results,
+                                                          self.results.group_fit_info))
+                        self.results._reset_group_results()
+                        self._reset_data_results(clear_spectra=True)
+
+                else:
+                    fg = self.get_group(None, None, 'group')
+                    fg._record_fit_info = self._record_fit_info
+                    callback = partial(notify_event, observers) if observers else None
+                    outputs = run_parallel_event(fg, self.data.spectrograms, n_jobs, progress,
+                                                 callback, timeout, retries, chunk_size)
+
+                    # Collect outputs per event, with failed parallel tasks dropped as null results
+                    n_windows = self.data.n_time_windows
+                    failed = {}
+                    for ind, output in enumerate(outputs):
+                        if isinstance(output, ParallelError):
+                            failed.setdefault(ind // n_windows, []).append(ind % n_windows)
+                            outputs[ind] = ([], {'success' : False, 'status' : 'failed',
+                                                 'error' : str(output)})
+                    results, fit_info = map(list, zip(*outputs))
+                    self.results.event_group_results, self.results.event_group_fit_info = \
+                        [[values[ind:ind + n_windows] for ind in range(0, len(values), n_windows)] \
+                            for values in [results, fit_info]]
+                    if failed:
+                        self.results.drop(failed)
+                        for ind in failed:
+                            notify_event(observers, ind, (self.results.event_group_results[ind],
+                                                          self.results.event_group_fit_info[ind]))
+
+        finally:
+            self._record_fit_info = record_fit_info
+
+        for observer in observers:
+            observer.on_fit_end(self, perf_counter() - start)
 
         if convert_results:
             self.convert_results(bands)
@@ -295,7 +364,7 @@ class SpectralTimeEventModel(SpectralTimeModel):
         event_inds, window_inds : array_like of int or array_like of bool or None
             Indices to extract from the object, for event and time windows.
             If None, selects all available indices.
-        output_type : {'time', 'group'}, optional
+        output_type : {'event', 'time', 'group'}, optional
             Type of model object to extract:
                 'event' : SpectralTimeEventObject
                 'time' : SpectralTimeObject
@@ -303,57 +372,54 @@ class SpectralTimeEventModel(SpectralTimeModel):
 
         Returns
         -------
-        output : SpectralTimeEventModel
+        output : SpectralTimeEventModel or SpectralTimeModel or SpectralGroupModel
             The requested selection of results data loaded into a new model object.
+
+        Notes
+        -----
+        - If the indices are evenly spaced, such as a range, the data and time results of the new
+          object are read-only views of those of the current object, rather than copies.
+          For 'time' and 'group' outputs, this applies if selecting from a single event.
+          To modify these in place, first replace them with a copy
+          (see `specparam.utils.array.make_writeable`).
+        - The current object is not modified.
         """
 
+        # Local import - avoid circularity
+        from specparam.models.utils import initialize_model_from_source
+
         # Check and convert indices encoding to list of int
         einds = check_inds(event_inds, self.data.n_events)
         winds = check_inds(window_inds, self.data.n_time_windows)
 
-        if output_type == 'event':
-
-            # Local import - avoid circularity
-            from specparam.models.utils import initialize_model_from_source
-
-            # Initialize a new model object, with same settings as current object
-            output = initialize_model_from_source(self, 'event')
-
-            if event_inds is not None or window_inds is not None:
-
-                # Add data for specified power spectra, if available
-                if self.data.has_data:
-                    output.data.spectrograms = self.data.spectrograms[einds, :, :][:, :, winds]
-
-                # Add results for specified power spectra - event group results
-                temp = [self.results.event_group_results[ei][wi] for ei in einds for wi in winds]
-                step = int(len(temp) / len(einds))
-                output.results.event_group_results = \
-                    [temp[ind:ind+step] for ind in range(0, len(temp), step)]
-
-                # Add results for specified power spectra - event time results
-                output.results.event_time_results = \
-                    {key : self.results.event_time_results[key][event_inds][:, window_inds] \
-                    for key in self.results.event_time_results}
-
-        elif output_type in ['time', 'group']:
-
-            if event_inds is not None or window_inds is not None:
-
-                # Move specified results & data to `group_results` & `power_spectra` for export
-                self.results.group_results = \
-                    [self.results.event_group_results[ei][wi] for ei in einds for wi in winds]
-                if self.data.has_data:
-                    self.data.power_spectra = \
-                        np.hstack(self.data.spectrograms[einds, :, :][:, :, winds]).T
-
-            new_inds = range(0, len(self.results.group_results)) if \
-                self.results.group_results else None
-            output = super().get_group(new_inds, output_type)
-
-            # Clear the data that was moved for export
-            self.results._reset_group_results()
-            self._reset_data_results(clear_spectra=True)
+        # Initialize a new model object, with same settings as current object
+        output = initialize_model_from_source(self, output_type)
+
+        if event_inds is not None or window_inds is not None:
+
+            # Select specified power spectra & results, as [n_events, n_freqs, n_windows]
+            spectrograms = select_view(select_view(self.data.spectrograms, einds), winds, 2) \
+                if self.data.has_data else None
+            results = [list_select(self.results.event_group_results[eind], winds) \
+                for eind in einds]
+            time_results = {key : select_view(select_view(values, einds), winds, 1) \
+                for key, values in self.results.event_time_results.items()}
+
+            if output_type == 'event':
+                output.data.spectrograms = spectrograms
+                output.results.event_group_results = results
+                output.results.event_time_results = time_results
+
+            # Collect specified power spectra & results across events, for export
+            elif output_type in ['time', 'group']:
+                if spectrograms is not None:
+                    output.data.power_spectra = spectrograms.transpose(0, 2, 1).reshape(\
+                        -1, spectrograms.shape[1])
+                output.results.group_results = [result for eresults in results \
+                    for result in eresults]
+                if output_type == 'time':
+                    output.results.time_results = {key : values.reshape(-1) \
+                        for key, values in time_results.items()}
 
         return output
 
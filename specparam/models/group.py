@@ -5,9 +5,12 @@ Notes
 Methods without defined docstrings import docs at runtime, from aliased external functions.
 """
 
+from time import perf_counter
+
 import numpy as np
 
 from specparam.models import SpectralModel
+from specparam.models.observers import check_observers, notify_spectrum
 from specparam.data.data import Data2D
 from specparam.data.conversions import group_to_dataframe
 from specparam.results.results import Results2D
@@ -19,7 +22,10 @@ from specparam.reports.save import save_group_report
 from specparam.reports.strings import gen_group_results_str
 from specparam.modutils.docs import (copy_func_docstring, copy_func_docstring_drop_first,
                                      docs_get_section, replace_docstring_sections)
+from specparam.utils.array import select_view
+from specparam.utils.select import list_select
 from specparam.utils.checks import check_inds
+from specparam.modutils.errors import ParallelError
 
 ###################################################################################################
 ###################################################################################################
@@ -101,7 +107,7 @@ class SpectralGroupModel(SpectralModel):
 
 
     def fit(self, freqs=None, power_spectra=None, freq_range=None, n_jobs=1,
-            progress=None, prechecks=True):
+            progress=None, prechecks=True, observers=None, deadline=None, timeout=None, retries=0):
         """Fit a group of power spectra.
 
         Parameters
@@ -119,10 +125,26 @@ class SpectralGroupModel(SpectralModel):
             Which kind of progress bar to use. If None, no progress bar is used.
         prechecks : bool, optional, default: True
             Whether to run model fitting pre-checks.
+        observers : FitObserver or list of FitObserver, optional
+            Observer(s) to notify of the start and end of fitting, and of each model fit.
+        deadline : float, optional
+            Maximum time, in seconds, to fit the group. Model fits that are still running at the
+            deadline are stopped early, and any remaining model fits are recorded as failed.
+        timeout : float, optional
+            Maximum time, in seconds, for each parallel task. Only used if running in parallel.
+            Tasks that time out, or whose worker process crashes, are recorded as null results.
+        retries : int, optional, default: 0
+            Number of times to retry parallel tasks that fail. Only used if running in parallel.
 
         Notes
         -----
-        Data is optional, if data has already been added to the object.
+        - Data is optional, if data has already been added to the object.
+        - If the data object is set to deduplicate (see `Data2D.set_dedup`), only unique power
+          spectra are fit, and the results are shared across duplicates, for which the fit
+          information records the index of the power spectrum that was fit, as 'duplicate_of'.
+          Observers are notified of all power spectra, with duplicates notified once their
+          results are shared, with a duration of 0, as no model fit is run for them.
+          Progress bars count only the unique power spectra that are fit.
         """
 
         # If freqs & power spectra provided together, add data to object
@@ -133,24 +155,93 @@ class SpectralGroupModel(SpectralModel):
         if prechecks:
             self.algorithm._fit_prechecks(self.verbose)
 
+        # If deduplicating, fit only the unique power spectra - restored after fitting
+        spectra, unique_inds = self.data.power_spectra, None
+        if self.data.dedup:
+            unique_inds, inverse = self.data.get_unique()
+            self.data.power_spectra = spectra[unique_inds]
+        get_index = (lambda ind: int(unique_inds[ind])) if unique_inds is not None \
+            else (lambda ind: ind)
+
         # If 'verbose', print out a marker of what is being run
         if self.verbose and not progress:
-            print('Fitting model across {} power spectra.'.format(len(self.data.power_spectra)))
-
-        # Run linearly
-        if n_jobs == 1:
-            self.results._reset_group_results(len(self.data.power_spectra))
-            for ind, power_spectrum in \
-                pbar(enumerate(self.data.power_spectra), progress, len(self.results)):
-                self._pass_through_spectrum(power_spectrum)
-                super().fit(prechecks=False)
-                self.results.group_results[ind] = self.results._get_results()
-
-        # Run in parallel
-        else:
-            self.results._reset_group_results()
-            self.results.group_results = run_parallel_group(\
-                self, self.data.power_spectra, n_jobs, progress)
+            print('Fitting model across {} power spectra{}.'.format(len(spectra), \
+                ' ({} unique)'.format(len(unique_inds)) if unique_inds is not None else ''))
+
+        observers = check_observers(observers)
+        for observer in observers:
+            observer.on_fit_start(self, len(spectra))
+        start = perf_counter()
+
+        # Record information about each model fit, if needed to notify observers
+        record_fit_info = self._record_fit_info
+        self._record_fit_info = record_fit_info or bool(observers)
+
+        try:
+            with self.algorithm._deadline(deadline):
+
+                # Run linearly
+                if n_jobs == 1:
+                    self.results._reset_group_results(len(self.data.power_spectra))
+                    if self.algorithm.data_format == 'spectra':
+                        self.algorithm._fit_batch()
+                    for ind, power_spectrum in \
+                        pbar(enumerate(self.data.power_spectra), progress, len(self.results)):
+                        self._pass_through_spectrum(power_spectrum)
+                        super().fit(prechecks=False)
+                        self.results.group_results[ind] = self.results._get_results()
+                        if self.results.fit_info:
+                            self.results.group_fit_info[ind] = self.results.fit_info
+                        if observers:
+                            notify_spectrum(observers, get_index(ind),
+                                            self.results.group_results[ind],
+                                            self.results.group_fit_info[ind])
+
+                # Run in parallel
+                else:
+                    self.results._reset_group_results()
+                    callback = (lambda ind, output: \
+                        notify_spectrum(observers, get_index(ind), *output)) if observers else None
+                    outputs = run_parallel_group(self, self.data.power_spectra, n_jobs, progress,
+                                                 callback, timeout, retries)
+
+                    # Collect outputs, with any failed parallel tasks dropped as null results
+                    failed = [ind for ind, output in enumerate(outputs) \
+                        if isinstance(output, ParallelError)]
+                    for ind in failed:
+                        outputs[ind] = ([], {'success' : False, 'status' : 'failed',
+                                             'error' : str(outputs[ind])})
+                    self.results.group_results, self.results.group_fit_info = \
+                        map(list, zip(*outputs))
+                    empty = {}
+                    self.results.group_fit_info = [fit_info if fit_info else empty \
+                        for fit_info in self.results.group_fit_info]
+                    if failed:
+                        self.results.drop(failed)
+                        for ind in failed:
+                            notify_spectrum(observers, get_index(ind),
+                                            self.results.group_results[ind],
+                                            self.results.group_fit_info[ind])
+
+        finally:
+            self.data.power_spectra = spectra
+            self._record_fit_info = record_fit_info
+
+        # If deduplicating, share results across duplicates
+        if unique_inds is not None:
+            self.results.group_results = [self.results.group_results[ind] for ind in inverse]
+            self.results.group_fit_info = [self.results.group_fit_info[uind] \
+                if unique_inds[uind] == ind else \
+                {**self.results.group_fit_info[uind], 'duplicate_of' : int(unique_inds[uind])} \
+                for ind, uind in enumerate(inverse)]
+            if observers:
+                for ind, uind in enumerate(inverse):
+                    if unique_inds[uind] != ind:
+                        notify_spectrum(observers, ind, self.results.group_results[ind],
+                                        {**self.results.group_fit_info[ind], 'duration' : 0.})
+
+        for observer in observers:
+            observer.on_fit_end(self, perf_counter() - start)
 
         # Clear the individual power spectrum and fit results of the current fit
         self._reset_data_results(clear_spectrum=True, clear_results=True)
@@ -237,7 +328,7 @@ class SpectralGroupModel(SpectralModel):
 
         # Add power spectra data, if they were loaded
         if power_spectra:
-            self.data.power_spectra = np.array(power_spectra)
+            self.data.power_spectra = np.array(power_spectra, dtype=self.data.dtype)
 
         # Reset peripheral data from last loaded result, keeping freqs info
         self._reset_data_results(clear_spectrum=True, clear_results=True)
@@ -303,6 +394,14 @@ class SpectralGroupModel(SpectralModel):
         -------
         group : SpectralGroupModel
             The requested selection of results data loaded into a new group model object.
+
+        Notes
+        -----
+        If the indices are evenly spaced, such as a range, the power spectra of the new object
+        are a read-only view of the power spectra of the current object, rather than a copy.
+        Fitting, and other methods of the new object, replace or copy the data as needed.
+        To modify the power spectra in place, first replace them with a copy
+        (see `specparam.utils.array.make_writeable`).
         """
 
         # Local import - avoid circularity
@@ -318,10 +417,10 @@ class SpectralGroupModel(SpectralModel):
 
             # Add data for specified power spectra, if available
             if self.data.has_data:
-                group.data.power_spectra = self.data.power_spectra[inds, :]
+                group.data.power_spectra = select_view(self.data.power_spectra, inds)
 
             # Add results for specified power spectra
-            group.results.group_results = [self.results.group_results[ind] for ind in inds]
+            group.results.group_results = list_select(self.results.group_results, inds)
 
         return group
 
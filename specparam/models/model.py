@@ -5,9 +5,13 @@ Code Notes
 Methods without defined docstrings import docs at runtime, from aliased external functions.
 """
 
+import os
+from time import perf_counter
+
 import numpy as np
 
 from specparam.models.base import BaseModel
+from specparam.models.service import fit_async
 from specparam.data.data import Data
 from specparam.data.conversions import model_to_dataframe
 from specparam.results.results import Results
@@ -104,6 +108,9 @@ class SpectralModel(BaseModel):
             **algorithm_settings, modes=self.modes, data=self.data,
             results=self.results, debug=debug, model=self, **model_kwargs)
 
+        # Whether to record information about each model fit, such as for fit observers
+        self._record_fit_info = False
+
 
     @replace_docstring_sections([docs_get_section(Data.add_data.__doc__, 'Parameters'),
                                  docs_get_section(Data.add_data.__doc__, 'Notes')])
@@ -170,6 +177,25 @@ class SpectralModel(BaseModel):
         self._fit()
 
 
+    async def fit_async(self, *args, executor=None, **kwargs):
+        """Fit the model, as a coroutine that runs the model fit in an executor.
+
+        Parameters
+        ----------
+        *args, **kwargs
+            Inputs to the `fit` method.
+        executor : concurrent.futures.Executor, optional
+            Executor to run the model fit in. If not provided, uses the shared executor.
+
+        Notes
+        -----
+        The event loop is not blocked while fitting, and the fit can be cancelled.
+        For details, see `specparam.models.service.fit_async`.
+        """
+
+        await fit_async(self, *args, executor=executor, **kwargs)
+
+
     def report(self, freqs=None, power_spectrum=None, freq_range=None,
                plt_log=False, plot_full_range=False, **plot_kwargs):
         """Run model fit, and display a report, which includes a plot, and printed results.
@@ -274,6 +300,10 @@ class SpectralModel(BaseModel):
         # Add loaded data to object and check loaded data
         self._add_from_dict(data)
 
+        # Store any loaded power values with the loaded data type
+        if self.data.power_spectrum is not None:
+            self.data.power_spectrum = self.data.power_spectrum.astype(self.data.dtype, copy=False)
+
         # If settings are not loaded, clear defaults to not have potentially incorrect values
         if not set(self.algorithm.settings.names).issubset(set(data.keys())):
             self.algorithm.settings.clear()
@@ -338,6 +368,20 @@ class SpectralModel(BaseModel):
         of any interim results.
         """
 
+        # Clear any information from a previous fit, and reset any profile record & budget
+        self.results.fit_info = {}
+        if self.algorithm._profiler:
+            self.algorithm._profiler.reset()
+        if self.algorithm._budget:
+            self.algorithm._budget.start()
+
+        start = perf_counter()
+        error = None
+
+        # Fit with data as float64, converting from any reduced precision storage dtype
+        power_spectrum = self.data.power_spectrum
+        self.data.power_spectrum = power_spectrum.astype('float64', copy=False)
+
         try:
 
             # If not set to fail on NaN or Inf data at add time, check data here
@@ -350,20 +394,27 @@ class SpectralModel(BaseModel):
                                    "values in the data, which preclude model fitting.")
 
             # Call the fit function from the algorithm object
-            self.algorithm._fit()
+            with self.algorithm._profile('algorithm'):
+                self.algorithm._fit()
 
             # Do any parameter conversions
-            self._convert_params()
+            with self.algorithm._profile('convert_params'):
+                self._convert_params()
 
             # Compute post-fit metrics
-            self.results.metrics.compute_metrics(self.data, self.results)
+            with self.algorithm._profile('compute_metrics'):
+                self.results.metrics.compute_metrics(self.data, self.results)
+
+            self.results._cast_model()
 
-        except FitError:
+        except FitError as fit_error:
 
             # If in debug mode, re-raise the error
             if self.algorithm._debug:
                 raise
 
+            error = str(fit_error)
+
             # Clear any interim model results that may have run
             #   Partial model results shouldn't be interpreted in light of overall failure
             self.results._reset_results(True)
@@ -372,6 +423,22 @@ class SpectralModel(BaseModel):
             if self.verbose:
                 print("Model fitting was unsuccessful.")
 
+        finally:
+            self.data.power_spectrum = power_spectrum
+
+        # Collect information about the fit process, if recording, or if using a fit budget
+        #   Failed fits always record their status, and the error
+        if self._record_fit_info or self.algorithm._profiler or self.algorithm._budget:
+            self.results.fit_info.update({'duration' : perf_counter() - start,
+                                          'success' : error is None, 'pid' : os.getpid()})
+            self.results.fit_info.setdefault('status', 'complete' if error is None else 'failed')
+        if error is not None:
+            self.results.fit_info.update({'success' : False, 'status' : 'failed', 'error' : error})
+
+        # If profiling, collect the profile record of the current fit
+        if self.algorithm._profiler:
+            self.results.fit_info['profile'] = self.algorithm._profiler.record
+
 
     def _convert_params(self):
         """Convert fit parameters."""
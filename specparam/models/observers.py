@@ -0,0 +1,279 @@
+"""Observers for model fitting, to follow the progress of fitting across groups of spectra."""
+
+import os
+from time import perf_counter
+
+import numpy as np
+
+###################################################################################################
+###################################################################################################
+
+# Default histogram buckets for the time to fit each power spectrum, in seconds
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1., 2.5, 5., 10.)
+
+
+class FitObserver():
+    """Template object for observing model fitting across a group of power spectra.
+
+    Notes
+    -----
+    - Observers are notified by the fit loops of group, time and event models.
+      To define an observer, overload any of the `on_*` methods, which otherwise do nothing.
+    - When fitting in parallel, models are fit in worker processes, and events for each fit
+      are passed to observers in the main process, as the results become available.
+    - For event models, the index of each model fit is a tuple of (event, window) indices.
+    """
+
+    def on_fit_start(self, model, n_spectra):
+        """Called when a fit across a group of power spectra starts.
+
+        Parameters
+        ----------
+        model : SpectralGroupModel or SpectralTimeModel or SpectralTimeEventModel
+            Model object that is being fit.
+        n_spectra : int
+            Number of power spectra to be fit.
+        """
+
+
+    def on_spectrum_done(self, index, duration, success, n_peaks, pid):
+        """Called when a model fit to an individual power spectrum is complete.
+
+        Parameters
+        ----------
+        index : int or tuple of int
+            Index of the power spectrum.
+        duration : float
+            Time taken to fit the power spectrum, in seconds.
+        success : bool
+            Whether the model fit was successful.
+        n_peaks : int
+            Number of peaks that were fit.
+        pid : int
+            Process ID of the process in which the model was fit.
+        """
+
+
+    def on_spectrum_failed(self, index, duration, error, pid):
+        """Called when a model fit to an individual power spectrum is unsuccessful.
+
+        Parameters
+        ----------
+        index : int or tuple of int
+            Index of the power spectrum.
+        duration : float
+            Time taken to attempt to fit the power spectrum, in seconds.
+        error : str
+            Message of the error that caused the model fit to fail.
+        pid : int
+            Process ID of the process in which the model was fit.
+        """
+
+
+    def on_fit_end(self, model, duration):
+        """Called when a fit across a group of power spectra is complete.
+
+        Parameters
+        ----------
+        model : SpectralGroupModel or SpectralTimeModel or SpectralTimeEventModel
+            Model object that was fit.
+        duration : float
+            Time taken to fit the group of power spectra, in seconds.
+        """
+
+
+class PrometheusCollector(FitObserver):
+    """Collect model fit metrics, and write them to a file in the Prometheus text format.
+
+    Parameters
+    ----------
+    file_name : str or Path
+        File to write metrics to, for example for the node_exporter textfile collector.
+    prefix : str, optional, default: 'specparam'
+        Prefix to add to the name of each metric.
+    buckets : tuple of float, optional
+        Upper bounds of histogram buckets for the time to fit each power spectrum, in seconds.
+    write_every : int, optional, default: 100
+        How many model fits to collect between writing the file during a fit.
+        The file is always written at the start and end of each group fit.
+
+    Attributes
+    ----------
+    n_spectra : int
+        Total number of model fits to individual power spectra.
+    n_failed : int
+        Total number of unsuccessful model fits.
+    n_peaks : int
+        Total number of peaks fit across all model fits.
+    counts : 1d array
+        Number of model fits with a duration within each histogram bucket.
+
+    Notes
+    -----
+    Metrics accumulate across all group fits the collector observes. The file is replaced
+    atomically on each write, such that readers never see a partially written file.
+    """
+
+    def __init__(self, file_name, prefix='specparam', buckets=DURATION_BUCKETS, write_every=100):
+        """Initialize collector object."""
+
+        self.file_name = file_name
+        self.prefix = prefix
+        self.buckets = np.array(sorted(buckets), dtype=float)
+        self.write_every = write_every
+
+        self.n_spectra = 0
+        self.n_failed = 0
+        self.n_peaks = 0
+        self.duration_sum = 0.
+        self.counts = np.zeros(len(self.buckets) + 1, dtype=int)
+
+        self._in_progress = 0
+        self._start = None
+        self._stop = None
+        self._fit_spectra = 0
+
+
+    @property
+    def throughput(self):
+        """Number of power spectra fit per second, for the current or most recent group fit."""
+
+        if self._start is None:
+            return 0.
+        elapsed = (self._stop or perf_counter()) - self._start
+        return self._fit_spectra / elapsed if elapsed > 0 else 0.
+
+
+    def on_fit_start(self, model, n_spectra):
+
+        self._in_progress = n_spectra
+        self._start = perf_counter()
+        self._stop = None
+        self._fit_spectra = 0
+        self.write()
+
+
+    def on_spectrum_done(self, index, duration, success, n_peaks, pid):
+
+        self.n_spectra += 1
+        self.n_peaks += n_peaks
+        self.n_failed += not success
+        self.duration_sum += duration
+        self.counts[np.searchsorted(self.buckets, duration)] += 1
+
+        self._in_progress -= 1
+        self._fit_spectra += 1
+        if self.write_every and self.n_spectra % self.write_every == 0:
+            self.write()
+
+
+    def on_fit_end(self, model, duration):
+
+        self._in_progress = 0
+        self._stop = perf_counter()
+        self.write()
+
+
+    def write(self):
+        """Write the current metrics to file."""
+
+        lines = []
+        self._add_metric(lines, 'spectra_total', 'counter',
+                         'Total number of power spectra fit.', self.n_spectra)
+        self._add_metric(lines, 'failures_total', 'counter',
+                         'Total number of unsuccessful model fits.', self.n_failed)
+        self._add_metric(lines, 'peaks_total', 'counter',
+                         'Total number of peaks fit.', self.n_peaks)
+        self._add_metric(lines, 'spectra_in_progress', 'gauge',
+                         'Number of power spectra remaining in the current fit.', self._in_progress)
+        self._add_metric(lines, 'throughput_spectra_per_second', 'gauge',
+                         'Power spectra fit per second, in the current or last fit.',
+                         self.throughput)
+
+        name = self.prefix + '_spectrum_duration_seconds'
+        lines.append('# HELP {} Time to fit each power spectrum.'.format(name))
+        lines.append('# TYPE {} histogram'.format(name))
+        for bound, count in zip(self.buckets, np.cumsum(self.counts[:-1])):
+            lines.append('{}_bucket{{le="{}"}} {}'.format(name, repr(float(bound)), count))
+        lines.append('{}_bucket{{le="+Inf"}} {}'.format(name, self.n_spectra))
+        lines.append('{}_sum {}'.format(name, repr(self.duration_sum)))
+        lines.append('{}_count {}'.format(name, self.n_spectra))
+
+        temp_file = str(self.file_name) + '.tmp'
+        with open(temp_file, 'w') as f_obj:
+            f_obj.write('\n'.join(lines) + '\n')
+        os.replace(temp_file, self.file_name)
+
+
+    def _add_metric(self, lines, label, metric_type, description, value):
+        """Add a single valued metric, in the text format, to a list of lines."""
+
+        name = self.prefix + '_' + label
+        lines.append('# HELP {} {}'.format(name, description))
+        lines.append('# TYPE {} {}'.format(name, metric_type))
+        lines.append('{} {}'.format(name, repr(value) if isinstance(value, float) else value))
+
+
+def check_observers(observers):
+    """Check an observers input, returning a list of observers.
+
+    Parameters
+    ----------
+    observers : FitObserver or list of FitObserver or None
+        Observer(s) of model fitting.
+
+    Returns
+    -------
+    observers : list of FitObserver
+        Observers of model fitting. Empty if no observers were given.
+    """
+
+    if observers is None:
+        observers = []
+    elif isinstance(observers, FitObserver):
+        observers = [observers]
+
+    return list(observers)
+
+
+def notify_spectrum(observers, index, result, fit_info):
+    """Notify observers that a model fit to an individual power spectrum is complete.
+
+    Parameters
+    ----------
+    observers : list of FitObserver
+        Observers of model fitting.
+    index : int or tuple of int
+        Index of the power spectrum.
+    result : FitResults
+        Results of the model fit.
+    fit_info : dict
+        Information about the model fit process.
+    """
+
+    duration = fit_info.get('duration', 0.)
+    success = fit_info.get('success', True)
+    n_peaks = result.peak_fit.shape[0] if success else 0
+    pid = fit_info.get('pid', os.getpid())
+
+    for observer in observers:
+        observer.on_spectrum_done(index, duration, success, n_peaks, pid)
+        if not success:
+            observer.on_spectrum_failed(index, duration, fit_info.get('error', ''), pid)
+
+
+def notify_event(observers, index, output):
+    """Notify observers that the model fits to an event are complete.
+
+    Parameters
+    ----------
+    observers : list of FitObserver
+        Observers of model fitting.
+    index : int
+        Index of the event.
+    output : tuple of (list of FitResults, list of dict)
+        Results of the model fits, and information about the fit process, for each window.
+    """
+
+    for wind, (result, fit_info) in enumerate(zip(*output)):
+        notify_spectrum(observers, (index, wind), result, fit_info)
@@ -0,0 +1,308 @@
+"""Asynchronous model fitting, for running model fits from asyncio code, such as web services."""
+
+import asyncio
+from inspect import signature
+from functools import partial
+from threading import Event, Lock
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from specparam.models.observers import FitObserver, check_observers
+from specparam.modutils.errors import FitCancelledError
+
+###################################################################################################
+###################################################################################################
+
+# Shared executor for asynchronous model fits, created when first needed
+_EXECUTOR = None
+_EXECUTOR_LOCK = Lock()
+
+
+def get_executor():
+    """Get the shared executor that asynchronous model fits are run in.
+
+    Returns
+    -------
+    executor : concurrent.futures.Executor
+        Shared executor. If not set with `set_executor`, this is a thread pool.
+    """
+
+    global _EXECUTOR
+    with _EXECUTOR_LOCK:
+        if _EXECUTOR is None:
+            _EXECUTOR = ThreadPoolExecutor(thread_name_prefix='specparam')
+
+    return _EXECUTOR
+
+
+def set_executor(executor):
+    """Set the shared executor that asynchronous model fits are run in.
+
+    Parameters
+    ----------
+    executor : concurrent.futures.Executor or None
+        Executor to use. Should run tasks in threads, as model fits update model objects
+        in place. If None, a thread pool is created when next needed.
+
+    Notes
+    -----
+    Any previous shared executor is not shut down, as it may still be running model fits.
+    """
+
+    global _EXECUTOR
+    with _EXECUTOR_LOCK:
+        _EXECUTOR = executor
+
+
+async def fit_async(model, *args, executor=None, **kwargs):
+    """Fit a model object, as a coroutine that runs the model fit in an executor.
+
+    Parameters
+    ----------
+    model : SpectralModel or SpectralGroupModel or SpectralTimeModel or SpectralTimeEventModel
+        Model object to fit.
+    *args, **kwargs
+        Inputs to the `fit` method of the model object.
+    executor : concurrent.futures.Executor, optional
+        Executor to run the model fit in. If not provided, uses the shared executor.
+
+    Raises
+    ------
+    asyncio.CancelledError
+        If the coroutine is cancelled.
+
+    Notes
+    -----
+    - The model fit runs in a thread of the executor, such that the event loop is not blocked.
+      The model object is updated in place, and so should not be used by other code until the
+      fit is complete, and should not be fit concurrently.
+    - If cancelled, fits across groups of power spectra stop after the current power spectrum.
+      Fits of individual power spectra are not interrupted. In both cases, cancellation waits
+      for the model fit to stop, such that the object is not updated after cancellation.
+    """
+
+    cancel = Event()
+    if 'observers' in signature(model.fit).parameters:
+        kwargs['observers'] = check_observers(kwargs.get('observers')) + [_CancelObserver(cancel)]
+
+    future = asyncio.get_running_loop().run_in_executor(\
+        executor if executor else get_executor(), partial(model.fit, *args, **kwargs))
+
+    try:
+        await asyncio.shield(future)
+    except asyncio.CancelledError:
+        cancel.set()
+        try:
+            await future
+        except Exception:  # pylint: disable=broad-except
+            pass
+        raise
+
+
+class _CancelObserver(FitObserver):
+    """Observer that stops a fit across a group of power spectra, once cancelled."""
+
+    def __init__(self, cancel):
+        """Initialize observer."""
+
+        self.cancel = cancel
+
+    def _check(self):
+        """Raise an error to stop model fitting, if cancelled."""
+
+        if self.cancel.is_set():
+            raise FitCancelledError("Model fitting was cancelled.")
+
+    def on_fit_start(self, model, n_spectra):
+        self._check()
+
+    def on_spectrum_done(self, index, duration, success, n_peaks, pid):
+        self._check()
+
+
+class FitService():
+    """Fit individual power spectra from concurrent requests, batched into group model fits.
+
+    Parameters
+    ----------
+    model : SpectralModel, optional
+        Model object to take the fit modes, algorithm and settings from.
+        If not provided, uses a model object with default settings.
+    max_batch_size : int, optional, default: 64
+        Maximum number of power spectra to fit together in a group model fit.
+    max_delay : float, optional, default: 0.005
+        Time, in seconds, to wait for more requests to add to a batch, once a request arrives.
+    max_queue_size : int, optional, default: 1024
+        Maximum number of requests waiting to be fit. If the queue is full,
+        new requests wait for space in the queue, applying backpressure to callers.
+    max_concurrency : int, optional, default: 1
+        Maximum number of batches to fit at the same time.
+    executor : concurrent.futures.Executor, optional
+        Executor to run model fits in. If not provided, uses the shared executor.
+
+    Notes
+    -----
+    - Requests are collected into batches, and power spectra with the same frequency values
+      and frequency range are fit together as a group, which reduces the cost of each fit,
+      especially with the batched fit algorithms ('spectral_fit_batch', 'spectral_fit_lm').
+    - If a group model fit fails with an error, the power spectra of the batch are fit
+      individually, such that an error from one request does not affect other requests.
+    - Requests that are cancelled while waiting in the queue are not fit.
+    - The service should be used from a single event loop, for example as an async
+      context manager, which starts and stops the service::
+
+        async with FitService(model) as service:
+            fm = await service.fit(freqs, power_spectrum)
+    """
+
+    def __init__(self, model=None, max_batch_size=64, max_delay=0.005,
+                 max_queue_size=1024, max_concurrency=1, executor=None):
+        """Initialize service object."""
+
+        # Local import - avoid circularity
+        from specparam.models.model import SpectralModel
+
+        self.model = model if model is not None else SpectralModel(verbose=False)
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay
+        self.max_queue_size = max_queue_size
+        self.max_concurrency = max_concurrency
+        self.executor = executor
+
+        self._queue = None
+        self._workers = []
+
+
+    @property
+    def running(self):
+        """Whether the service is running."""
+
+        return bool(self._workers)
+
+
+    async def start(self):
+        """Start the service, if not already running."""
+
+        if not self.running:
+            self._queue = asyncio.Queue(self.max_queue_size)
+            self._workers = [asyncio.create_task(self._run()) \
+                for _ in range(self.max_concurrency)]
+
+
+    async def stop(self):
+        """Stop the service, cancelling any requests that have not been fit."""
+
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+        while self._queue is not None and not self._queue.empty():
+            self._queue.get_nowait()[-1].cancel()
+
+
+    async def __aenter__(self):
+        """Start the service, when used as a context manager."""
+
+        await self.start()
+
+        return self
+
+
+    async def __aexit__(self, *exc_info):
+        """Stop the service, when used as a context manager."""
+
+        await self.stop()
+
+
+    async def fit(self, freqs, power_spectrum, freq_range=None):
+        """Fit a power spectrum.
+
+        Parameters
+        ----------
+        freqs : 1d array
+            Frequency values for the power spectrum, in linear space.
+        power_spectrum : 1d array
+            Power values, which must be input in linear space.
+        freq_range : list of [float, float], optional
+            Frequency range to restrict power spectrum to.
+            If not provided, keeps the entire range.
+
+        Returns
+        -------
+        model : SpectralModel
+            Model object, with the data and fit results of the power spectrum.
+
+        Notes
+        -----
+        The service is started, if it is not already running.
+        """
+
+        await self.start()
+
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((np.asarray(freqs), np.asarray(power_spectrum), freq_range, future))
+
+        return await future
+
+
+    async def _run(self):
+        """Collect requests into batches, and fit them, until cancelled."""
+
+        loop = asyncio.get_running_loop()
+        while True:
+
+            # Wait for a request, and then for any more requests, to collect a batch
+            requests = [await self._queue.get()]
+            if self.max_delay:
+                await asyncio.sleep(self.max_delay)
+            while len(requests) < self.max_batch_size and not self._queue.empty():
+                requests.append(self._queue.get_nowait())
+
+            # Organize requests that have not been cancelled by frequency definition
+            batches = {}
+            for request in requests:
+                if not request[-1].cancelled():
+                    freqs, _, freq_range, _ = request
+                    key = (freqs.tobytes(), None if freq_range is None else tuple(freq_range))
+                    batches.setdefault(key, []).append(request)
+
+            for batch in batches.values():
+                try:
+                    outputs = await loop.run_in_executor(\
+                        self.executor if self.executor else get_executor(),
+                        partial(_fit_requests, self.model, batch))
+                except asyncio.CancelledError:
+                    for request in batch:
+                        request[-1].cancel()
+                    raise
+                for request, (output, error) in zip(batch, outputs):
+                    if not request[-1].done():
+                        if error is None:
+                            request[-1].set_result(output)
+                        else:
+                            request[-1].set_exception(error)
+
+
+def _fit_requests(model, requests):
+    """Fit a batch of requests, with the same frequency definition - for `FitService`.
+
+    Returns a list of (model, error) for each request, with one of the two being None.
+    """
+
+    # Local import - avoid circularity
+    from specparam.models.utils import initialize_model_from_source
+
+    freqs, _, freq_range, _ = requests[0]
+
+    try:
+        group = initialize_model_from_source(model, 'group')
+        group.verbose = False
+        group.fit(freqs, np.array([request[1] for request in requests]), freq_range)
+        return [(group.get_model(ind), None) for ind in range(len(requests))]
+
+    except Exception as excp:  # pylint: disable=broad-except
+        if len(requests) == 1:
+            return [(None, excp)]
+        return [_fit_requests(model, [request])[0] for request in requests]
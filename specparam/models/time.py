@@ -4,13 +4,14 @@ from specparam.models import SpectralModel, SpectralGroupModel
 from specparam.results.results import Results2DT
 from specparam.data.data import Data2DT
 from specparam.data.conversions import group_to_dataframe, dict_to_df
-from specparam.data.utils import get_results_by_ind
 from specparam.io.models import save_time
 from specparam.plts.time import plot_time_model
 from specparam.reports.save import save_time_report
 from specparam.reports.strings import gen_time_results_str
 from specparam.modutils.docs import (copy_func_docstring_drop_first, docs_get_section,
                                      replace_docstring_sections)
+from specparam.utils.array import select_view
+from specparam.utils.select import list_select
 from specparam.utils.checks import check_inds
 
 ###################################################################################################
@@ -64,7 +65,8 @@ class SpectralTimeModel(SpectralGroupModel):
 
 
     def fit(self, freqs=None, spectrogram=None, freq_range=None, bands=None,
-            n_jobs=1, progress=None, prechecks=True, convert_results=True):
+            n_jobs=1, progress=None, prechecks=True, convert_results=True, observers=None,
+            deadline=None, timeout=None, retries=0):
         """Fit a spectrogram.
 
         Parameters
@@ -87,6 +89,16 @@ class SpectralTimeModel(SpectralGroupModel):
             Whether to run model fitting pre-checks.
         convert_results : bool, optional, default: True
             Whether to convert results per spectrogram window to be organized over time.
+        observers : FitObserver or list of FitObserver, optional
+            Observer(s) to notify of the start and end of fitting, and of each model fit.
+        deadline : float, optional
+            Maximum time, in seconds, to fit the spectrogram. Model fits that are still running at
+            the deadline are stopped early, and any remaining model fits are recorded as failed.
+        timeout : float, optional
+            Maximum time, in seconds, for each parallel task. Only used if running in parallel.
+            Tasks that time out, or whose worker process crashes, are recorded as null results.
+        retries : int, optional, default: 0
+            Number of times to retry parallel tasks that fail. Only used if running in parallel.
 
         Notes
         -----
@@ -99,7 +111,8 @@ class SpectralTimeModel(SpectralGroupModel):
         if prechecks:
             self.algorithm._fit_prechecks(self.verbose)
 
-        super().fit(n_jobs=n_jobs, progress=progress, prechecks=False)
+        super().fit(n_jobs=n_jobs, progress=progress, prechecks=False, observers=observers,
+                    deadline=deadline, timeout=timeout, retries=retries)
 
         if convert_results:
             self.convert_results(bands)
@@ -216,6 +229,13 @@ class SpectralTimeModel(SpectralGroupModel):
         -------
         output : SpectralTimeModel or SpectralGroupModel
             The requested selection of results data loaded into a new model object.
+
+        Notes
+        -----
+        If the indices are evenly spaced, such as a range, the power spectra and time results
+        of the new object are read-only views of those of the current object, rather than copies.
+        To modify these in place, first replace them with a copy
+        (see `specparam.utils.array.make_writeable`).
         """
 
         if output_type == 'time':
@@ -233,11 +253,12 @@ class SpectralTimeModel(SpectralGroupModel):
 
                 # Add data for specified power spectra, if available
                 if self.data.has_data:
-                    output.data.power_spectra = self.data.power_spectra[inds, :]
+                    output.data.power_spectra = select_view(self.data.power_spectra, inds)
 
                 # Add results for specified power spectra
-                output.results.group_results = [self.results.group_results[ind] for ind in inds]
-                output.results.time_results = get_results_by_ind(self.results.time_results, inds)
+                output.results.group_results = list_select(self.results.group_results, inds)
+                output.results.time_results = {key : select_view(values, inds) \
+                    for key, values in self.results.time_results.items()}
 
         if output_type == 'group':
             output = super().get_group(inds)
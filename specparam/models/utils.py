@@ -1,14 +1,22 @@
 """Utility functions for managing and manipulating model objects."""
 
+from copy import deepcopy
+from functools import partial
+from itertools import chain, product
+
 import numpy as np
 
 from specparam.sim import gen_freqs
+from specparam.bands.bands import check_bands
+from specparam.io.models import load_group
+from specparam.results.utils import run_parallel, pbar
+from specparam.data.conversions import group_to_dict
 from specparam.data.stores import FitResults
 from specparam.utils.checks import check_input_options
 from specparam.models import (SpectralModel, SpectralGroupModel,
                               SpectralTimeModel, SpectralTimeEventModel)
 from specparam.data.periodic import get_band_peak_group
-from specparam.modutils.errors import NoModelError, IncompatibleSettingsError
+from specparam.modutils.errors import NoModelError, NoDataError, IncompatibleSettingsError
 
 ###################################################################################################
 ###################################################################################################
@@ -39,13 +47,28 @@ def initialize_model_from_source(source, target):
     """
 
     model = MODELS[target](**source.modes.get_modes()._asdict(),
+                           algorithm=type(source.algorithm),
                            **source.algorithm.settings.values,
                            metrics=source.results.metrics.labels,
+                           converters=source._converters,
                            bands=source.results.bands,
                            verbose=source.verbose)
     model.data.add_meta_data(source.data.get_meta_data())
     model.data.set_checks(*source.data.get_checks())
+    model.data.set_dtype(source.data.dtype)
+    if target != 'model':
+        model.data.set_dedup(getattr(source.data, 'dedup', False))
     model.algorithm.set_debug(source.algorithm.get_debug())
+    model.algorithm.set_profile(source.algorithm.get_profile())
+    model.algorithm.set_cache(source.algorithm.get_cache())
+    model.algorithm.set_budget(**source.algorithm.get_budget())
+    model.algorithm.set_schedule(source.algorithm.get_schedule())
+
+    # Copy private & curve_fit settings, which are not set from the public settings values
+    for label in ['_settings', '_cf_settings']:
+        if hasattr(source.algorithm, label):
+            getattr(model.algorithm, label).values.update(\
+                deepcopy(getattr(source.algorithm, label).values))
 
     return model
 
@@ -76,6 +99,7 @@ def compare_model_objs(model_objs, aspect):
     check_input_options(aspect, aspects, 'aspect')
 
     # Check specified aspect of the objects are the same across instances
+    consistent = True
     for m_obj_1, m_obj_2 in zip(model_objs[:-1], model_objs[1:]):
         if aspect == 'modes':
             consistent = m_obj_1.modes.get_modes() == m_obj_2.modes.get_modes()
@@ -87,6 +111,8 @@ def compare_model_objs(model_objs, aspect):
             consistent = m_obj_1.results.bands == m_obj_2.results.bands
         if aspect == 'metrics':
             consistent = m_obj_1.results.metrics.labels == m_obj_2.results.metrics.labels
+        if not consistent:
+            break
 
     return consistent
 
@@ -237,34 +263,33 @@ def combine_model_objs(model_objs):
                                         "or meta data, and so cannot be combined.")
 
     # Initialize group model object, with settings derived from input objects
-    group = SpectralGroupModel(**model_objs[0].modes.get_modes()._asdict(),
-                               **model_objs[0].algorithm.get_settings()._asdict(),
-                               verbose=model_objs[0].verbose)
+    group = initialize_model_from_source(model_objs[0], 'group')
 
-    # Use a temporary store to collect spectra, as we'll only add it if it is consistently present
+    # Collect results & spectra from each model object, to be concatenated once
     #   We check how many frequencies by accessing meta data, in case of no frequency vector
     meta_data = model_objs[0].data.get_meta_data()
     n_freqs = len(gen_freqs(meta_data.freq_range, meta_data.freq_res))
-    temp_power_spectra = np.empty([0, n_freqs])
-
-    # Add results from each model object to group
+    results, power_spectra = [], []
     for m_obj in model_objs:
 
         # Add group object
         if isinstance(m_obj, SpectralGroupModel):
-            group.results.group_results.extend(m_obj.results.group_results)
+            results.append(m_obj.results.group_results)
             if m_obj.data.power_spectra is not None:
-                temp_power_spectra = np.vstack([temp_power_spectra, m_obj.data.power_spectra])
+                power_spectra.append(m_obj.data.power_spectra)
 
         # Add model object
         else:
-            group.results.group_results.append(m_obj.results.get_results())
+            results.append([m_obj.results.get_results()])
             if m_obj.data.power_spectrum is not None:
-                temp_power_spectra = np.vstack([temp_power_spectra, m_obj.data.power_spectrum])
+                power_spectra.append(m_obj.data.power_spectrum[None, :])
+
+    group.results.group_results = list(chain.from_iterable(results))
 
     # If the number of collected power spectra is consistent, then add them to object
-    if len(group.results) == temp_power_spectra.shape[0]:
-        group.data.power_spectra = temp_power_spectra
+    if len(group.results) == sum(len(spectra) for spectra in power_spectra):
+        group.data.power_spectra = np.concatenate(power_spectra) \
+            if power_spectra else np.empty([0, n_freqs])
 
     # Set the status for freqs & data checking
     #  Check states gets set as True if any of the inputs have it on, False otherwise
@@ -278,6 +303,52 @@ def combine_model_objs(model_objs):
     return group
 
 
+def combine_model_files(file_names, file_path=None, n_jobs=1, progress=None):
+    """Load a set of model files, and combine them into a single group model object.
+
+    Parameters
+    ----------
+    file_names : list of str
+        Files to load, each saved from a model or group model object.
+    file_path : Path or str, optional
+        Path to directory to load from. If None, loads from current directory.
+    n_jobs : int, optional, default: 1
+        Number of jobs to run in parallel, to load files.
+        1 is no parallelization. -1 uses all available cores.
+    progress : {None, 'tqdm', 'tqdm.notebook'}, optional
+        Which kind of progress bar to use. If None, no progress bar is used.
+
+    Returns
+    -------
+    group : SpectralGroupModel
+        Resultant object from combining the loaded files.
+
+    Raises
+    ------
+    IncompatibleSettingsError
+        If the loaded objects have incompatible settings for combining.
+
+    Notes
+    -----
+    Each file is loaded as a group model object, and the loaded objects are combined
+    with `combine_model_objs`, in the same order as the file names.
+
+    Examples
+    --------
+    Combine group model files, saved per subject, loading across 4 jobs:
+
+    >>> group = combine_model_files(['sub_01', 'sub_02', 'sub_03'], n_jobs=4)  # doctest:+SKIP
+    """
+
+    pfunc = partial(load_group, file_path=file_path)
+    if n_jobs == 1:
+        groups = [pfunc(file_name) for file_name in pbar(file_names, progress, len(file_names))]
+    else:
+        groups = run_parallel(pfunc, file_names, n_jobs, progress)
+
+    return combine_model_objs(groups)
+
+
 def fit_models_3d(group, freqs, power_spectra, freq_range=None, n_jobs=1):
     """Fit power spectrum models across a 3d array of power spectra.
 
@@ -320,3 +391,136 @@ def fit_models_3d(group, freqs, power_spectra, freq_range=None, n_jobs=1):
         for dim_a in range(shape[0])]
 
     return all_models
+
+
+def fit_settings_sweep(group, settings, freqs=None, power_spectra=None, freq_range=None,
+                       bands=None, n_jobs=1, chunk_size=100, progress=None):
+    """Fit a group of power spectra across a grid of algorithm settings.
+
+    Parameters
+    ----------
+    group : SpectralGroupModel
+        Object to fit with, initialized with the settings that are not swept.
+    settings : dict or list of dict
+        Settings to sweep across. If a dict, as {setting name : list of values}, all
+        combinations of the values are fit. If a list of dict, each dict of values is fit.
+        Can include public and private algorithm settings.
+    freqs : 1d array, optional
+        Frequency values for the power_spectra, in linear space.
+    power_spectra : 2d array, shape: [n_power_spectra, n_freqs], optional
+        Matrix of power spectrum values, in linear space.
+    freq_range : list of [float, float], optional
+        Frequency range to fit the model to. If not provided, fits the entire given range.
+    bands : Bands or dict or int, optional
+        How to organize peaks into bands.
+        If not provided, uses the bands definition available in the object.
+    n_jobs : int, optional, default: 1
+        Number of jobs to run in parallel.
+        1 is no parallelization. -1 uses all available cores.
+    chunk_size : int, optional, default: 100
+        Number of power spectra to fit in each task.
+    progress : {None, 'tqdm', 'tqdm.notebook'}, optional
+        Which kind of progress bar to use. If None, no progress bar is used.
+
+    Returns
+    -------
+    combinations : list of dict
+        Settings values for each combination of settings.
+    results : dict of {str : 2d array}
+        Model results, with the labels used by `group_to_dict`, and the number of peaks, as
+        'n_peaks', each as an array with shape [n_combinations, n_power_spectra].
+
+    Raises
+    ------
+    NoDataError
+        If no data is available to fit.
+    ValueError
+        If a setting to sweep is not a setting of the fit algorithm.
+
+    Notes
+    -----
+    - Data is optional, if data has already been added to the object.
+    - Each task fits a chunk of power spectra across all combinations of settings, caching the
+      outputs of stages of fitting (see `Algorithm.set_cache`). Stages that do not depend on
+      the swept settings, such as the robust aperiodic fit, are then run once per power
+      spectrum, and peak fits are re-used across combinations with the same peak guesses.
+    - The settings and results of the given object are not changed.
+
+    Examples
+    --------
+    Fit across combinations of peak settings, assuming `freqs` and `spectra` are defined:
+
+    >>> from specparam import SpectralGroupModel
+    >>> group = SpectralGroupModel(min_peak_height=0.1)
+    >>> settings = {'peak_width_limits' : [[1, 6], [2, 8]], 'peak_threshold' : [1.5, 2.]}
+    >>> combs, results = fit_settings_sweep(group, settings, freqs, spectra)  # doctest:+SKIP
+    """
+
+    if freqs is not None and power_spectra is not None:
+        group.add_data(freqs, power_spectra, freq_range)
+
+    if not group.data.has_data:
+        raise NoDataError("No data available to fit, can not proceed.")
+
+    if isinstance(settings, dict):
+        combinations = [dict(zip(settings.keys(), values)) \
+            for values in product(*settings.values())]
+    else:
+        combinations = [dict(combination) for combination in settings]
+
+    names = group.algorithm.settings.names + group.algorithm._settings.names
+    for name in set(name for combination in combinations for name in combination):
+        if name not in names:
+            raise ValueError("Setting to sweep '{}' is not an algorithm setting.".format(name))
+
+    # Initialize the object to fit with from the given object, without copying data or results
+    spectra = group.data.power_spectra
+    #   Frequencies are set from the data, rather than regenerated from the meta data
+    model = initialize_model_from_source(group, 'group')
+    model.data.freqs = group.data.freqs
+    model.verbose = False
+    model.algorithm.set_cache(True)
+
+    pfunc = partial(_fit_sweep_chunk, model=model, combinations=combinations,
+                    bands=check_bands(bands if bands else group.results.bands))
+    chunks = [spectra[ind:ind + chunk_size] for ind in range(0, len(spectra), chunk_size)]
+    if n_jobs == 1:
+        outputs = [pfunc(chunk) for chunk in pbar(chunks, progress, len(chunks))]
+    else:
+        costs = group.algorithm._get_costs(spectra)
+        outputs = run_parallel(pfunc, chunks, n_jobs, progress, costs=None if costs is None \
+            else [np.sum(costs[ind:ind + chunk_size]) for ind in range(0, len(costs), chunk_size)])
+
+    results = {label : np.concatenate([output[label] for output in outputs], axis=1) \
+        for label in outputs[0]}
+
+    return combinations, results
+
+
+def _fit_sweep_chunk(power_spectra, model, combinations, bands):
+    """Fit a chunk of power spectra across combinations of settings - for `fit_settings_sweep`.
+
+    Returns the model results, as arrays with shape [n_combinations, n_power_spectra].
+    """
+
+    algorithm = model.algorithm
+    algorithm._cache.reset()
+    model.data.power_spectra = power_spectra
+
+    def get_store(name):
+        return algorithm.settings if name in algorithm.settings.names else algorithm._settings
+
+    # Collect the initial values of swept settings, to reset to for each combination
+    initial = {name : getattr(get_store(name), name) \
+        for combination in combinations for name in combination}
+
+    outputs = []
+    for combination in combinations:
+        for name, value in {**initial, **combination}.items():
+            setattr(get_store(name), name, value)
+        model.fit(prechecks=False)
+        output = group_to_dict(model.results.get_results(), model.modes, bands, model.data.dtype)
+        output['n_peaks'] = model.results.n_peaks
+        outputs.append(output)
+
+    return {label : np.array([output[label] for output in outputs]) for label in outputs[0]}
@@ -9,6 +9,8 @@ Conventions:
         - For peak functions, this is the number of function parameters * n_peaks
 - Each function should define the input parameters and function formula in the docstring
     - When defining a fit mode, this information should be consistent in the Mode object
+- Functions can use `get_log_freqs` to get frequencies in log10 space
+    - This uses cached values if `xs` are the frequencies of a `FreqGrid` (e.g. from a Data object)
 
 For defining the formulas, the following standard variable definitions are used (formula / code):
 
@@ -29,6 +31,7 @@ import numpy as np
 from scipy.special import erf
 
 from specparam.utils.array import normalize
+from specparam.data.grid import get_log_freqs
 
 ###################################################################################################
 ###################################################################################################
@@ -257,7 +260,7 @@ def powerlaw_function(xs, *params):
     """
 
     offset, exp = params
-    ys = offset - np.log10(xs**exp)
+    ys = offset - exp * get_log_freqs(xs)
 
     return ys
 
@@ -338,7 +341,7 @@ def double_expo_function(xs, *params):
 
     offset, exp0, knee, exp1 = params
 
-    ys = ys + offset - np.log10((xs**exp0) * (knee + xs**exp1))
+    ys = ys + offset - exp0 * get_log_freqs(xs) - np.log10(knee + xs**exp1)
 
     return ys
 
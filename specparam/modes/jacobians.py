@@ -9,6 +9,8 @@ These functions are designed to be passed into `curve_fit` to provide a computed
 
 import numpy as np
 
+from specparam.data.grid import get_log_freqs
+
 ###################################################################################################
 ###################################################################################################
 
@@ -28,9 +30,14 @@ def jacobian_gauss(xs, *params):
     -------
     jacobian : 2d array
         Jacobian matrix, with shape [len(xs), n_params].
+
+    Notes
+    -----
+    Parameters can also be given as arrays, that broadcast with `xs`, to compute the Jacobian
+    for a batch of parameters at once, in which case the output has shape [..., n_params].
     """
 
-    jacobian = np.zeros((len(xs), len(params)))
+    jacobian = np.zeros(np.broadcast_shapes(np.shape(xs), np.shape(params[0])) + (len(params),))
 
     for i, (a, b, c) in enumerate(zip(*[iter(params)] * 3)):
 
@@ -44,9 +51,9 @@ def jacobian_gauss(xs, *params):
         exp_b = exp * b
 
         ii = i * 3
-        jacobian[:, ii] = (exp_b * ax) / c2
-        jacobian[:, ii+1] = exp
-        jacobian[:, ii+2] = (exp_b * ax2) / c3
+        jacobian[..., ii] = (exp_b * ax) / c2
+        jacobian[..., ii+1] = exp
+        jacobian[..., ii+2] = (exp_b * ax2) / c3
 
     return jacobian
 
@@ -76,7 +83,7 @@ def jacobian_expo(xs, *params):
 
     jacobian = np.ones((len(xs), len(params)))
     jacobian[:, 1] = -1 / b_xs_c
-    jacobian[:, 2] = -(xs_c * np.log10(xs)) / b_xs_c
+    jacobian[:, 2] = -(xs_c * get_log_freqs(xs)) / b_xs_c
 
     return jacobian
 
@@ -98,6 +105,6 @@ def jacobian_expo_nk(xs, *params):
     """
 
     jacobian = np.ones((len(xs), len(params)))
-    jacobian[:, 1] = -np.log10(xs)
+    jacobian[:, 1] = -get_log_freqs(xs)
 
     return jacobian
@@ -20,3 +20,12 @@ class IncompatibleSettingsError(SpecParamError):
 
 class NoModelError(SpecParamError):
     """Error for if the model is not fit."""
+
+class BudgetError(FitError):
+    """Error for if the time or evaluation budget of a model fit is exhausted."""
+
+class ParallelError(SpecParamError):
+    """Error for if a task run in parallel fails, for example, from a timeout or worker crash."""
+
+class FitCancelledError(SpecParamError):
+    """Error for if model fitting is cancelled, for example, from an asynchronous fit."""
@@ -10,6 +10,8 @@ from specparam.modes.modes import Modes
 from specparam.results.params import ModelParameters
 from specparam.results.components import ModelComponents
 from specparam.metrics.metrics import Metrics
+from specparam.algorithms.profiling import summarize_profiles
+from specparam.utils.array import make_writeable
 from specparam.utils.checks import check_inds
 from specparam.modutils.errors import NoModelError
 from specparam.modutils.docs import (copy_func_docstring, docs_get_section,
@@ -53,6 +55,9 @@ class Results():
         Manages the model fit parameters.
     metrics : Metrics
         Metrics object with metric definitions.
+    fit_info : dict
+        Information about the model fit process, such as the fit duration, status and profile.
+        Only recorded if profiling, using a fit budget, or observing fits, or if the fit failed.
     """
     # pylint: disable=attribute-defined-outside-init, arguments-differ
 
@@ -216,6 +221,49 @@ class Results():
         return self.metrics.get_metrics(category, measure)
 
 
+    def get_profile(self):
+        """Return the fit profile, with timing information per stage of the model fit.
+
+        Returns
+        -------
+        profile : dict
+            Profile of the model fit, as {stage : {'time' : float, 'nfev' : int}}.
+            Empty if the model fit was not run in profile state.
+        """
+
+        return self.fit_info.get('profile', {})
+
+
+    def get_status(self):
+        """Return the status of the model fit.
+
+        Returns
+        -------
+        status : {'complete', 'partial', 'aperiodic_only', 'failed'} or None
+            Status of the model fit, which is other than 'complete' if the fit failed, or was
+            stopped early due to the fit budget. None if the model has not been fit.
+        """
+
+        return self.fit_info.get('status', 'complete' if self.has_model else None)
+
+
+    @property
+    def _dtype(self):
+        """The data type for storing results, which follows the data of the linked model."""
+
+        return getattr(getattr(self._model, 'data', None), 'dtype', 'float64')
+
+
+    def _cast_model(self):
+        """Cast the model components to the data type for storing results."""
+
+        if self._dtype != 'float64':
+            for attr in ['modeled_spectrum', '_ap_fit', '_peak_fit',
+                         '_spectrum_flat', '_spectrum_peak_rm']:
+                if getattr(self.model, attr) is not None:
+                    setattr(self.model, attr, getattr(self.model, attr).astype(self._dtype))
+
+
     def _reset_results(self, clear_results=False):
         """Set, or reset, results attributes to empty.
 
@@ -229,6 +277,7 @@ class Results():
             self.params.reset()
             self.model.reset()
             self.metrics.reset()
+            self.fit_info = {}
 
 
     def _regenerate_model(self, freqs):
@@ -244,6 +293,7 @@ class Results():
             gen_model(freqs, self.modes.aperiodic, self.params.aperiodic.get_params('fit'),
                       self.modes.periodic, self.params.periodic.get_params('fit'),
                       return_components=True)
+        self._cast_model()
 
 
 @replace_docstring_sections([docs_get_section(Results.__doc__, 'Parameters'),
@@ -260,6 +310,8 @@ class Results2D(Results):
     % copied in from Results
     group_results : list of FitResults
         Results of the model fit for each power spectrum.
+    group_fit_info : list of dict
+        Information about the model fit process, for each power spectrum.
     """
 
     def __init__(self, modes=None, metrics=None, bands=None, model=None):
@@ -299,12 +351,19 @@ class Results2D(Results):
         """
 
         self.group_results = [[]] * length
+        self.group_fit_info = [{}] * length
 
 
     def _get_results(self):
         """Create an alias to SpectralModel.get_results for the group object, for internal use."""
 
-        return super().get_results()
+        results = super().get_results()
+        if self._dtype != 'float64':
+            results = results._replace(**{field : getattr(results, field).astype(self._dtype) \
+                for field in ['aperiodic_fit', 'aperiodic_converted',
+                              'peak_fit', 'peak_converted']})
+
+        return results
 
 
     @property
@@ -425,6 +484,41 @@ class Results2D(Results):
         return get_group_metrics(self.group_results, category, measure)
 
 
+    def get_profile(self, summary=True):
+        """Return fit profiles, with timing information per stage of model fitting.
+
+        Parameters
+        ----------
+        summary : bool, optional, default: True
+            Whether to return a summary across model fits. If False, returns each profile.
+
+        Returns
+        -------
+        profile : dict or list of dict
+            If summary, the mean, 95th percentile and maximum of each measure, per stage.
+            Otherwise, the profile of each model fit.
+            Empty if the model fits were not run in profile state.
+        """
+
+        profiles = [fit_info.get('profile', {}) for fit_info in self.group_fit_info]
+
+        return summarize_profiles(profiles) if summary else profiles
+
+
+    def get_status(self):
+        """Return the status of each model fit.
+
+        Returns
+        -------
+        status : list of str or None
+            Status of each model fit, as {'complete', 'partial', 'aperiodic_only', 'failed'}.
+            None for any power spectra that have not been fit.
+        """
+
+        return [_get_status(result, fit_info) \
+            for result, fit_info in zip(self.group_results, self.group_fit_info)]
+
+
 @replace_docstring_sections([docs_get_section(Results.__doc__, 'Parameters'),
                              docs_get_section(Results2D.__doc__, 'Attributes')])
 class Results2DT(Results2D):
@@ -482,13 +576,14 @@ class Results2DT(Results2D):
 
         super().drop(inds)
         for key in self.time_results.keys():
+            self.time_results[key] = make_writeable(self.time_results[key])
             self.time_results[key][inds] = np.nan
 
 
     def convert_results(self):
         """Convert the model results to be organized across time windows."""
 
-        self.time_results = group_to_dict(self.group_results, self.modes, self.bands)
+        self.time_results = group_to_dict(self.group_results, self.modes, self.bands, self._dtype)
 
 
 @replace_docstring_sections([docs_get_section(Results.__doc__, 'Parameters'),
@@ -505,6 +600,8 @@ class Results3D(Results2DT):
     % copied in from Results2DT
     event_group_results : list of list of FitResults
         Full model results collected across all events and models.
+    event_group_fit_info : list of list of dict
+        Information about the model fit process, collected across all events and models.
     event_time_results : dict
         Results of the model fit across each time window, collected across events.
         Each value in the dictionary stores a model fit parameter, as [n_events, n_time_windows].
@@ -534,6 +631,7 @@ class Results3D(Results2DT):
         """Set, or reset, event results to be empty."""
 
         self.event_group_results = [[]] * length
+        self.event_group_fit_info = [[]] * length
         self.event_time_results = {}
 
 
@@ -585,6 +683,7 @@ class Results3D(Results2DT):
             for wind in winds:
                 self.event_group_results[eind][wind] = null_results
             for key in self.event_time_results:
+                self.event_time_results[key] = make_writeable(self.event_time_results[key])
                 self.event_time_results[key][eind, winds] = np.nan
 
 
@@ -644,8 +743,64 @@ class Results3D(Results2DT):
                     for gres in self.event_group_results]
 
 
+    def get_profile(self, summary=True):
+        """Return fit profiles, with timing information per stage of model fitting.
+
+        Parameters
+        ----------
+        summary : bool, optional, default: True
+            Whether to return a summary across all model fits. If False, returns each profile.
+
+        Returns
+        -------
+        profile : dict or list of list of dict
+            If summary, the mean, 95th percentile and maximum of each measure, per stage.
+            Otherwise, the profile of each model fit, organized as [n_events][n_time_windows].
+            Empty if the model fits were not run in profile state.
+        """
+
+        profiles = [[fit_info.get('profile', {}) for fit_info in gfit_info] \
+            for gfit_info in self.event_group_fit_info]
+
+        return summarize_profiles([profile for eprofiles in profiles for profile in eprofiles]) \
+            if summary else profiles
+
+
+    def get_status(self):
+        """Return the status of each model fit.
+
+        Returns
+        -------
+        status : list of list of str or None
+            Status of each model fit, as {'complete', 'partial', 'aperiodic_only', 'failed'},
+            organized as [n_events][n_time_windows]. None for any that have not been fit.
+        """
+
+        return [[_get_status(result, fit_info) for result, fit_info in zip(gresults, gfit_info)] \
+            for gresults, gfit_info in zip(self.event_group_results, self.event_group_fit_info)]
+
+
     def convert_results(self):
         """Convert the event results to be organized across events and time windows."""
 
         self.event_time_results = event_group_to_dict(\
-            self.event_group_results, self.modes, self.bands)
+            self.event_group_results, self.modes, self.bands, self._dtype)
+
+
+def _get_status(result, fit_info):
+    """Get the status of a model fit, from its results and any recorded fit information.
+
+    Parameters
+    ----------
+    result : FitResults or list
+        Results of the model fit, or an empty list if not fit.
+    fit_info : dict
+        Recorded information about the model fit process.
+
+    Returns
+    -------
+    str or None
+        Status of the model fit, which is 'complete' if fit, without any other recorded status.
+    """
+
+    return fit_info.get('status', 'complete' if isinstance(result, FitResults) else None)
@@ -1,14 +1,21 @@
 """Utilities for object functionality - including running in parallel & progress bars."""
 
+from time import perf_counter
 from functools import partial
-from multiprocessing import Pool, cpu_count
+from collections import deque
+from multiprocessing import Pool, Pipe, Process, cpu_count
+from multiprocessing.connection import wait
 
+import numpy as np
+
+from specparam.modutils.errors import ParallelError
 from specparam.modutils.dependencies import safe_import
 
 ###################################################################################################
 ## PARALLEL
 
-def run_parallel(pfunc, data, n_jobs, progress):
+def run_parallel(pfunc, data, n_jobs, progress, callback=None, timeout=None, retries=0,
+                 costs=None):
     """Run model fitting in parallel.
 
     Parameters
@@ -22,54 +29,304 @@ def run_parallel(pfunc, data, n_jobs, progress):
         1 is no parallelization. -1 uses all available cores.
     progress : {None, 'tqdm', 'tqdm.notebook'}, optional
         Which kind of progress bar to use. If None, no progress bar is used.
+    callback : callable, optional
+        Function to call, in the main process, as each result becomes available, in the order
+        tasks complete. Called as `callback(index, result)`. Not called for any failed tasks.
+    timeout : float, optional
+        Maximum time, in seconds, for each task. Tasks that run longer are stopped.
+    retries : int, optional, default: 0
+        Number of times to retry a task that fails, times out, or whose worker crashes.
+    costs : 1d array, optional
+        Estimated relative cost of each task. If provided, tasks are run longest first.
 
     Returns
     -------
     results : list
-        Results from running model fitting in parallel.
+        Results from running model fitting in parallel, in the same order as the data.
+        If using a timeout or retries, any failed tasks are returned as a ParallelError.
+
+    Notes
+    -----
+    - Each task is sent to the next available worker, such that the remaining work is
+      balanced across workers. Running the most costly tasks first, if costs are provided,
+      avoids costly tasks running last, while other workers are idle.
+    - If a timeout or retries are specified, tasks are run by a set of managed worker
+      processes. Any worker that crashes or is stopped due to a timeout is replaced with
+      a new worker process, and the task is retried, or recorded as failed.
     """
 
     n_jobs = cpu_count() if n_jobs == -1 else n_jobs
+    order = range(len(data)) if costs is None else np.argsort(-np.asarray(costs), kind='stable')
+
+    if timeout is not None or retries:
+        return _run_managed(pfunc, data, n_jobs, progress, callback, timeout, retries, order)
+
     with Pool(processes=n_jobs) as pool:
-        results = list(pbar(pool.imap(pfunc, data), progress, len(data)))
+        results = [None] * len(data)
+        tasks = ((ind, data[ind]) for ind in order)
+        for ind, result in pbar(pool.imap_unordered(partial(_run_task, pfunc), tasks),
+                                progress, len(data)):
+            results[ind] = result
+            if callback:
+                callback(ind, result)
+
+    return results
+
+
+def _run_task(pfunc, task):
+    """Run a task, as an (index, item) pair, returning the index with the result."""
+
+    ind, item = task
+
+    return ind, pfunc(item)
+
+
+def _run_managed(pfunc, data, n_jobs, progress, callback, timeout, retries, order):
+    """Run tasks across managed worker processes, with timeouts and retries.
+
+    Parameters and returns are the same as `run_parallel`, with tasks run in the given order.
+    """
+
+    results = [None] * len(data)
+    attempts = [0] * len(data)
+    pending = deque(int(ind) for ind in order)
+    steps = iter(pbar(range(len(data)), progress, len(data)))
+
+    # Workers are stored as {connection : [process, task index, task start time]}
+    workers = {}
+    n_done = 0
+
+    def finish(ind, result):
+        nonlocal n_done
+        results[ind] = result
+        n_done += 1
+        next(steps, None)
+
+    def fail(ind, error):
+        attempts[ind] += 1
+        if attempts[ind] <= retries:
+            pending.append(ind)
+        else:
+            finish(ind, ParallelError(error))
+
+    def stop(conn):
+        process = workers.pop(conn)[0]
+        if process.is_alive():
+            process.terminate()
+        process.join()
+        conn.close()
+        return process.exitcode
+
+    try:
+
+        while n_done < len(data):
+
+            # Start workers as needed, and send pending tasks to any idle workers
+            idle = [conn for conn, (_, ind, _) in workers.items() if ind is None]
+            while pending and len(idle) < len(pending) and len(workers) < n_jobs:
+                conn, child_conn = Pipe()
+                process = Process(target=_run_worker, args=(pfunc, child_conn), daemon=True)
+                process.start()
+                child_conn.close()
+                workers[conn] = [process, None, None]
+                idle.append(conn)
+            for conn in idle:
+                if not pending:
+                    break
+                ind = pending.popleft()
+                conn.send((ind, data[ind]))
+                workers[conn][1:] = [ind, perf_counter()]
+
+            # Wait for a result, a worker exit, or the next task timeout
+            starts = [start for _, ind, start in workers.values() if ind is not None]
+            wait_time = max(0, min(starts) + timeout - perf_counter()) \
+                if timeout is not None and starts else None
+            sentinels = {workers[conn][0].sentinel : conn for conn in workers}
+            ready = wait(list(workers) + list(sentinels), wait_time)
+
+            # Collect results, and check for any workers that have exited
+            for obj in ready:
+                conn = sentinels.get(obj, obj)
+                if conn not in workers:
+                    continue
+                ind = workers[conn][1]
+                try:
+                    if obj is not conn and not conn.poll():
+                        raise EOFError
+                    _, result, error = conn.recv()
+                except (EOFError, OSError):
+                    exitcode = stop(conn)
+                    if ind is not None:
+                        fail(ind, "Worker process exited unexpectedly, with code {}.".format(\
+                            exitcode))
+                    continue
+                workers[conn][1:] = [None, None]
+                if error:
+                    fail(ind, error)
+                else:
+                    if callback:
+                        callback(ind, result)
+                    finish(ind, result)
+
+            # Stop any workers with tasks that have run past the timeout
+            if timeout is not None:
+                for conn, (_, ind, start) in list(workers.items()):
+                    if ind is not None and perf_counter() - start >= timeout:
+                        stop(conn)
+                        fail(ind, "Task timed out after {} seconds.".format(timeout))
+
+    finally:
+
+        for conn in list(workers):
+            try:
+                conn.send(None)
+            except OSError:
+                pass
+            stop(conn)
 
     return results
 
+
+def _run_worker(pfunc, conn):
+    """Worker process function, which runs tasks received on a connection, until sent None."""
+
+    for ind, item in iter(conn.recv, None):
+        try:
+            output = (ind, pfunc(item), None)
+        except Exception as excp:  # pylint: disable=broad-except
+            output = (ind, None, "Task failed with error: {!r}".format(excp))
+        conn.send(output)
+
 ## GROUP
 
-def run_parallel_group(model, data, n_jobs, progress):
+def run_parallel_group(model, data, n_jobs, progress, callback=None, timeout=None, retries=0):
     """Wrapper function for running in parallel - group model."""
 
     pfunc = partial(_par_fit_group, group=model)
 
-    return run_parallel(pfunc, data, n_jobs, progress)
+    return run_parallel(pfunc, data, n_jobs, progress, callback, timeout, retries,
+                        model.algorithm._get_costs(data))
 
 
 def _par_fit_group(power_spectrum, group):
-    """Function to partialize for running in parallel - group."""
+    """Function to partialize for running in parallel - group.
+
+    Returns the model fit results, and the fit information, for the power spectrum.
+    """
 
     group._pass_through_spectrum(power_spectrum)
     group._fit()
 
-    return group.results._get_results()
+    return group.results._get_results(), group.results.fit_info
 
 ## EVENT
 
-def run_parallel_event(model, data, n_jobs, progress):
-    """Wrapper function for running in parallel - event model."""
+# Default number of parallel tasks per job, when splitting model fits across events into chunks
+CHUNKS_PER_JOB = 4
+
+def run_parallel_event(model, data, n_jobs, progress, callback=None, timeout=None, retries=0,
+                       chunk_size=None):
+    """Wrapper function for running in parallel - event model.
+
+    Model fits are run across the windows of all events, split into chunks of power spectra,
+    with the callback called for each event, once all the model fits of the event are complete.
+    Chunks are built from the data as they are sent to be fit, and progress is tracked per event.
+    Returns the outputs of the model fits for each window of each event, in event order.
+    """
+
+    n_jobs = cpu_count() if n_jobs == -1 else n_jobs
+    n_events, n_windows = len(data), data[0].shape[1]
+    n_spectra = n_events * n_windows
+
+    # Split the power spectra into chunks, of balanced size if a chunk size is not provided
+    n_chunks = int(np.ceil(n_spectra / chunk_size)) if chunk_size else \
+        min(n_spectra, CHUNKS_PER_JOB * n_jobs)
+    sizes = [n_spectra // n_chunks + 1] * (n_spectra % n_chunks) + \
+        [n_spectra // n_chunks] * (n_chunks - n_spectra % n_chunks)
+    starts = np.cumsum([0] + sizes[:-1])
+    chunks = _EventChunks(data, [(start, start + size) for start, size in zip(starts, sizes)])
+
+    costs = None
+    if model.algorithm.get_schedule():
+        costs = np.add.reduceat(np.concatenate(\
+            [model.algorithm._get_costs(spectrogram.T) for spectrogram in data]), starts)
+
+    outputs = [None] * n_spectra
+    n_done = [0] * n_events
+    steps = iter(pbar(range(n_events), progress, n_events))
+
+    def collect(ind, output):
+        for sind, window_output in enumerate(zip(*output), starts[ind]):
+            outputs[sind] = window_output
+            eind = sind // n_windows
+            n_done[eind] += 1
+            if n_done[eind] == n_windows:
+                next(steps, None)
+                if callback:
+                    callback(eind, tuple(map(list, zip(*outputs[eind * n_windows:\
+                                                                 (eind + 1) * n_windows]))))
 
     pfunc = partial(_par_fit_event, model=model)
+    chunk_outputs = run_parallel(pfunc, chunks, n_jobs, None, collect, timeout, retries, costs)
+
+    # Complete progress tracking, for any events with model fits in failed tasks
+    for _ in steps:
+        pass
+
+    for ind, output in enumerate(chunk_outputs):
+        if isinstance(output, ParallelError):
+            outputs[starts[ind]:starts[ind] + sizes[ind]] = [output] * sizes[ind]
+        else:
+            outputs[starts[ind]:starts[ind] + sizes[ind]] = zip(*output)
+
+    return outputs
+
+
+class _EventChunks():
+    """Chunks of power spectra across the windows of a set of events, built when accessed.
+
+    Parameters
+    ----------
+    data : list of 2d array or 3d array
+        Spectrograms, each with shape [n_freqs, n_time_windows].
+    bounds : list of tuple of (int, int)
+        Start and stop indices of each chunk, across the windows of all events, in order.
+    """
+
+    def __init__(self, data, bounds):
+        """Initialize object of event chunks."""
+
+        self.data = data
+        self.bounds = bounds
+        self.n_windows = data[0].shape[1]
+
+
+    def __len__(self):
+        """Define length as the number of chunks."""
 
-    return run_parallel(pfunc, data, n_jobs, progress)
+        return len(self.bounds)
 
 
-def _par_fit_event(spectrogram, model):
-    """Function to partialize for running in parallel - event."""
+    def __getitem__(self, ind):
+        """Get a chunk of power spectra, as an array with shape [n_spectra, n_freqs]."""
+
+        start, stop = self.bounds[ind]
+
+        return np.vstack([self.data[eind][:, max(start - eind * self.n_windows, 0):\
+                                          stop - eind * self.n_windows].T \
+            for eind in range(start // self.n_windows, (stop - 1) // self.n_windows + 1)])
+
+
+def _par_fit_event(power_spectra, model):
+    """Function to partialize for running in parallel - event.
+
+    Returns the model fit results, and the fit information, for each of a chunk of power spectra.
+    """
 
-    model.data.power_spectra = spectrogram.T
+    model.data.power_spectra = power_spectra
     model.fit()
 
-    return model.results.get_results()
+    return model.results.group_results, model.results.group_fit_info
 
 ###################################################################################################
 ## PROGRESS BARS
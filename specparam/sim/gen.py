@@ -2,7 +2,7 @@
 
 import numpy as np
 
-from specparam.utils.checks import check_flat
+from specparam.utils.checks import check_flat, check_rng
 from specparam.modes.modes import check_mode_definition
 
 from specparam.sim.transform import rotate_spectrum
@@ -10,6 +10,9 @@ from specparam.sim.transform import rotate_spectrum
 ###################################################################################################
 ###################################################################################################
 
+# Periodic modes whose functions can be evaluated across multiple peaks with array broadcasting
+BROADCAST_PE_MODES = ['gaussian', 'cauchy']
+
 def gen_freqs(freq_range, freq_res):
     """Generate a frequency vector.
 
@@ -88,33 +91,45 @@ def gen_periodic(freqs, periodic_mode, periodic_params):
     return pe_vals
 
 
-def gen_noise(freqs, nlv):
+def gen_noise(freqs, nlv, rng=None):
     """Generate noise values for a simulated power spectrum.
 
     Parameters
     ----------
     freqs : 1d array
         Frequency vector to create noise values for.
-    nlv : float
+    nlv : float or 1d array
         Noise level to generate.
+        If an array, noise values are generated for multiple spectra, one per noise level.
+    rng : int or np.random.SeedSequence or np.random.Generator, optional
+        Random number generator to use. If None, uses the global numpy random state.
 
     Returns
     -------
-    noise_vals : 1d vector
-        Noise values.
+    noise_vals : 1d or 2d array
+        Noise values, as [n_freqs], or as [n_spectra, n_freqs] if `nlv` is an array.
 
     Notes
     -----
     This approach generates noise as randomly distributed white noise.
     The 'level' of noise is controlled as the scale of the normal distribution.
+    Noise for multiple spectra is drawn in a single call, which draws the same values as
+    successively generating noise for each spectrum.
     """
 
-    noise_vals = np.random.normal(0, nlv, len(freqs))
+    rng = check_rng(rng)
+
+    if np.ndim(nlv) == 0:
+        noise_vals = rng.normal(0, nlv, len(freqs))
+    else:
+        nlv = np.asarray(nlv)
+        noise_vals = rng.normal(0, nlv[:, np.newaxis], (len(nlv), len(freqs)))
 
     return noise_vals
 
 
-def gen_power_vals(freqs, aperiodic_mode, aperiodic_params, periodic_mode, periodic_params, nlv):
+def gen_power_vals(freqs, aperiodic_mode, aperiodic_params, periodic_mode, periodic_params, nlv,
+                   rng=None):
     """Generate power values for a simulated power spectrum.
 
     Parameters
@@ -131,6 +146,8 @@ def gen_power_vals(freqs, aperiodic_mode, aperiodic_params, periodic_mode, perio
         Parameters to create the periodic component of the power spectrum.
     nlv : float
         Noise level to add to generated power spectrum.
+    rng : int or np.random.SeedSequence or np.random.Generator, optional
+        Random number generator to use for the noise. If None, uses the global numpy random state.
 
     Returns
     -------
@@ -147,14 +164,125 @@ def gen_power_vals(freqs, aperiodic_mode, aperiodic_params, periodic_mode, perio
 
     ap_vals = gen_aperiodic(freqs, aperiodic_mode, aperiodic_params)
     pe_vals = gen_periodic(freqs, periodic_mode, periodic_params)
-    noise = gen_noise(freqs, nlv)
+    noise = gen_noise(freqs, nlv, rng)
+
+    powers = np.power(10, ap_vals + pe_vals + noise)
+
+    return powers
+
+
+def gen_group_power_vals(freqs, aperiodic_mode, aperiodic_params,
+                         periodic_mode, periodic_params, nlvs, rng=None):
+    """Generate power values for a group of simulated power spectra.
+
+    Parameters
+    ----------
+    freqs : 1d array
+        Frequency vector to create power values for.
+    aperiodic_mode : Mode or str
+        Which kind of aperiodic component to generate.
+    aperiodic_params : 2d array
+        Parameters to create the aperiodic components, as [n_spectra, n_aperiodic_params].
+    periodic_mode : Mode or str
+        Which kind of periodic component to generate.
+    periodic_params : 2d array
+        Table of peak parameters, as [n_peaks, 1 + n_periodic_params].
+        The first column is the index of the spectrum each peak belongs to.
+    nlvs : 1d array
+        Noise level to add to each generated power spectrum.
+    rng : int or np.random.SeedSequence or np.random.Generator, optional
+        Random number generator to use for the noise. If None, uses the global numpy random state.
+
+    Returns
+    -------
+    powers : 2d array
+        Power values, in linear spacing, as [n_spectra, n_freqs].
+
+    Notes
+    -----
+    This function computes each component for all spectra at once, and should give the same
+    values as calling `gen_power_vals` for each spectrum in turn.
+    """
+
+    ap_vals = gen_group_aperiodic(freqs, aperiodic_mode, aperiodic_params)
+    pe_vals = gen_group_periodic(freqs, periodic_mode, periodic_params, ap_vals.shape[0])
+    noise = gen_noise(freqs, nlvs, rng)
 
     powers = np.power(10, ap_vals + pe_vals + noise)
 
     return powers
 
 
-def gen_rotated_power_vals(freqs, aperiodic_params, periodic_params, nlv, f_rotation):
+def gen_group_aperiodic(freqs, aperiodic_mode, aperiodic_params):
+    """Generate aperiodic values for a group of spectra.
+
+    Parameters
+    ----------
+    freqs : 1d array
+        Frequency vector to create aperiodic components for.
+    aperiodic_mode : Mode or str
+        Which kind of aperiodic component to generate.
+    aperiodic_params : 2d array
+        Parameters that define the aperiodic components, as [n_spectra, n_aperiodic_params].
+
+    Returns
+    -------
+    ap_vals : 2d array
+        Aperiodic values, in log10 spacing, as [n_spectra, n_freqs].
+    """
+
+    ap_mode = check_mode_definition(aperiodic_mode, 'aperiodic')
+    aperiodic_params = np.asarray(aperiodic_params, dtype=float)
+
+    ap_vals = ap_mode.generate(freqs[np.newaxis, :], *aperiodic_params.T[:, :, np.newaxis])
+    ap_vals = np.broadcast_to(ap_vals, (aperiodic_params.shape[0], len(freqs))).copy()
+
+    return ap_vals
+
+
+def gen_group_periodic(freqs, periodic_mode, periodic_params, n_spectra):
+    """Generate periodic values for a group of spectra, from a table of peaks.
+
+    Parameters
+    ----------
+    freqs : 1d array
+        Frequency vector to create peak values for.
+    periodic_mode : Mode or str
+        Which kind of periodic component to generate.
+    periodic_params : 2d array
+        Table of peak parameters, as [n_peaks, 1 + n_periodic_params].
+        The first column is the index of the spectrum each peak belongs to.
+    n_spectra : int
+        The number of spectra to generate periodic values for.
+
+    Returns
+    -------
+    pe_vals : 2d array
+        Peak values, in log10 spacing, as [n_spectra, n_freqs].
+    """
+
+    pe_mode = check_mode_definition(periodic_mode, 'periodic')
+    periodic_params = np.asarray(periodic_params, dtype=float).reshape(-1, 1 + pe_mode.n_params)
+
+    pe_vals = np.zeros([n_spectra, len(freqs)])
+    if not periodic_params.shape[0]:
+        return pe_vals
+
+    inds = periodic_params[:, 0].astype(int)
+    params = periodic_params[:, 1:]
+
+    if pe_mode.name in BROADCAST_PE_MODES:
+        peaks = pe_mode.generate(freqs[np.newaxis, :], *params.T[:, :, np.newaxis])
+    else:
+        peaks = np.array([pe_mode.generate(freqs, *peak) for peak in params])
+
+    # Peaks are added in table order, matching the order they are summed per spectrum
+    np.add.at(pe_vals, inds, peaks)
+
+    return pe_vals
+
+
+def gen_rotated_power_vals(freqs, aperiodic_params, periodic_params, nlv, f_rotation, rng=None):
     """Generate power values for a simulated power spectrum, rotated around a given frequency.
 
     Parameters
@@ -169,6 +297,8 @@ def gen_rotated_power_vals(freqs, aperiodic_params, periodic_params, nlv, f_rota
         Noise level to add to generated power spectrum.
     f_rotation : float
         Frequency value, in Hz, about which rotation is applied, at which power is unchanged.
+    rng : int or np.random.SeedSequence or np.random.Generator, optional
+        Random number generator to use for the noise. If None, uses the global numpy random state.
 
     Returns
     -------
@@ -184,7 +314,7 @@ def gen_rotated_power_vals(freqs, aperiodic_params, periodic_params, nlv, f_rota
     if len(aperiodic_params) == 3:
         raise ValueError('Can only rotate power spectra generated with fixed mode.')
 
-    powers = gen_power_vals(freqs, 'fixed', [0, 0], 'gaussian', periodic_params, nlv)
+    powers = gen_power_vals(freqs, 'fixed', [0, 0], 'gaussian', periodic_params, nlv, rng)
     powers = rotate_spectrum(freqs, powers, aperiodic_params[1], f_rotation)
 
     return powers
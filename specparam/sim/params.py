@@ -6,7 +6,7 @@ import numpy as np
 
 from specparam.data import SimParams
 from specparam.modes.modes import check_mode_definition
-from specparam.utils.checks import check_flat
+from specparam.utils.checks import check_flat, check_rng
 from specparam.modutils.errors import InconsistentDataError
 
 ###################################################################################################
@@ -221,7 +221,7 @@ def param_iter(params):
             return
 
 
-def param_sampler(params, probs=None):
+def param_sampler(params, probs=None, rng=None):
     """Create a generator to sample randomly from possible parameters.
 
     Parameters
@@ -231,6 +231,8 @@ def param_sampler(params, probs=None):
     probs : list of float, optional
         Probabilities with which to sample each parameter option.
         If None, each parameter option is sampled uniformly.
+    rng : int or np.random.SeedSequence or np.random.Generator, optional
+        Random number generator to sample with. If None, uses the global numpy random state.
 
     Yields
     ------
@@ -261,12 +263,14 @@ def param_sampler(params, probs=None):
         if len(inds) != len(probs):
             raise ValueError("The number of options must match the number of probabilities.")
 
+    rng = check_rng(rng)
+
     # While loop allows the generator to be called an arbitrary number of times
     while True:
-        yield params[np.random.choice(inds, p=probs)]
+        yield params[rng.choice(inds, p=probs)]
 
 
-def param_jitter(params, jitters):
+def param_jitter(params, jitters, rng=None):
     """Create a generator that adds jitter to parameter definitions.
 
     Parameters
@@ -276,6 +280,8 @@ def param_jitter(params, jitters):
     jitters : list of lists or list of float
         The scale of the jitter for each parameter.
         Must be the same shape and organization as `params`.
+    rng : int or np.random.SeedSequence or np.random.Generator, optional
+        Random number generator to sample jitter with. If None, uses the global numpy random state.
 
     Yields
     ------
@@ -305,11 +311,13 @@ def param_jitter(params, jitters):
         params = check_flat(params)
         jitters = check_flat(jitters)
 
+    rng = check_rng(rng)
+
     # While loop allows the generator to be called an arbitrary number of times
     while True:
 
         out_params = [None] * len(params)
         for ind, (param, jitter) in enumerate(zip(params, jitters)):
-            out_params[ind] = param + np.random.normal(0, jitter)
+            out_params[ind] = param + rng.normal(0, jitter)
 
         yield out_params
@@ -1,11 +1,19 @@
 """Functions for simulating power spectra."""
 
+from math import ceil
+from functools import partial
+from inspect import isgenerator
+from itertools import islice
+
 import numpy as np
 
-from specparam.utils.checks import check_iter
+from specparam.utils.checks import check_iter, check_flat, check_rng
+from specparam.modes.modes import check_mode_definition
 from specparam.sim.params import collect_sim_params
-from specparam.sim.gen import gen_freqs, gen_power_vals, gen_rotated_power_vals
+from specparam.sim.gen import (gen_freqs, gen_power_vals, gen_rotated_power_vals,
+                               gen_group_power_vals)
 from specparam.sim.transform import compute_rotation_offset
+from specparam.results.utils import run_parallel, pbar
 from specparam.modutils.docs import (docs_get_section, replace_docstring_sections,
                                      docs_replace_param)
 
@@ -13,7 +21,7 @@ from specparam.modutils.docs import (docs_get_section, replace_docstring_section
 ###################################################################################################
 
 def sim_power_spectrum(freq_range, aperiodic_params, periodic_params,
-                       nlv=0.005, freq_res=0.5, f_rotation=None, return_params=False):
+                       nlv=0.005, freq_res=0.5, f_rotation=None, return_params=False, rng=None):
     """Simulate a power spectrum.
 
     Parameters
@@ -40,6 +48,8 @@ def sim_power_spectrum(freq_range, aperiodic_params, periodic_params,
         Can only be used with `powerlaw` aperiodic mode.
     return_params : bool, optional, default: False
         Whether to return the parameters for the simulated spectrum.
+    rng : int or np.random.SeedSequence or np.random.Generator, optional
+        Random number generator to use for the noise. If None, uses the global numpy random state.
 
     Returns
     -------
@@ -92,7 +102,7 @@ def sim_power_spectrum(freq_range, aperiodic_params, periodic_params,
     if f_rotation:
 
         powers = gen_rotated_power_vals(freqs, list(aperiodic_params.values())[0],
-                                        list(periodic_params.values())[0], nlv, f_rotation)
+                                        list(periodic_params.values())[0], nlv, f_rotation, rng)
 
         # The rotation changes the offset, so recalculate it's value & update params
         new_offset = compute_rotation_offset(list(aperiodic_params.values())[0][1], f_rotation)
@@ -101,7 +111,7 @@ def sim_power_spectrum(freq_range, aperiodic_params, periodic_params,
     else:
 
         powers = gen_power_vals(freqs, *list(*aperiodic_params.items()),
-                                *list(*periodic_params.items()), nlv)
+                                *list(*periodic_params.items()), nlv, rng)
 
     if return_params:
         sim_params = collect_sim_params(aperiodic_params, periodic_params, nlv)
@@ -112,7 +122,7 @@ def sim_power_spectrum(freq_range, aperiodic_params, periodic_params,
 
 def sim_group_power_spectra(n_spectra, freq_range, aperiodic_params, periodic_params,
                             nlvs=0.005, freq_res=0.5, f_rotation=None,
-                            return_params=False):
+                            return_params=False, rng=None):
     """Simulate multiple power spectra.
 
     Parameters
@@ -129,7 +139,7 @@ def sim_group_power_spectra(n_spectra, freq_range, aperiodic_params, periodic_pa
         Mode definition and parameters to create the periodic components of the power spectras.
         Should be organized as {mode : params}, where `mode` is a string label for a mode to
         simulate with and `params` (array_like or generator) defines the periodic parameters.
-    nlvs : float or list of float or generator, optional, default: 0.005
+    nlvs : float or array_like of float or generator, optional, default: 0.005
         Noise level to add to generated power spectrum.
     freq_res : float, optional, default: 0.5
         Frequency resolution for the simulated power spectra.
@@ -139,6 +149,8 @@ def sim_group_power_spectra(n_spectra, freq_range, aperiodic_params, periodic_pa
         See additional notes in `sim_power_spectra` on rotating simulated power spectra.
     return_params : bool, optional, default: False
         Whether to return the parameters for the simulated spectra.
+    rng : int or np.random.SeedSequence or np.random.Generator, optional
+        Random number generator to use for the noise. If None, uses the global numpy random state.
 
     Returns
     -------
@@ -158,9 +170,15 @@ def sim_group_power_spectra(n_spectra, freq_range, aperiodic_params, periodic_pa
       If so, these same parameters are used for all spectra.
     - A list of parameters whose length is n_spectra.
       If so, each successive parameter set is such for each successive spectrum.
+    - A 2d array, with shape [n_spectra, n_params].
+      If so, each row is the parameter set for each successive spectrum.
     - A generator object that returns parameters for a power spectrum.
       If so, each spectrum has parameters sampled from the generator.
 
+    If no parameters are given as generators, and no rotation is applied, all spectra are
+    simulated together, computing the aperiodic components from a matrix of parameters,
+    the periodic components from a table of peaks, and drawing all noise values in one call.
+
     Examples
     --------
     Generate 2 power spectra using the same parameters:
@@ -197,25 +215,33 @@ def sim_group_power_spectra(n_spectra, freq_range, aperiodic_params, periodic_pa
     powers = np.zeros([n_spectra, len(freqs)])
     sim_params = [None] * n_spectra
 
-    # Check if inputs are generators, if not, make them into repeat generators
-    ap_params = check_iter(list(aperiodic_params.values())[0], n_spectra)
-    pe_params = check_iter(list(periodic_params.values())[0], n_spectra)
-    nlvs = check_iter(nlvs, n_spectra)
-    f_rots = check_iter(f_rotation, n_spectra)
-
     # Get the mode definitions
     ap_mode = list(aperiodic_params.keys())[0]
     pe_mode = list(periodic_params.keys())[0]
 
+    # If no generators or rotations are used, simulate all power spectra together
+    ap_params = list(aperiodic_params.values())[0]
+    pe_params = list(periodic_params.values())[0]
+    if not f_rotation and not any(isgenerator(el) for el in [ap_params, pe_params, nlvs]):
+        return _sim_group_power_spectra_arr(n_spectra, freqs, ap_mode, ap_params,
+                                            pe_mode, pe_params, nlvs, return_params, rng)
+
+    # Check if inputs are generators, if not, make them into repeat generators
+    ap_params = check_iter(ap_params, n_spectra)
+    pe_params = check_iter(pe_params, n_spectra)
+    nlvs = check_iter(nlvs, n_spectra)
+    f_rots = check_iter(f_rotation, n_spectra)
+    rng = check_rng(rng)
+
     # Simulate power spectra
     for ind, ap, pe, nlv, f_rot in zip(range(n_spectra), ap_params, pe_params, nlvs, f_rots):
 
         if f_rotation:
-            powers[ind, :] = gen_rotated_power_vals(freqs, ap, pe, nlv, f_rot)
+            powers[ind, :] = gen_rotated_power_vals(freqs, ap, pe, nlv, f_rot, rng)
             aperiodic_params = [compute_rotation_offset(ap[1], f_rot), ap[1]]
 
         else:
-            powers[ind, :] = gen_power_vals(freqs, ap_mode, ap, pe_mode, pe, nlv)
+            powers[ind, :] = gen_power_vals(freqs, ap_mode, ap, pe_mode, pe, nlv, rng)
 
         sim_params[ind] = collect_sim_params({ap_mode : ap}, {pe_mode : pe}, nlv)
 
@@ -230,7 +256,7 @@ def sim_group_power_spectra(n_spectra, freq_range, aperiodic_params, periodic_pa
         sim_group_power_spectra.__doc__, 'Parameters'),
         'n_spectra', 'n_windows : int\n        The number of time windows to generate.'))
 def sim_spectrogram(n_windows, freq_range, aperiodic_params, periodic_params,
-                    nlvs=0.005, freq_res=0.5, f_rotation=None, return_params=False):
+                    nlvs=0.005, freq_res=0.5, f_rotation=None, return_params=False, rng=None):
     """Simulate spectrogram.
 
     Parameters
@@ -254,9 +280,157 @@ def sim_spectrogram(n_windows, freq_range, aperiodic_params, periodic_params,
     """
 
     outputs = sim_group_power_spectra(n_windows, freq_range, aperiodic_params, periodic_params,
-                                      nlvs, freq_res, f_rotation, return_params)
+                                      nlvs, freq_res, f_rotation, return_params, rng)
 
     outputs = list(outputs)
     outputs[1] = outputs[1].T
 
     return outputs
+
+
+@replace_docstring_sections(\
+    docs_get_section(sim_group_power_spectra.__doc__, 'Parameters') + '\n' + \
+    """    chunk_size : int, optional, default: 1000
+        The number of power spectra to simulate per chunk.
+    n_jobs : int, optional, default: 1
+        Number of jobs to run in parallel.
+        1 is no parallelization. -1 uses all available cores.
+    progress : {None, 'tqdm', 'tqdm.notebook'}, optional
+        Which kind of progress bar to use. If None, no progress bar is used.""")
+def sim_group_power_spectra_chunked(n_spectra, freq_range, aperiodic_params, periodic_params,
+                                    nlvs=0.005, freq_res=0.5, f_rotation=None,
+                                    return_params=False, rng=None, chunk_size=1000,
+                                    n_jobs=1, progress=None):
+    """Simulate multiple power spectra in chunks, with an independent random stream per chunk.
+
+    Parameters
+    ----------
+    % copied in from `sim_group_power_spectra`
+
+    Returns
+    -------
+    freqs : 1d array
+        Frequency values, in linear spacing.
+    powers : 2d array
+        Matrix of power values, in linear spacing, as [n_power_spectra, n_freqs].
+    sim_params : list of SimParams
+        Definitions of parameters used for each spectrum. Has length of n_spectra.
+        Only returned if `return_params` is True.
+
+    Notes
+    -----
+    - The `rng` input should be an int or a SeedSequence, from which a random stream is
+      spawned for each chunk. If None, fresh entropy is used and outputs are not reproducible.
+    - Parameter generators are sampled in the main process, before spectra are simulated.
+    - The chunks, and therefore the outputs, only depend on `chunk_size` and `rng`,
+      such that outputs are the same regardless of the number of jobs used.
+
+    Examples
+    --------
+    Reproducibly simulate 10000 power spectra, using all available cores:
+
+    >>> freqs, powers = sim_group_power_spectra_chunked(10000, [1, 50], {'fixed' : [0, 2]},
+    ...                                                 {'gaussian' : [10, 0.5, 1]},
+    ...                                                 rng=13, n_jobs=-1)
+    """
+
+    seeds = rng if isinstance(rng, np.random.SeedSequence) else np.random.SeedSequence(rng)
+
+    ap_mode, ap_params = list(aperiodic_params.items())[0]
+    pe_mode, pe_params = list(periodic_params.items())[0]
+
+    # Collect the parameters for each spectrum, so that chunks can be defined from them
+    ap_sets = [list(ap) for ap in _get_param_sets(ap_params, n_spectra)]
+    pe_sets = [list(pe) for pe in _get_param_sets(pe_params, n_spectra)]
+    if isgenerator(nlvs):
+        nlv_sets = list(islice(nlvs, n_spectra))
+    else:
+        nlv_sets = [nlvs] * n_spectra if np.ndim(nlvs) == 0 else list(nlvs)
+
+    n_chunks = ceil(n_spectra / chunk_size)
+    chunks = [(ap_sets[ind * chunk_size:(ind + 1) * chunk_size],
+               pe_sets[ind * chunk_size:(ind + 1) * chunk_size],
+               nlv_sets[ind * chunk_size:(ind + 1) * chunk_size],
+               seed) for ind, seed in enumerate(seeds.spawn(n_chunks))]
+
+    pfunc = partial(_sim_chunk, freq_range=freq_range, ap_mode=ap_mode, pe_mode=pe_mode,
+                    freq_res=freq_res, f_rotation=f_rotation, return_params=return_params)
+
+    if n_jobs == 1:
+        outputs = [pfunc(chunk) for chunk in pbar(chunks, progress, n_chunks)]
+    else:
+        outputs = run_parallel(pfunc, chunks, n_jobs, progress)
+
+    freqs = outputs[0][0]
+    powers = np.vstack([output[1] for output in outputs])
+
+    if return_params:
+        sim_params = [sim_param for output in outputs for sim_param in output[2]]
+        return freqs, powers, sim_params
+    else:
+        return freqs, powers
+
+
+def _sim_chunk(chunk, freq_range, ap_mode, pe_mode, freq_res, f_rotation, return_params):
+    """Function to partialize for simulating a chunk of power spectra, in parallel."""
+
+    ap_sets, pe_sets, nlv_sets, seed = chunk
+    rng = np.random.default_rng(seed)
+
+    if f_rotation:
+        # Parameters are passed as generators, so that each entry is used per spectrum
+        outputs = sim_group_power_spectra(len(ap_sets), freq_range,
+                                          {ap_mode : (ap for ap in ap_sets)},
+                                          {pe_mode : (pe for pe in pe_sets)},
+                                          (nlv for nlv in nlv_sets), freq_res, f_rotation,
+                                          return_params, rng)
+    else:
+        outputs = _sim_group_power_spectra_arr(len(ap_sets), gen_freqs(freq_range, freq_res),
+                                               ap_mode, ap_sets, pe_mode, pe_sets, nlv_sets,
+                                               return_params, rng)
+
+    return outputs
+
+
+def _sim_group_power_spectra_arr(n_spectra, freqs, ap_mode, ap_params,
+                                 pe_mode, pe_params, nlvs, return_params, rng=None):
+    """Simulate a group of power spectra together, from array-like parameter definitions.
+
+    Notes
+    -----
+    This is a helper function for `sim_group_power_spectra`, which organizes aperiodic
+    parameters into a matrix and periodic parameters into a table of peaks, in which the
+    first column is the index of the spectrum that each peak belongs to.
+    """
+
+    ap_sets = _get_param_sets(ap_params, n_spectra)
+    pe_sets = _get_param_sets(pe_params, n_spectra)
+
+    nlv_sets = [nlvs] * n_spectra if np.ndim(nlvs) == 0 else list(nlvs)
+
+    n_pe_params = check_mode_definition(pe_mode, 'periodic').n_params
+    peaks = [np.asarray(check_flat(pe), dtype=float).reshape(-1, n_pe_params) for pe in pe_sets]
+    n_peaks = np.array([len(cpeaks) for cpeaks in peaks])
+    peak_table = np.hstack([np.repeat(np.arange(n_spectra), n_peaks)[:, np.newaxis],
+                            np.vstack(peaks)])
+
+    powers = gen_group_power_vals(freqs, ap_mode, np.array(ap_sets, dtype=float),
+                                  pe_mode, peak_table, np.array(nlv_sets, dtype=float), rng)
+
+    if return_params:
+        sim_params = [collect_sim_params({ap_mode : ap}, {pe_mode : pe}, nlv) \
+            for ap, pe, nlv in zip(ap_sets, pe_sets, nlv_sets)]
+        return freqs, powers, sim_params
+    else:
+        return freqs, powers
+
+
+def _get_param_sets(params, n_spectra):
+    """Get a list of parameter definitions, with one element per spectrum."""
+
+    if isinstance(params, np.ndarray) and params.ndim == 2 and params.shape[0] == n_spectra:
+        param_sets = list(params)
+    else:
+        param_sets = list(islice(check_iter(params, n_spectra), n_spectra))
+
+    return param_sets
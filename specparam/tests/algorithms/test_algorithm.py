@@ -1,5 +1,7 @@
 """Tests for specparam.algorthms.algorithm."""
 
+import numpy as np
+
 from specparam.modes.modes import Modes
 from specparam.algorithms.settings import SettingsDefinition
 
@@ -70,3 +72,71 @@ def test_algorithm_cf_initialize():
     assert len(ap_guess) == algo.modes.aperiodic.n_params
     pe_guess = algo._initialize_guess('periodic')
     assert len(pe_guess) == algo.modes.periodic.n_params
+
+def test_algorithm_profile():
+
+    algo = Algorithm(public_settings={})
+    assert not algo.get_profile()
+
+    func = lambda val : val
+    assert algo._track_func(func) is func
+    with algo._profile('stage'):
+        pass
+
+    algo.set_profile(True)
+    assert algo.get_profile()
+    with algo._profile('stage'):
+        algo._track_func(func)(1)
+    assert algo._profiler.record['stage']['nfev'] == 1
+
+def test_algorithm_budget():
+
+    algo = Algorithm(public_settings={})
+    assert algo.get_budget() == {'max_time' : None, 'max_nfev' : None, 'deadline' : None}
+
+    func = lambda val : val
+    assert algo._track_func(func) is func
+
+    algo.set_budget(max_nfev=10)
+    assert algo.get_budget()['max_nfev'] == 10
+    algo._track_func(func)(1)
+    assert algo._budget.nfev == 1
+
+    with algo._deadline(10):
+        assert algo.get_budget()['deadline']
+        assert algo.get_budget()['max_nfev'] == 10
+    assert algo.get_budget()['deadline'] is None
+
+    algo.set_budget()
+    assert algo._budget is None
+
+def test_algorithm_cache():
+
+    algo = Algorithm(public_settings={})
+    assert not algo.get_cache()
+    assert algo._get_stage_key('item') is None
+
+    algo.set_cache(True)
+    assert algo.get_cache()
+    key = algo._get_stage_key('item')
+
+    func = lambda val : np.array([val])
+    assert algo._run_stage('stage', key, func, 1) == [1]
+    assert algo._run_stage('stage', key, func, 2) == [1]
+    assert algo._run_stage('stage', None, func, 2) == [2]
+
+    algo.set_budget(max_nfev=10)
+    assert algo._get_stage_key('item') is None
+
+def test_algorithm_schedule():
+
+    algo = Algorithm(public_settings={})
+    assert not algo.get_schedule()
+    assert algo._get_costs(np.ones([2, 10])) is None
+
+    algo._estimate_costs = lambda spectra : np.ones(len(spectra))
+    assert algo._get_costs(np.ones([2, 10])) is None
+
+    algo.set_schedule(True)
+    assert algo.get_schedule()
+    assert np.array_equal(algo._get_costs(np.ones([2, 10])), [1, 1])
@@ -0,0 +1,64 @@
+"""Tests for specparam.algorithms.batch."""
+
+import numpy as np
+from scipy.optimize import curve_fit
+
+from specparam.modes.funcs import gaussian_function, lorentzian_function
+from specparam.modes.jacobians import jacobian_gauss
+
+from specparam.algorithms.batch import *
+
+###################################################################################################
+###################################################################################################
+
+def test_batch_eval():
+
+    xs = np.arange(3, 40, 0.5)
+    params = np.array([[10, 0.5, 1], [20, 0.25, 2]])
+
+    ys = batch_eval(gaussian_function, xs, params)
+    assert ys.shape == (2, len(xs))
+    for cys, cparams in zip(ys, params):
+        assert np.allclose(cys, gaussian_function(xs, *cparams))
+
+def test_batch_jacobian():
+
+    xs = np.arange(3, 40, 0.5)
+    params = np.array([[10, 0.5, 1], [20, 0.25, 2]])
+
+    jac = batch_jacobian(gaussian_function, xs, params, jacobian_gauss)
+    jac_fd = batch_jacobian(gaussian_function, xs, params)
+    assert jac.shape == jac_fd.shape == (2, len(xs), 3)
+    assert np.allclose(jac, jac_fd, atol=1e-5)
+
+def test_batch_curve_fit():
+
+    xs = np.arange(3, 40, 0.5)
+    true = np.array([[1, 10, 2], [0.5, 5, 1.5], [1.5, 20, 2.5]])
+    ys = batch_eval(lorentzian_function, xs, true) + \
+        np.random.default_rng(0).normal(0, 0.01, (len(true), len(xs)))
+    bounds = (np.zeros(true.shape), np.full(true.shape, 100))
+
+    params, converged = batch_curve_fit(lorentzian_function, xs, ys, np.ones(true.shape), bounds)
+    assert np.all(converged)
+    for cys, cparams in zip(ys, params):
+        expected, _ = curve_fit(lorentzian_function, xs, cys, p0=np.ones(3), bounds=(0, 100))
+        assert np.allclose(cparams, expected, rtol=1e-3, atol=1e-3)
+
+def test_batch_curve_fit_mask_weights():
+
+    xs = np.arange(3, 40, 0.5)
+    true = np.array([[10, 0.5, 1, 20, 0.3, 2], [12, 0.4, 1.5, 1, 0, 1]])
+    ys = batch_eval(gaussian_function, xs, true)
+
+    # Second peak of second element of the batch is padding, which should be held
+    mask = np.array([[True] * 6, [True] * 3 + [False] * 3])
+    weights = np.ones(ys.shape)
+    weights[:, :10] = 0
+    ys[:, :10] = 100
+
+    params, converged = batch_curve_fit(gaussian_function, xs, ys, true + 0.1 * mask,
+                                        mask=mask, weights=weights, jacobian=jacobian_gauss)
+    assert np.all(converged)
+    assert np.allclose(params[1, 3:], true[1, 3:] + 0.)
+    assert np.allclose(params, true, atol=1e-3)
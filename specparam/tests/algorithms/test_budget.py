@@ -0,0 +1,44 @@
+"""Tests for specparam.algorithms.budget."""
+
+from time import time
+
+from pytest import raises
+
+from specparam.modutils.errors import BudgetError
+
+from specparam.algorithms.budget import *
+
+###################################################################################################
+###################################################################################################
+
+def test_fit_budget():
+
+    budget = FitBudget()
+    assert not budget.exhausted
+    budget.check()
+
+def test_fit_budget_nfev():
+
+    budget = FitBudget(max_nfev=2)
+    func = budget.count(lambda val : val)
+
+    func(1)
+    func(1)
+    assert budget.nfev == 2
+    assert budget.exhausted
+    with raises(BudgetError):
+        func(1)
+
+    budget.start()
+    assert budget.nfev == 0
+    assert not budget.exhausted
+
+def test_fit_budget_time():
+
+    budget = FitBudget(max_time=0)
+    assert budget.exhausted
+    with raises(BudgetError):
+        budget.count(lambda val : val)(1)
+
+    budget = FitBudget(max_time=60, deadline=time() - 1)
+    assert budget.exhausted
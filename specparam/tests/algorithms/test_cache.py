@@ -0,0 +1,46 @@
+"""Tests for specparam.algorithms.cache."""
+
+import numpy as np
+
+from specparam.algorithms.cache import *
+
+###################################################################################################
+###################################################################################################
+
+def test_stage_cache():
+
+    cache = StageCache()
+    key = make_key(np.array([1., 2.]), 'fixed', [0.5, 12])
+
+    assert cache.get('stage', key) is None
+    assert cache.misses['stage'] == 1
+
+    output = np.array([1., 2.])
+    cache.add('stage', key, output)
+    output[0] = 0
+    assert len(cache) == 1
+    assert np.array_equal(cache.get('stage', key), [1., 2.])
+    assert cache.hits['stage'] == 1
+
+    cache.reset()
+    assert len(cache) == 0
+
+def test_stage_cache_max_size():
+
+    cache = StageCache(max_size=2)
+    for ind in range(3):
+        cache.add('stage', make_key(ind), np.array([ind]))
+
+    assert len(cache) == 2
+    assert cache.get('stage', make_key(0)) is None
+    assert cache.get('stage', make_key(2)) is not None
+
+def test_make_key():
+
+    key = make_key(np.array([1., 2.]), 'fixed', [0.5, 12], None)
+    assert isinstance(key, str)
+    assert key == make_key(np.array([1., 2.]), 'fixed', [0.5, 12], None)
+    assert key != make_key(np.array([1., 3.]), 'fixed', [0.5, 12], None)
+    assert key != make_key(np.array([1., 2.]), 'knee', [0.5, 12], None)
+    assert key != make_key(np.array([1., 2.]), 'fixed', [0.5, 10], None)
+    assert make_key([1], 2) != make_key([1, 2])
@@ -19,3 +19,13 @@ def test_estimate_fwhm():
     out = estimate_fwhm(peak, np.argmax(peak), fres)
     assert isinstance(out, float)
     assert np.isclose(out, compute_fwhm(gauss_params[2]), atol=0.5)
+
+def test_estimate_fwhm_sides():
+
+    # Check the FWHM is estimated from the shortest side, with the first index not searched
+    flatspec = np.array([0, 1, 2, 4, 3, 1, 0])
+    assert estimate_fwhm(flatspec, 3, 1.) == 2.
+    assert np.isnan(estimate_fwhm(np.array([0, 3, 4]), 2, 0.5))
+    assert np.isnan(estimate_fwhm(np.array([4, 3, 3]), 0, 0.5))
+    assert estimate_fwhm(np.array([4, 3, 1]), 0, 0.5) == 2.
+    assert estimate_fwhm(np.array([1, 4, 1]), 1, 0.5) == 1.
@@ -0,0 +1,50 @@
+"""Tests for specparam.algorithms.profiling."""
+
+from specparam.algorithms.profiling import *
+
+###################################################################################################
+###################################################################################################
+
+def test_fit_profiler():
+
+    profiler = FitProfiler()
+    assert profiler.record == {}
+
+    func = profiler.count(lambda val : val)
+
+    with profiler.stage('outer'):
+        func(1)
+        with profiler.stage('inner'):
+            func(1)
+            func(1)
+        func(1)
+
+    assert set(profiler.record.keys()) == {'outer', 'inner'}
+    assert profiler.record['outer']['nfev'] == 2
+    assert profiler.record['inner']['nfev'] == 2
+    for stage in profiler.record.values():
+        assert stage['time'] >= 0
+
+    # Evaluations outside of any stage are not recorded
+    func(1)
+    assert sum(stage['nfev'] for stage in profiler.record.values()) == 4
+
+    profiler.reset()
+    assert profiler.record == {}
+
+def test_summarize_profiles():
+
+    profiles = [{'a' : {'time' : 0.1, 'nfev' : 10}, 'b' : {'time' : 0.2, 'nfev' : 5}},
+                {'a' : {'time' : 0.3, 'nfev' : 20}},
+                {}]
+
+    summary = summarize_profiles(profiles)
+    assert set(summary.keys()) == {'a', 'b'}
+    assert summary['a']['n_fits'] == 2
+    assert summary['b']['n_fits'] == 1
+    assert summary['a']['nfev_mean'] == 15
+    assert summary['a']['nfev_max'] == 20
+    for measure in PROFILE_MEASURES:
+        assert measure + '_p95' in summary['a']
+
+    assert summarize_profiles([]) == {}
@@ -38,3 +38,8 @@ def test_settings_definition():
     for label in tdefinitions.keys():
         assert settings_def.make_setting_str(label)
     assert settings_def.make_docstring()
+
+    ModelSettings = settings_def.make_model_settings()
+    assert ModelSettings(a=1, b=2).names == ['a', 'b']
+    assert settings_def.make_model_settings() is ModelSettings
+    assert SettingsDefinition(tdefinitions).make_model_settings() is ModelSettings
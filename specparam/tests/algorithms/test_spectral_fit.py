@@ -1,5 +1,9 @@
 """Tests for specparam.algorthms.spectral_fit."""
 
+import numpy as np
+from pytest import raises
+
+from specparam.models import SpectralModel
 from specparam.models.base import BaseModel
 from specparam.data.data import Data
 from specparam.results.results import Results
@@ -29,3 +33,228 @@ def test_algorithm_inherit(tfm):
     talgo = TestAlgo()
     assert isinstance(talgo.algorithm, Algorithm)
     talgo.fit(*sim_power_spectrum(*default_spectrum_params()))
+
+def test_ap_fit_method():
+
+    # Note: 'knee' mode is checked with a known knee, as without one the knee is poorly constrained
+    for ap_mode, ap_params in [('fixed', [1, 1.5]), ('knee', [1, 10, 2])]:
+
+        xs, ys = sim_power_spectrum([3, 40], {ap_mode : ap_params},
+                                    {'gaussian' : [10, 0.5, 1]}, nlv=0.005, rng=0)
+
+        fits = {}
+        for method in AP_FIT_METHODS:
+            tfm = SpectralModel(aperiodic_mode=ap_mode, ap_fit_method=method, verbose=False)
+            tfm.fit(xs, ys)
+            assert tfm.results.has_model
+            fits[method] = tfm.results.params.aperiodic.params
+
+        assert np.allclose(fits['curve_fit'], fits['varpro'], rtol=0.05, atol=0.05)
+
+def test_ap_fit_method_bounded():
+
+    xs, ys = sim_power_spectrum([3, 40], {'fixed' : [1, 1.5]}, {'gaussian' : [10, 0.5, 1]},
+                                nlv=0.005, rng=0)
+
+    tfm = SpectralModel(ap_fit_method='varpro', ap_bounds=((-10, 0), (0.5, 10)), verbose=False)
+    tfm.fit(xs, ys)
+    assert tfm.results.params.aperiodic.params[0] == 0.5
+
+    with raises(ValueError):
+        SpectralModel(ap_fit_method='not_a_method')
+
+def test_pe_fit_method():
+
+    for pe_mode in ['gaussian', 'cauchy']:
+
+        xs, ys = sim_power_spectrum([3, 40], {'fixed' : [1, 1.5]},
+                                    {pe_mode : [[10, 0.5, 1], [20, 0.3, 2], [30, 0.4, 1.5]]},
+                                    nlv=0.005, rng=0)
+
+        fits = {}
+        for method in PE_FIT_METHODS:
+            tfm = SpectralModel(periodic_mode=pe_mode, pe_fit_method=method, verbose=False)
+            tfm.fit(xs, ys)
+            assert tfm.results.has_model
+            fits[method] = tfm.results.params.periodic.params
+
+        assert fits['curve_fit'].shape == fits['varpro'].shape
+        assert np.allclose(fits['curve_fit'], fits['varpro'], rtol=0.05, atol=0.05)
+
+    with raises(ValueError):
+        SpectralModel(pe_fit_method='not_a_method')
+
+def test_get_peak_guess():
+
+    peaks = [[10, 0.5, 1], [20, 0.3, 2], [30, 0.4, 1.5]]
+    for pe_mode in ['gaussian', 'cauchy']:
+
+        xs, ys = sim_power_spectrum([3, 40], {'fixed' : [0, 0]}, {pe_mode : peaks},
+                                    nlv=0.005, rng=0)
+
+        tfm = SpectralModel(periodic_mode=pe_mode, verbose=False)
+        tfm.add_data(xs, ys)
+        guess = tfm.algorithm._get_peak_guess(ys - np.mean(ys[-10:]))
+        assert np.allclose(guess[:, 0], [peak[0] for peak in peaks], atol=0.5)
+
+        tfm = SpectralModel(periodic_mode=pe_mode, max_n_peaks=2, verbose=False)
+        tfm.add_data(xs, ys)
+        assert len(tfm.algorithm._get_peak_guess(ys)) == 2
+
+def test_drop_peaks_batch():
+
+    tfm = SpectralModel(verbose=False)
+    freqs = np.arange(3, 40.5, 0.5)
+    tfm.add_data(freqs, np.ones(len(freqs)))
+
+    guesses = [np.array([[3.5, 0.5, 1], [10, 0.5, 1], [11, 0.4, 1], [20, 0.3, 2]]),
+               np.array([[30, 0.2, 2], [25, 0.3, 2]]),
+               np.empty([0, 3])]
+    n_peaks = np.array([len(guess) for guess in guesses])
+    padded = np.zeros([len(guesses), max(n_peaks), 3])
+    for ind, guess in enumerate(guesses):
+        padded[ind, :len(guess)] = guess
+
+    for label in ['cf', 'overlap']:
+        outs, n_outs = getattr(tfm.algorithm, '_batch_drop_peak_' + label)(padded, n_peaks)
+        for guess, out, n_out in zip(guesses, outs, n_outs):
+            expected = getattr(tfm.algorithm, '_drop_peak_' + label)(guess)
+            assert np.array_equal(out[:n_out], expected)
+            assert not np.any(out[n_out:])
+
+    assert len(tfm.algorithm._drop_peak_cf(guesses[0])) == 3
+    assert len(tfm.algorithm._drop_peak_overlap(guesses[0])) == 3
+
+def test_decimation():
+
+    xs, ys = sim_power_spectrum([1, 100], {'fixed' : [1, 1.5]},
+                                {'gaussian' : [[10, 0.5, 1.5], [30, 0.3, 2.5]]},
+                                nlv=0.005, freq_res=0.1, rng=0)
+
+    tfm1 = SpectralModel(peak_width_limits=[2, 8], verbose=False)
+    tfm1.fit(xs, ys)
+
+    tfm4 = SpectralModel(peak_width_limits=[2, 8], decimation=4, verbose=False)
+    tfm4.add_data(xs, ys)
+    assert tfm4.algorithm._check_coarse()
+    coarse_data = tfm4.algorithm._get_coarse_data()
+    assert len(coarse_data.freqs) == len(xs) // 4
+    assert coarse_data.freq_res == 4 * tfm4.data.freq_res
+    tfm4.fit()
+
+    assert tfm4.results.has_model
+    assert np.allclose(tfm4.results.params.aperiodic.params, [1, 1.5], atol=0.05)
+    assert np.allclose(tfm4.results.params.periodic.params[:, 0], [10, 30], atol=0.5)
+
+    # Check fallback to fitting at full resolution, if decimation is too coarse for peak widths
+    tfm20 = SpectralModel(peak_width_limits=[2, 8], decimation=20, verbose=False)
+    tfm20.add_data(xs, ys)
+    assert not tfm20.algorithm._check_coarse()
+    tfm20.fit()
+    assert np.array_equal(tfm20.results.params.periodic.params,
+                          tfm1.results.params.periodic.params)
+
+def test_stage_cache():
+
+    xs, ys = sim_power_spectrum(*default_spectrum_params(), nlv=0.01, rng=0)
+
+    tfm0 = SpectralModel(max_n_peaks=1, verbose=False)
+    tfm0.fit(xs, ys)
+
+    tfm = SpectralModel(verbose=False, cache=True)
+    tfm.fit(xs, ys)
+    assert tfm.algorithm._cache.misses == {'robust_ap_fit' : 1, 'fit_peak_guess' : 1,
+                                           'simple_ap_fit' : 1}
+    n_peaks = len(tfm.results.params.periodic.params)
+
+    # Changing a peak setting, without changing the peak guesses, should re-use all stages
+    tfm.algorithm.settings.max_n_peaks = n_peaks
+    tfm.fit(xs, ys)
+    assert tfm.algorithm._cache.hits == {'robust_ap_fit' : 1, 'fit_peak_guess' : 1,
+                                         'simple_ap_fit' : 1}
+
+    # Changing a peak setting should re-run only the peak fits & final aperiodic fit
+    tfm.algorithm.settings.max_n_peaks = 1
+    tfm.fit(xs, ys)
+    assert tfm.algorithm._cache.hits['robust_ap_fit'] == 2
+    assert tfm.algorithm._cache.misses['fit_peak_guess'] == 2
+    assert np.array_equal(tfm.results.params.periodic.params, tfm0.results.params.periodic.params)
+    assert np.array_equal(tfm.results.params.aperiodic.params, tfm0.results.params.aperiodic.params)
+
+    # Changing an aperiodic setting should re-run all stages
+    tfm.algorithm._settings.ap_percentile_thresh = 0.05
+    tfm.fit(xs, ys)
+    assert tfm.algorithm._cache.misses['robust_ap_fit'] == 2
+
+def _peak_guess_loop(algo, flatspec):
+    """Reference implementation of the search for peak guesses, as a simple loop."""
+
+    inds = algo.modes.periodic.params.indices
+    flat_iter = np.copy(flatspec)
+    guess = np.empty([0, algo.modes.periodic.n_params])
+
+    while len(guess) < algo.settings.max_n_peaks:
+
+        max_ind = np.argmax(flat_iter)
+        max_height = flat_iter[max_ind]
+        if max_height <= algo.settings.peak_threshold * np.std(flat_iter):
+            break
+        if not max_height > algo.settings.min_peak_height:
+            break
+
+        half_height = 0.5 * flat_iter[max_ind]
+        le_ind = next((val for val in range(max_ind - 1, 0, -1) \
+                      if flat_iter[val] <= half_height), None)
+        ri_ind = next((val for val in range(max_ind + 1, len(flat_iter), 1) \
+                      if flat_iter[val] <= half_height), None)
+        sides = [abs(ind - max_ind) for ind in [le_ind, ri_ind] if ind is not None]
+        guess_std = compute_gauss_std(min(sides) * 2 * algo.data.freq_res) if sides else \
+            np.mean(algo.settings.peak_width_limits)
+        if guess_std < algo.settings.peak_width_limits[0] / 2:
+            guess_std = algo.settings.peak_width_limits[0] / 2
+        if guess_std > algo.settings.peak_width_limits[1] / 2:
+            guess_std = algo.settings.peak_width_limits[0] / 2
+
+        cur_guess = [0] * algo.modes.periodic.n_params
+        cur_guess[inds['cf']] = algo.data.freqs[max_ind]
+        cur_guess[inds['pw']] = max_height
+        cur_guess[inds['bw']] = guess_std
+        guess = np.vstack((guess, cur_guess))
+        flat_iter = flat_iter - algo.modes.periodic.generate(algo.data.freqs, *cur_guess)
+
+    return algo._drop_peak_overlap(algo._drop_peak_cf(guess))
+
+def test_get_peak_guess():
+
+    peaks = [[cf, 0.4, 1.5] for cf in range(6, 90, 6)]
+    for periodic_mode in ['gaussian', 'cauchy']:
+        for seed in range(5):
+            xs, ys = sim_power_spectrum([1, 100], {'fixed' : [1, 1.5]}, {'gaussian' : peaks},
+                                        nlv=0.1, freq_res=0.25, rng=seed)
+            tfm = SpectralModel(periodic_mode=periodic_mode, peak_width_limits=[1, 8],
+                                peak_threshold=1., verbose=False)
+            tfm.add_data(xs, ys)
+            flatspec = tfm.data.power_spectrum - (1 - 1.5 * np.log10(xs))
+
+            guess = tfm.algorithm._get_peak_guess(flatspec)
+            assert len(guess) > 5
+            assert np.array_equal(guess, _peak_guess_loop(tfm.algorithm, flatspec))
+
+def test_estimate_costs():
+
+    xs, ys1 = sim_power_spectrum([3, 40], {'fixed' : [1, 1.5]}, {'gaussian' : [10, 0.5, 1]},
+                                 nlv=0.01, rng=0)
+    _, ys3 = sim_power_spectrum([3, 40], {'fixed' : [1, 1.5]},
+                                {'gaussian' : [[6, 0.4, 1], [18, 0.5, 2], [32, 0.4, 2]]},
+                                nlv=0.01, rng=0)
+    ys_nan = np.copy(ys1)
+    ys_nan[0] = np.nan
+
+    tfm = SpectralModel(verbose=False)
+    tfm.add_data(xs, ys1)
+    costs = tfm.algorithm._estimate_costs(np.log10(np.array([ys1, ys3, ys_nan])))
+    assert costs[1] > costs[0] > costs[2] == 1
+
+    tfm = SpectralModel(periodic_mode='skewed_gaussian', verbose=False)
+    tfm.add_data(xs, ys1)
+    assert tfm.algorithm._estimate_costs(tfm.data.power_spectrum[None, :]) is None
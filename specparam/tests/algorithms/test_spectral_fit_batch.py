@@ -0,0 +1,54 @@
+"""Tests for specparam.algorithms.spectral_fit_batch."""
+
+import numpy as np
+
+from specparam.models import SpectralGroupModel
+from specparam.sim import sim_group_power_spectra
+from specparam.algorithms.batch import batch_eval
+
+from specparam.algorithms.spectral_fit_batch import *
+
+###################################################################################################
+###################################################################################################
+
+def test_spectral_fit_batch_group():
+
+    xs, ys = sim_group_power_spectra(5, [3, 40], {'fixed' : [1, 1.5]},
+                                     {'gaussian' : [[10, 0.5, 1], [20, 0.3, 2]]},
+                                     nlvs=0.01, rng=0)
+
+    fgs = {}
+    for algorithm in ['spectral_fit', 'spectral_fit_batch']:
+        fgs[algorithm] = SpectralGroupModel(algorithm=algorithm, verbose=False)
+        fgs[algorithm].fit(xs, ys)
+
+    assert set(fgs['spectral_fit_batch'].results.get_status()) == {'complete'}
+    for component in ['aperiodic', 'periodic']:
+        params = [fg.results.get_params(component) for fg in fgs.values()]
+        assert params[0].shape == params[1].shape
+        assert np.allclose(params[0], params[1], rtol=1e-3, atol=1e-3)
+
+def test_spectral_fit_batch_peak_guess():
+
+    xs, ys = sim_group_power_spectra(10, [3, 40], {'fixed' : [1, 1.5]},
+                                     {'gaussian' : [[10, 0.5, 1], [12, 0.3, 1], [38, 0.4, 2]]},
+                                     nlvs=0.05, rng=0)
+
+    fg = SpectralGroupModel(algorithm='spectral_fit_batch', verbose=False)
+    fg.add_data(xs, ys)
+    ap_params, _ = fg.algorithm._batch_ap_fit(fg.data.power_spectra)
+    flatspecs = fg.data.power_spectra - \
+        batch_eval(fg.modes.aperiodic.func, fg.data.freqs, ap_params)
+
+    # Check batch search and drop rules give the same guesses as for each spectrum individually
+    guess, n_peaks = fg.algorithm._batch_peak_guess(flatspecs)
+    guess, n_peaks = fg.algorithm._batch_drop_peak_cf(guess, n_peaks)
+    guess, n_peaks = fg.algorithm._batch_drop_peak_overlap(guess, n_peaks)
+    assert guess.shape[0] == len(n_peaks) == len(flatspecs)
+    assert np.any(n_peaks)
+    for flatspec, cguess, cn_peaks in zip(flatspecs, guess, n_peaks):
+        expected = fg.algorithm._get_peak_guess(flatspec)
+        assert len(expected) == cn_peaks
+        if cn_peaks:
+            assert np.array_equal(cguess[:cn_peaks], expected)
+            assert np.all(cguess[cn_peaks:] == 0)
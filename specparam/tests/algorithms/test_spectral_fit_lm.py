@@ -0,0 +1,44 @@
+"""Tests for specparam.algorithms.spectral_fit_lm."""
+
+import numpy as np
+
+from specparam.models import SpectralModel, SpectralGroupModel
+from specparam.sim import sim_power_spectrum, sim_group_power_spectra
+
+from specparam.algorithms.spectral_fit_lm import *
+
+###################################################################################################
+###################################################################################################
+
+def test_spectral_fit_lm_group():
+
+    for ap_mode, ap_params in [('fixed', [1, 1.5]), ('knee', [1, 10, 2])]:
+
+        xs, ys = sim_group_power_spectra(5, [3, 40], {ap_mode : ap_params},
+                                         {'gaussian' : [[10, 0.5, 1], [20, 0.3, 2]]},
+                                         nlvs=0.005, rng=0)
+
+        fgs = {}
+        for algorithm in ['spectral_fit', 'spectral_fit_lm']:
+            fgs[algorithm] = SpectralGroupModel(aperiodic_mode=ap_mode, algorithm=algorithm,
+                                                max_n_peaks=4, verbose=False)
+            fgs[algorithm].fit(xs, ys)
+
+        assert set(fgs['spectral_fit_lm'].results.get_status()) == {'complete'}
+        for component in ['aperiodic', 'periodic']:
+            params = [fg.results.get_params(component) for fg in fgs.values()]
+            assert params[0].shape == params[1].shape
+            assert np.allclose(params[0], params[1], rtol=0.01, atol=0.01)
+
+def test_spectral_fit_lm_model():
+
+    xs, ys = sim_power_spectrum([3, 40], {'fixed' : [1, 1.5]}, {'gaussian' : [10, 0.5, 1]},
+                                nlv=0.005, rng=0)
+
+    # Individual model fits, with no batch to use, use the spectral_fit procedure
+    fms = [SpectralModel(algorithm=algorithm, verbose=False) \
+        for algorithm in ['spectral_fit', 'spectral_fit_lm']]
+    for fm in fms:
+        fm.fit(xs, ys)
+    assert np.array_equal(fms[0].results.params.aperiodic.params,
+                          fms[1].results.params.aperiodic.params)
@@ -1,5 +1,7 @@
 """Tests for specparam.data.data."""
 
+from pytest import raises
+
 from specparam.data import SpectrumMetaData, ModelChecks
 
 from specparam.tests.tutils import plot_test
@@ -27,6 +29,7 @@ def test_data_add_data():
     tdata.add_data(freqs, pows)
     assert tdata.has_data
     assert tdata.n_freqs == len(freqs)
+    assert tdata.grid.freqs is tdata.freqs
     tdata.print()
 
 def test_data_meta_data():
@@ -58,6 +61,28 @@ def test_data_get_set_checks(tdata):
     assert tdata.checks['freqs'] == tchecks2.check_freqs == True
     assert tdata.checks['data'] == tchecks2.check_data == True
 
+def test_data_set_dtype():
+
+    tdata = Data()
+    tdata.set_dtype('float32')
+    tdata.add_data(np.array([1., 2., 3.]), np.array([10., 10., 10.]))
+    assert tdata.freqs.dtype == 'float64'
+    assert tdata.power_spectrum.dtype == 'float32'
+
+    with raises(ValueError):
+        tdata.set_dtype('float16')
+
+def test_data_set_dtype_small_powers():
+
+    tdata64 = Data()
+    tdata64.add_data(np.array([1., 2., 3.]), np.array([1e-46, 2e-46, 3e-46]))
+
+    tdata32 = Data()
+    tdata32.set_dtype('float32')
+    tdata32.add_data(np.array([1., 2., 3.]), np.array([1e-46, 2e-46, 3e-46]))
+    assert tdata32.power_spectrum.dtype == 'float32'
+    assert np.allclose(tdata32.power_spectrum, tdata64.power_spectrum)
+
 @plot_test
 def test_data_plot(tdata, skip_if_no_mpl):
 
@@ -81,6 +106,22 @@ def test_data2d_add_data():
     assert tdata2d.has_data
     assert tdata2d.n_spectra == len(pows)
 
+def test_data2d_get_unique():
+
+    tdata2d = Data2D()
+    assert not tdata2d.dedup
+    tdata2d.set_dedup(True)
+    assert tdata2d.dedup
+
+    freqs = np.array([1, 2, 3])
+    pows = np.array([[10, 10, 10], [20, 20, 20], [10, 10, 10], [30, 30, 30], [20, 20, 20]])
+    tdata2d.add_data(freqs, pows)
+
+    unique_inds, inverse = tdata2d.get_unique()
+    assert np.array_equal(unique_inds, [0, 1, 3])
+    assert np.array_equal(inverse, [0, 1, 0, 2, 1])
+    assert np.array_equal(tdata2d.power_spectra[unique_inds][inverse], tdata2d.power_spectra)
+
 @plot_test
 def test_data2d_plot(tdata2d, skip_if_no_mpl):
 
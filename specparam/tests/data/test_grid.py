@@ -0,0 +1,38 @@
+"""Tests for specparam.data.grid."""
+
+from copy import deepcopy
+
+import numpy as np
+
+from specparam.modes.funcs import powerlaw_function
+
+from specparam.data.grid import *
+
+###################################################################################################
+###################################################################################################
+
+def test_freq_grid():
+
+    freqs = np.arange(1, 10.5, 0.5)
+    grid = FreqGrid(freqs)
+    assert np.array_equal(grid.log_freqs, np.log10(freqs))
+    assert grid.log_freqs is grid.log_freqs
+
+def test_get_grid():
+
+    freqs = np.arange(1, 10.5, 0.5)
+    grid = FreqGrid(freqs)
+    assert get_grid(freqs) is grid
+    assert get_grid(freqs.copy()) is None
+
+    grid_copy = deepcopy(grid)
+    assert get_grid(grid_copy.freqs) is grid_copy
+
+def test_get_log_freqs():
+
+    freqs = np.arange(1, 10.5, 0.5)
+    grid = FreqGrid(freqs)
+    assert get_log_freqs(freqs) is grid.log_freqs
+    assert np.array_equal(get_log_freqs(freqs.copy()), np.log10(freqs))
+
+    assert np.allclose(powerlaw_function(freqs, 1, 1.5), powerlaw_function(freqs.copy(), 1, 1.5))
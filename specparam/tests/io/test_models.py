@@ -267,3 +267,22 @@ def test_load_event(tfe):
     assert dir(cfe.data) == dir(ntfe.data)
     assert dir(cfe.results) == dir(ntfe.results)
     assert dir(cfe.results.params) == dir(ntfe.results.params)
+
+def test_save_load_dtype(tfg):
+
+    ntfg = tfg.copy()
+    ntfg.data.set_dtype('float32')
+    ntfg.data.power_spectra = ntfg.data.power_spectra.astype('float32')
+
+    save_group(ntfg, 'test_group_dtype', TEST_DATA_PATH, False, True, True, True)
+    ltfg = load_group('test_group_dtype', TEST_DATA_PATH)
+    assert ltfg.data.dtype == 'float32'
+    assert ltfg.data.power_spectra.dtype == 'float32'
+    assert ltfg.results.group_results[0].aperiodic_fit.dtype == 'float32'
+
+    ntfm = ntfg.get_model(0, regenerate=True)
+    save_model(ntfm, 'test_model_dtype', TEST_DATA_PATH, False, True, True, True)
+    ltfm = load_model('test_model_dtype', TEST_DATA_PATH)
+    assert ltfm.data.dtype == 'float32'
+    assert ltfm.data.power_spectrum.dtype == 'float32'
+    assert ltfm.results.model.modeled_spectrum.dtype == 'float32'
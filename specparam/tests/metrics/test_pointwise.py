@@ -1,5 +1,7 @@
 """Test functions for specparam.metrics.pointwise."""
 
+from pytest import raises
+
 from specparam.metrics.pointwise import *
 
 ###################################################################################################
@@ -20,6 +22,20 @@ def test_compute_pointwise_error_group(tfg):
     errs = compute_pointwise_error_group(tfg, False, True)
     assert np.all(errs)
 
+def test_compute_pointwise_error_group_null(tfg):
+
+    ntfg = tfg.copy()
+    ntfg.results.drop([1])
+
+    errs = compute_pointwise_error_group(ntfg, False, True)
+    assert np.all(np.isnan(errs[1]))
+    assert not np.any(np.isnan(np.delete(errs, 1, 0)))
+
+    stats = compute_pointwise_error_stats(ntfg)
+    assert stats.count == len(tfg.results) - 1
+    assert np.allclose(stats.mean, np.nanmean(errs, 0))
+    assert np.allclose(stats.std, np.nanstd(errs, 0))
+
 def test_compute_pointwise_error_group_plt(tfg, skip_if_no_mpl):
     """Run a separate test to run with plot pass-through."""
 
@@ -32,3 +48,80 @@ def test_compute_pointwise_error_arr():
 
     errs = compute_pointwise_error_arr(d1, d2)
     assert np.array_equal(errs, np.array([1, 1, 1, 1, 1]))
+
+def test_pointwise_error_accumulator():
+
+    errors = np.abs(np.random.randn(50, 10))
+
+    acc = PointwiseErrorAccumulator(10, quantiles=[0.5], error_range=(0, 5))
+    for chunk in np.array_split(errors, 7):
+        acc.update(chunk)
+
+    assert acc.count == 50
+    assert np.allclose(acc.mean, errors.mean(0))
+    assert np.allclose(acc.std, errors.std(0))
+    assert np.allclose(acc.max, errors.max(0))
+    assert np.allclose(acc.get_quantiles()[0], np.median(errors, 0), atol=0.1)
+
+    acc1 = PointwiseErrorAccumulator(10)
+    acc1.update(errors[:20])
+    acc2 = PointwiseErrorAccumulator(10)
+    acc2.update(errors[20:])
+    acc1.merge(acc2)
+    assert np.allclose(acc1.mean, errors.mean(0))
+    assert np.allclose(acc1.var, errors.var(0))
+
+def test_pointwise_error_accumulator_range():
+
+    # Check errors above the initial range, and across orders of magnitude, are not clipped
+    errors = np.abs(np.random.randn(200, 10)) * np.logspace(-1, 2, 10)
+    quantiles = [0.1, 0.5, 0.9, 1.]
+
+    # Compute exact quantiles as the first sorted value with at least the quantile of values at
+    #   or below it, matching how the sketch estimates quantiles (inverse of the empirical CDF)
+    sorted_errors = np.sort(errors, 0)
+    exact = sorted_errors[np.maximum(np.ceil(np.array(quantiles) * len(errors)) - 1, 0).astype(int)]
+
+    for error_range in [None, (0, 1)]:
+        acc = PointwiseErrorAccumulator(10, quantiles=quantiles, error_range=error_range)
+        for chunk in np.array_split(errors, 7):
+            acc.update(chunk)
+        assert acc._edges[-1] >= errors.max()
+        assert np.all(np.abs(acc.get_quantiles() - exact) <= acc._edges[1])
+
+    # Check merging accumulators with different ranges
+    acc1 = PointwiseErrorAccumulator(10, quantiles=quantiles)
+    acc1.update(errors[:100] / 100)
+    acc2 = PointwiseErrorAccumulator(10, quantiles=quantiles)
+    acc2.update(errors[100:])
+    acc1.merge(acc2)
+    assert acc1._counts.sum() == errors.size
+    assert np.all(np.abs(acc1.get_quantiles()[-1] - errors[100:].max(0)) <= acc1._edges[1])
+
+    with raises(ValueError):
+        acc3 = PointwiseErrorAccumulator(10, quantiles=quantiles, error_range=(0, 3))
+        acc3.update(errors)
+        acc3.merge(acc1)
+
+def test_compute_pointwise_error_stats(tfg):
+
+    errs = compute_pointwise_error_group(tfg, False, True)
+
+    stats = compute_pointwise_error_stats(tfg, chunk_size=2)
+    assert stats.count == len(tfg.results)
+    assert np.allclose(stats.mean, errs.mean(0))
+    assert np.allclose(stats.std, errs.std(0))
+
+    # Check incremental updates, including skipping entries without results
+    ntfg = tfg.copy()
+    ntfg.results.group_results[1:] = [[]] * (len(tfg.results) - 1)
+    stats = compute_pointwise_error_stats(ntfg)
+    assert stats.count == 1
+    stats = compute_pointwise_error_stats(tfg, inds=range(1, len(tfg.results)), accumulator=stats)
+    assert np.allclose(stats.mean, errs.mean(0))
+
+def test_compute_pointwise_error_stats_event(tfe):
+
+    stats = compute_pointwise_error_stats(tfe, quantiles=[0.25, 0.75])
+    assert stats.count == tfe.data.n_events * tfe.data.n_time_windows
+    assert stats.get_quantiles().shape == (2, len(tfe.data.freqs))
@@ -16,7 +16,7 @@ from specparam.modutils.dependencies import safe_import
 pd = safe_import('pandas')
 
 from specparam.tests.tsettings import TEST_DATA_PATH
-from specparam.tests.tdata import default_group_params
+from specparam.tests.tdata import default_group_params, default_spectrum_params
 from specparam.tests.tutils import plot_test
 
 from specparam.models.event import *
@@ -60,6 +60,18 @@ def test_event_fit():
         assert np.all(results[key])
         assert results[key].shape == (len(ys), n_windows)
 
+def test_event_fit_float32():
+
+    # Use fixed parameters, as large offsets from sampled parameters overflow float32
+    xs, ys = sim_spectrogram(3, [3, 50], {'fixed' : [1, 1.5]}, {'gaussian' : [10, 0.5, 2]})
+
+    tfe = SpectralTimeEventModel(verbose=False)
+    tfe.data.set_dtype('float32')
+    tfe.fit(xs, [ys, ys])
+    assert tfe.data.spectrograms.dtype == 'float32'
+    for values in tfe.results.get_results().values():
+        assert values.dtype == 'float32'
+
 def test_event_fit_par():
     """Test group fit, running in parallel."""
 
@@ -76,6 +88,98 @@ def test_event_fit_par():
         assert np.all(results[key])
         assert results[key].shape == (len(ys), n_windows)
 
+def test_event_fit_par_chunks():
+    """Test event fit in parallel, across chunk sizes."""
+
+    n_windows = 3
+    xs, ys = sim_spectrogram(n_windows, *default_group_params())
+    ys = [ys, ys, ys]
+
+    tfe = SpectralTimeEventModel(verbose=False)
+    tfe.fit(xs, ys)
+    expected = tfe.results.get_results()
+
+    for chunk_size in [None, 1, 2, n_windows]:
+        tfe.fit(xs, ys, n_jobs=2, chunk_size=chunk_size)
+        assert len(tfe.results.event_group_results) == len(ys)
+        assert all(len(eresults) == n_windows for eresults in tfe.results.event_group_results)
+        results = tfe.results.get_results()
+        for key in expected:
+            assert np.allclose(results[key], expected[key], equal_nan=True)
+
+def test_event_fit_par_progress(capsys, skip_if_no_tqdm):
+    """Test event fit in parallel, with progress tracked per event."""
+
+    xs, ys = sim_spectrogram(3, *default_group_params())
+    ys = [ys, ys, ys]
+
+    tfe = SpectralTimeEventModel(verbose=False)
+    tfe.fit(xs, ys, n_jobs=2, progress='tqdm', chunk_size=2)
+    assert '{0}/{0}'.format(len(ys)) in capsys.readouterr().err
+
+def test_event_fit_par_private_settings():
+    """Test event fit in parallel matches fitting linearly, with non-default private settings."""
+
+    xs, ys = sim_spectrogram(3, [1, 100], {'fixed' : [1, 1.5]},
+                             {'gaussian' : [[10, 0.5, 1.5], [30, 0.3, 2.5]]},
+                             nlvs=0.005, freq_res=0.1)
+    ys = [ys, ys]
+
+    tfe = SpectralTimeEventModel(peak_width_limits=[2, 8], decimation=4, verbose=False)
+    tfe.fit(xs, ys)
+    expected = tfe.results.get_results()
+
+    tfe.fit(xs, ys, n_jobs=2)
+    results = tfe.results.get_results()
+    for key in expected:
+        assert np.array_equal(results[key], expected[key], equal_nan=True)
+
+def test_event_fit_profile():
+    """Test event fit in profile state, running linearly and in parallel."""
+
+    n_windows = 3
+    xs, ys = sim_spectrogram(n_windows, *default_group_params())
+    ys = [ys, ys]
+
+    tfe = SpectralTimeEventModel(verbose=False)
+    tfe.algorithm.set_profile(True)
+
+    for n_jobs in [1, 2]:
+        tfe.fit(xs, ys, n_jobs=n_jobs)
+        profiles = tfe.results.get_profile(summary=False)
+        assert len(profiles) == len(ys)
+        assert all(len(eprofiles) == n_windows for eprofiles in profiles)
+        summary = tfe.results.get_profile()
+        assert summary['robust_ap_fit']['n_fits'] == len(ys) * n_windows
+
+def test_event_fit_deadline():
+    """Test event fit with a deadline."""
+
+    n_windows = 2
+    xs, ys = sim_spectrogram(n_windows, *default_spectrum_params(), rng=0)
+    ys = [ys, ys]
+
+    tfe = SpectralTimeEventModel(verbose=False)
+    for n_jobs in [1, 2]:
+        tfe.fit(xs, ys, n_jobs=n_jobs, deadline=0)
+        assert tfe.results.get_status() == [['failed'] * n_windows] * len(ys)
+
+def test_event_fit_par_timeout():
+    """Test event fit in parallel, with a timeout."""
+
+    n_windows = 2
+    xs, ys = sim_spectrogram(n_windows, *default_spectrum_params(), rng=0)
+    ys = [ys, ys]
+
+    tfe = SpectralTimeEventModel(verbose=False)
+    tfe.fit(xs, ys, n_jobs=2, timeout=60, retries=1)
+    assert tfe.results.get_status() == [['complete'] * n_windows] * len(ys)
+
+    tfe.fit(xs, ys, n_jobs=2, timeout=0)
+    for estatus in tfe.results.get_status():
+        assert len(estatus) == n_windows
+    assert tfe.results.event_time_results
+
 def test_event_print(tfe):
 
     for val in ['results', 'algorithm', 'settings', 'data', 'modes', 'metrics', 'bands', 'issue']:
@@ -134,6 +238,7 @@ def test_event_get_model(tfe):
     assert tfm0
     assert tfm0.data.has_data
     assert tfm0.results.has_model
+    assert tfm0.data.power_spectrum.flags.writeable
 
     # Check with regenerating
     tfm1 = tfe.get_model(1, 1, True)
@@ -189,6 +294,14 @@ def test_event_get_group(tfe):
     assert ntfg1.results.group_results
     assert len(ntfg1.results.group_results) == len(ntfg1.data.power_spectra) == n_out
 
+    # Check selections are views, and that the current object is not modified
+    ntft2 = tfe.get_group([1], range(2), 'time')
+    assert np.shares_memory(ntft2.data.power_spectra, tfe.data.spectrograms)
+    assert np.array_equal(ntft2.data.power_spectra, tfe.data.spectrograms[1][:, :2].T)
+    assert ntft2.results.group_results == tfe.results.event_group_results[1][:2]
+    assert not tfe.results.group_results
+    assert not tfe.data.has_data or tfe.data.power_spectra is None
+
 def test_event_drop():
 
     n_windows = 3
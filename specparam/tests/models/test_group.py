@@ -8,9 +8,12 @@ They serve rather as 'smoke tests', for if anything fails completely.
 
 import os
 
+from pytest import raises
+
 import numpy as np
 from numpy.testing import assert_equal
 
+from specparam.models.observers import FitObserver
 from specparam.models.utils import compare_model_objs
 from specparam.modutils.dependencies import safe_import
 from specparam.sim import sim_group_power_spectra
@@ -18,7 +21,7 @@ from specparam.sim import sim_group_power_spectra
 pd = safe_import('pandas')
 
 from specparam.tests.tsettings import TEST_DATA_PATH, TEST_REPORTS_PATH
-from specparam.tests.tdata import default_group_params
+from specparam.tests.tdata import default_group_params, default_spectrum_params
 from specparam.tests.tutils import plot_test
 
 from specparam.models.group import *
@@ -105,6 +108,50 @@ def test_fit_nk_noise():
     # No accuracy checking here - just checking that it ran
     assert tfg.results.has_model
 
+def test_fit_float32():
+    """Test group fit, with data and results stored as float32."""
+
+    # Use fixed parameters, as large offsets from sampled parameters overflow float32
+    xs, ys = sim_group_power_spectra(3, [3, 50], {'fixed' : [1, 1.5]},
+                                     {'gaussian' : [10, 0.5, 2]}, nlvs=0.01, rng=0)
+
+    tfg64 = SpectralGroupModel(verbose=False)
+    tfg64.fit(xs, ys)
+
+    tfg32 = SpectralGroupModel(verbose=False)
+    tfg32.data.set_dtype('float32')
+    tfg32.fit(xs, ys)
+
+    assert tfg32.data.power_spectra.dtype == 'float32'
+    assert tfg32.results.get_results()[0].aperiodic_fit.dtype == 'float32'
+    assert tfg32.get_model(0).results.model.modeled_spectrum.dtype == 'float32'
+    for component in ['aperiodic', 'periodic']:
+        assert np.allclose(tfg32.results.get_params(component),
+                           tfg64.results.get_params(component), atol=1e-3)
+
+def test_fit_dedup():
+    """Test group fit, fitting only unique power spectra."""
+
+    xs, ys = sim_group_power_spectra(3, *default_group_params(), nlvs=0.01, rng=0)
+    ys = np.vstack([ys, ys[[1, 0]]])
+
+    tfg0 = SpectralGroupModel(verbose=False)
+    tfg0.fit(xs, ys)
+
+    for n_jobs in [1, 2]:
+        tfg = SpectralGroupModel(verbose=False)
+        tfg.data.set_dedup(True)
+        tfg.fit(xs, ys, n_jobs=n_jobs)
+
+        assert tfg.data.power_spectra.shape == ys.shape
+        assert len(tfg.results) == len(ys)
+        assert [info.get('duplicate_of') for info in tfg.results.group_fit_info] == \
+            [None, None, None, 1, 0]
+        for component in ['aperiodic', 'periodic']:
+            assert np.array_equal(tfg.results.get_params(component),
+                                  tfg0.results.get_params(component))
+        assert tfg.get_group([0, 3]).data.dedup
+
 def test_fit_knee():
     """Test group fit, with a knee."""
 
@@ -253,6 +300,96 @@ def test_fit_par():
     assert np.all(~np.isnan(gofs))
     assert len(gofs) == n_spectra
 
+def test_fit_profile():
+    """Test group fit in profile state, running linearly and in parallel."""
+
+    n_spectra = 2
+    xs, ys = sim_group_power_spectra(n_spectra, *default_group_params())
+
+    tfg = SpectralGroupModel(verbose=False)
+    tfg.algorithm.set_profile(True)
+
+    for n_jobs in [1, 2]:
+        tfg.fit(xs, ys, n_jobs=n_jobs)
+        profiles = tfg.results.get_profile(summary=False)
+        assert len(profiles) == n_spectra
+        assert all(profiles)
+        summary = tfg.results.get_profile()
+        assert summary['robust_ap_fit']['n_fits'] == n_spectra
+        for label in ['time_mean', 'time_p95', 'time_max', 'nfev_mean', 'nfev_p95', 'nfev_max']:
+            assert label in summary['robust_ap_fit']
+
+def test_fit_info():
+    """Test group fit information is only recorded when needed, running linearly and in parallel."""
+
+    n_spectra = 3
+    xs, ys = sim_group_power_spectra(n_spectra, *default_group_params())
+    ys[1, :] = np.nan
+
+    tfg = SpectralGroupModel(verbose=False)
+    tfg.data.set_checks(check_data=False)
+    for n_jobs in [1, 2]:
+
+        tfg.fit(xs, ys, n_jobs=n_jobs)
+        assert not tfg.results.group_fit_info[0] and not tfg.results.group_fit_info[2]
+        assert tfg.results.group_fit_info[1]['success'] is False
+        assert tfg.results.get_status() == ['complete', 'failed', 'complete']
+
+        tfg.fit(xs, ys, n_jobs=n_jobs, observers=FitObserver())
+        assert all('duration' in fit_info for fit_info in tfg.results.group_fit_info)
+        assert tfg.results.get_status() == ['complete', 'failed', 'complete']
+        assert not tfg._record_fit_info
+
+def test_fit_deadline():
+    """Test group fit with a deadline, running linearly and in parallel."""
+
+    n_spectra = 2
+    xs, ys = sim_group_power_spectra(n_spectra, *default_spectrum_params(), rng=0)
+
+    tfg = SpectralGroupModel(verbose=False)
+    for n_jobs in [1, 2]:
+
+        tfg.fit(xs, ys, n_jobs=n_jobs, deadline=60)
+        assert tfg.results.get_status() == ['complete'] * n_spectra
+
+        tfg.fit(xs, ys, n_jobs=n_jobs, deadline=0)
+        assert tfg.results.get_status() == ['failed'] * n_spectra
+        assert tfg.results.n_null == n_spectra
+
+    assert tfg.algorithm.get_budget()['deadline'] is None
+
+def test_fit_par_schedule():
+    """Test group fit in parallel, scheduling the most costly fits first."""
+
+    n_spectra = 4
+    xs, ys = sim_group_power_spectra(n_spectra, *default_group_params())
+
+    tfg = SpectralGroupModel(verbose=False)
+    tfg.fit(xs, ys)
+    expected = tfg.get_params('aperiodic')
+
+    tfg.algorithm.set_schedule(True)
+    tfg.fit(xs, ys, n_jobs=2)
+    assert np.array_equal(tfg.get_params('aperiodic'), expected)
+
+def test_fit_par_timeout():
+    """Test group fit in parallel, with a timeout and retries."""
+
+    n_spectra = 3
+    xs, ys = sim_group_power_spectra(n_spectra, *default_spectrum_params(), rng=0)
+
+    tfg = SpectralGroupModel(verbose=False)
+
+    tfg.fit(xs, ys, n_jobs=2, timeout=60, retries=1)
+    assert tfg.results.get_status() == ['complete'] * n_spectra
+
+    tfg.fit(xs, ys, n_jobs=2, timeout=0)
+    assert len(tfg.results) == n_spectra
+    for ind, status in enumerate(tfg.results.get_status()):
+        assert status in ['complete', 'failed']
+        if status == 'failed':
+            assert ind in tfg.results.null_inds
+
 def test_print(tfg):
 
     for val in ['results', 'algorithm', 'settings', 'data', 'modes', 'metrics', 'bands', 'issue']:
@@ -350,6 +487,11 @@ def test_get_model(tfg):
     # Check that settings are copied over properly
     assert tfg.algorithm.settings.values == tfm0.algorithm.settings.values
 
+    # Check that the power spectrum can be modified in place
+    tfm_mod = tfg.copy().get_model(0, False)
+    tfm_mod.data.power_spectrum[0] = 1
+    assert tfm_mod.data.power_spectrum[0] == 1
+
     # Check with regenerating
     tfm1 = tfg.get_model(1, True)
     assert tfm1
@@ -403,6 +545,16 @@ def test_get_group(tfg):
     assert [tfg.results.group_results[ind] for ind in inds1] == nfg1.results.group_results
     assert [tfg.results.group_results[ind] for ind in inds2] == nfg2.results.group_results
 
+    # Check that evenly spaced selections are read-only views
+    assert np.shares_memory(nfg2.data.power_spectra, tfg.data.power_spectra)
+    assert not nfg2.data.power_spectra.flags.writeable
+
+    # Check that indices out of bounds raise an error
+    n_spectra = len(tfg.results)
+    for inds in [range(0, n_spectra + 10), np.arange(n_spectra - 2, n_spectra + 2)]:
+        with raises(IndexError):
+            tfg.get_group(inds)
+
 def test_fg_to_df(tfg, tbands, skip_if_no_pandas):
 
     df1 = tfg.to_df(2)
@@ -375,6 +375,63 @@ def test_debug():
     with raises(FitError):
         tfm.fit(*sim_power_spectrum(*default_spectrum_params()))
 
+    # Check data are restored to the storage dtype, if an error is raised out of the fit
+    tfm.data.set_dtype('float32')
+    with raises(FitError):
+        tfm.fit(*sim_power_spectrum(*default_spectrum_params()))
+    assert tfm.data.power_spectrum.dtype == 'float32'
+
+def test_profile():
+    """Test model object in profile state."""
+
+    tfm = SpectralModel(verbose=False)
+    tfm.fit(*sim_power_spectrum(*default_spectrum_params()))
+    assert tfm.results.get_profile() == {}
+
+    tfm.algorithm.set_profile(True)
+    tfm.fit(*sim_power_spectrum(*default_spectrum_params()))
+    profile = tfm.results.get_profile()
+    for stage in ['algorithm', 'robust_ap_fit', 'peak_search', 'simple_ap_fit', 'compute_metrics']:
+        assert stage in profile
+    assert profile['robust_ap_fit']['nfev'] > 0
+    assert profile['simple_ap_fit']['nfev'] > 0
+
+def test_budget():
+    """Test model object with a fit budget, including when the budget is exhausted."""
+
+    freqs, powers = sim_power_spectrum(*default_spectrum_params(), rng=0)
+
+    tfm = SpectralModel(verbose=False)
+    tfm.fit(freqs, powers)
+    assert tfm.results.get_status() == 'complete'
+    n_peaks = tfm.results.n_peaks
+
+    # Check that the fit fails if the budget is exhausted in the initial aperiodic fit
+    tfm.algorithm.set_budget(max_nfev=1)
+    tfm.fit(freqs, powers)
+    assert tfm.results.get_status() == 'failed'
+    assert not tfm.results.has_model
+
+    # Check that fits degrade to aperiodic-only or partial fits as the budget increases
+    statuses = []
+    for max_nfev in range(1, 100):
+        tfm.algorithm.set_budget(max_nfev=max_nfev)
+        tfm.fit(freqs, powers)
+        statuses.append(tfm.results.get_status())
+        if statuses[-1] == 'aperiodic_only':
+            assert tfm.results.n_peaks == 0
+            assert tfm.results.has_model
+        if statuses[-1] == 'partial':
+            assert tfm.results.n_peaks == n_peaks
+    for status in ['failed', 'aperiodic_only', 'partial', 'complete']:
+        assert status in statuses
+
+    # Check that a fit budget is not applied once removed
+    tfm.algorithm.set_budget(max_time=0)
+    tfm.algorithm.set_budget()
+    tfm.fit(freqs, powers)
+    assert tfm.results.get_status() == 'complete'
+
 def test_set_checks():
     """Test changing checks using set_checks, and that checks get turned off.
     Note that testing for checks raising errors happens in test_checks.`"""
@@ -0,0 +1,119 @@
+"""Tests for specparam.models.observers."""
+
+import numpy as np
+
+from specparam.models import SpectralGroupModel, SpectralTimeEventModel
+from specparam.sim import sim_group_power_spectra, sim_spectrogram
+
+from specparam.tests.tsettings import TEST_DATA_PATH
+from specparam.tests.tdata import default_group_params
+
+from specparam.models.observers import *
+
+###################################################################################################
+###################################################################################################
+
+class RecordObserver(FitObserver):
+    """Observer that records all events, for testing."""
+
+    def __init__(self):
+        self.events = []
+
+    def on_fit_start(self, model, n_spectra):
+        self.events.append(('start', n_spectra))
+
+    def on_spectrum_done(self, index, duration, success, n_peaks, pid):
+        self.events.append(('done', index, success))
+
+    def on_spectrum_failed(self, index, duration, error, pid):
+        self.events.append(('failed', index, error))
+
+    def on_fit_end(self, model, duration):
+        self.events.append(('end', duration))
+
+def test_check_observers():
+
+    observer = FitObserver()
+    assert check_observers(None) == []
+    assert check_observers(observer) == [observer]
+    assert check_observers([observer, observer]) == [observer, observer]
+
+def test_observers_group():
+
+    n_spectra = 3
+    xs, ys = sim_group_power_spectra(n_spectra, *default_group_params())
+
+    for n_jobs in [1, 2]:
+        observer = RecordObserver()
+        tfg = SpectralGroupModel(verbose=False)
+        tfg.fit(xs, ys, n_jobs=n_jobs, observers=observer)
+
+        assert observer.events[0] == ('start', n_spectra)
+        assert observer.events[-1][0] == 'end'
+        assert sorted(event[1] for event in observer.events[1:-1]) == list(range(n_spectra))
+
+def test_observers_group_dedup():
+
+    xs, ys = sim_group_power_spectra(3, *default_group_params())
+    ys = np.vstack([ys, ys[[1, 0]]])
+
+    for n_jobs in [1, 2]:
+        observer = RecordObserver()
+        tfg = SpectralGroupModel(verbose=False)
+        tfg.data.set_dedup(True)
+        tfg.fit(xs, ys, n_jobs=n_jobs, observers=observer)
+
+        assert observer.events[0] == ('start', len(ys))
+        assert sorted(event[1] for event in observer.events[1:-1]) == list(range(len(ys)))
+        assert [event[1] for event in observer.events[-3:-1]] == [3, 4]
+
+def test_observers_group_fail():
+
+    n_spectra = 2
+    xs, ys = sim_group_power_spectra(n_spectra, *default_group_params())
+
+    observer = RecordObserver()
+    tfg = SpectralGroupModel(verbose=False)
+    tfg.algorithm._cf_settings.maxfev = 2
+    tfg.fit(xs, ys, observers=observer)
+
+    failed = [event for event in observer.events if event[0] == 'failed']
+    assert len(failed) == n_spectra
+    assert all(event[2] for event in failed)
+
+def test_observers_event():
+
+    n_windows = 2
+    xs, ys = sim_spectrogram(n_windows, *default_group_params())
+    ys = [ys, ys]
+
+    for n_jobs in [1, 2]:
+        observer = RecordObserver()
+        tfe = SpectralTimeEventModel(verbose=False)
+        tfe.fit(xs, ys, n_jobs=n_jobs, observers=observer)
+
+        assert observer.events[0] == ('start', len(ys) * n_windows)
+        assert sorted(event[1] for event in observer.events[1:-1]) == \
+            [(0, 0), (0, 1), (1, 0), (1, 1)]
+
+def test_prometheus_collector():
+
+    n_spectra = 3
+    xs, ys = sim_group_power_spectra(n_spectra, *default_group_params())
+
+    file_name = TEST_DATA_PATH / 'test_metrics.prom'
+    collector = PrometheusCollector(file_name, write_every=1)
+
+    tfg = SpectralGroupModel(verbose=False)
+    tfg.fit(xs, ys, observers=collector)
+
+    assert collector.n_spectra == n_spectra
+    assert collector.n_peaks == sum(tfg.results.n_peaks)
+    assert collector.throughput > 0
+
+    with open(file_name) as f_obj:
+        lines = f_obj.read().splitlines()
+    assert 'specparam_spectra_total {}'.format(n_spectra) in lines
+    assert 'specparam_failures_total 0' in lines
+    assert 'specparam_spectrum_duration_seconds_bucket{le="+Inf"} 3' in lines
+    assert 'specparam_spectrum_duration_seconds_count 3' in lines
@@ -0,0 +1,122 @@
+"""Tests for specparam.models.service."""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from pytest import raises
+
+import numpy as np
+
+from specparam.models import SpectralModel, SpectralGroupModel
+from specparam.sim import sim_group_power_spectra, sim_power_spectrum
+
+from specparam.tests.tdata import default_group_params
+
+from specparam.models.service import *
+
+###################################################################################################
+###################################################################################################
+
+def test_get_set_executor():
+
+    executor = get_executor()
+    assert executor is get_executor()
+
+    new_executor = ThreadPoolExecutor(1)
+    set_executor(new_executor)
+    assert get_executor() is new_executor
+
+    set_executor(None)
+    assert get_executor() is not new_executor
+    new_executor.shutdown()
+
+def test_fit_async(tdata, tdata2d):
+
+    fm = SpectralModel(verbose=False)
+    asyncio.run(fit_async(fm, tdata.freqs, 10 ** tdata.power_spectrum))
+    assert fm.results.has_model
+
+    fg = SpectralGroupModel(verbose=False)
+    asyncio.run(fg.fit_async(tdata2d.freqs, 10 ** tdata2d.power_spectra))
+    assert fg.results.has_model
+    assert len(fg.results) == tdata2d.power_spectra.shape[0]
+
+def test_fit_async_cancel():
+
+    freqs, powers = sim_group_power_spectra(500, *default_group_params(), nlvs=0.01)
+    fg = SpectralGroupModel(verbose=False)
+
+    async def run():
+        task = asyncio.create_task(fg.fit_async(freqs, powers))
+        await asyncio.sleep(0.05)
+        task.cancel()
+        await task
+
+    with raises(asyncio.CancelledError):
+        asyncio.run(run())
+
+def test_fit_service(tdata2d):
+
+    fg = SpectralGroupModel(verbose=False)
+    fg.fit(tdata2d.freqs, 10 ** tdata2d.power_spectra)
+
+    async def run(**kwargs):
+        async with FitService(**kwargs) as service:
+            return await asyncio.gather(*[service.fit(tdata2d.freqs, 10 ** spectrum) \
+                for spectrum in tdata2d.power_spectra])
+
+    for kwargs in [{}, {'max_batch_size' : 2, 'max_queue_size' : 1, 'max_concurrency' : 2}]:
+        models = asyncio.run(run(**kwargs))
+        for ind, fm in enumerate(models):
+            assert isinstance(fm, SpectralModel)
+            assert np.allclose(fm.results.get_params('aperiodic'),
+                               fg.results.get_params('aperiodic')[ind])
+
+def test_fit_service_private_settings():
+
+    xs, ys = sim_power_spectrum([1, 100], {'fixed' : [1, 1.5]},
+                                {'gaussian' : [[10, 0.5, 1.5], [30, 0.3, 2.5]]},
+                                nlv=0.005, freq_res=0.1, rng=0)
+
+    fm = SpectralModel(peak_width_limits=[2, 8], decimation=4, ap_fit_method='varpro',
+                       maxfev=500, tol=1e-6, verbose=False)
+    fm.fit(xs, ys)
+
+    async def run():
+        async with FitService(fm) as service:
+            return await service.fit(xs, ys)
+
+    out = asyncio.run(run())
+    for label in ['decimation', 'ap_fit_method']:
+        assert getattr(out.algorithm._settings, label) == getattr(fm.algorithm._settings, label)
+    for label in ['maxfev', 'tol']:
+        assert getattr(out.algorithm._cf_settings, label) == \
+            getattr(fm.algorithm._cf_settings, label)
+    assert np.array_equal(out.results.get_params('aperiodic'), fm.results.get_params('aperiodic'))
+    assert np.array_equal(out.results.get_params('periodic'), fm.results.get_params('periodic'))
+
+def test_fit_service_error(tdata):
+
+    async def run():
+        async with FitService(max_delay=0.05) as service:
+            return await asyncio.gather(\
+                service.fit(tdata.freqs, 10 ** tdata.power_spectrum),
+                service.fit(tdata.freqs, np.zeros(tdata.freqs.shape)),
+                return_exceptions=True)
+
+    out = asyncio.run(run())
+    assert isinstance(out[0], SpectralModel)
+    assert isinstance(out[1], Exception)
+
+def test_fit_service_stop(tdata):
+
+    async def run():
+        service = FitService()
+        assert not service.running
+        fm = await service.fit(tdata.freqs, 10 ** tdata.power_spectrum)
+        assert service.running
+        await service.stop()
+        assert not service.running
+        return fm
+
+    assert asyncio.run(run()).results.has_model
@@ -7,9 +7,10 @@ import numpy as np
 from specparam import SpectralGroupModel
 from specparam.sim import sim_group_power_spectra
 from specparam.metrics.definitions import METRICS
-from specparam.modutils.errors import NoModelError, IncompatibleSettingsError
+from specparam.modutils.errors import NoModelError, NoDataError, IncompatibleSettingsError
 
 from specparam.tests.tdata import default_group_params
+from specparam.tests.tsettings import TEST_DATA_PATH
 
 from specparam.models.utils import *
 
@@ -27,6 +28,29 @@ def test_initialize_model_from_source(tfm, tfg):
             assert not out.data.has_data
             assert not out.results.has_model
 
+def test_derived_models_ap_fit_method(tdata2d):
+
+    fg = SpectralGroupModel(ap_fit_method='varpro', verbose=False)
+    fg.fit(tdata2d.freqs, 10 ** tdata2d.power_spectra)
+
+    for derived in [initialize_model_from_source(fg, 'event'), fg.get_group([0, 1]),
+                    fg.get_model(0), combine_model_objs([fg, fg])]:
+        assert derived.algorithm._settings.ap_fit_method == 'varpro'
+
+def test_derived_models_pe_fit_method(tdata2d):
+
+    fg = SpectralGroupModel(pe_fit_method='varpro', verbose=False)
+    fg.fit(tdata2d.freqs, 10 ** tdata2d.power_spectra)
+
+    for derived in [initialize_model_from_source(fg, 'time'), fg.get_group([0, 1]),
+                    fg.get_model(0), combine_model_objs([fg, fg])]:
+        assert derived.algorithm._settings.pe_fit_method == 'varpro'
+
+    fm = fg.get_model(0)
+    fm.fit()
+    assert np.array_equal(fm.results.get_params('periodic'),
+                          fg.get_model(0).results.get_params('periodic'))
+
 def test_compare_model_objs(tfm, tfg):
 
     for f_obj in [tfm, tfg]:
@@ -39,6 +63,7 @@ def test_compare_model_objs(tfm, tfg):
         assert compare_model_objs([f_obj, f_obj2], 'modes')
         f_obj2.add_modes('knee', 'cauchy')
         assert not compare_model_objs([f_obj, f_obj2], 'modes')
+        assert not compare_model_objs([f_obj2, f_obj, f_obj.copy()], 'modes')
 
         assert compare_model_objs([f_obj, f_obj2], 'settings')
         f_obj2.algorithm.settings.peak_width_limits = [2, 4]
@@ -131,6 +156,23 @@ def test_combine_model_objs(tfm, tfg):
     assert len(nfg6.results) == 1 + len(tfg2.results)
     assert nfg6.data.power_spectra is None
 
+def test_combine_model_files(tfm, tfg):
+
+    tfg2 = tfg.copy()
+    tfg2.data.power_spectra = tfg2.data.power_spectra[::-1]
+    f_objs = [tfg, tfm, tfg2]
+    file_names = ['test_combine_files_{}'.format(ind) for ind in range(len(f_objs))]
+    for f_obj, file_name in zip(f_objs, file_names):
+        f_obj.save(file_name, TEST_DATA_PATH, save_results=True,
+                   save_settings=True, save_data=True)
+
+    for n_jobs in [1, 2]:
+        nfg = combine_model_files(file_names, TEST_DATA_PATH, n_jobs=n_jobs)
+        assert len(nfg.results) == len(tfg.results) + 1 + len(tfg2.results)
+        assert compare_model_objs([nfg, tfg], 'settings')
+        assert np.allclose(nfg.data.power_spectra, np.vstack([\
+            tfg.data.power_spectra, tfm.data.power_spectrum, tfg2.data.power_spectra]))
+
 def test_combine_errors(tfm, tfg):
 
     # Incompatible settings
@@ -164,3 +206,41 @@ def test_fit_models_3d(tfg):
         assert fg
         assert len(fg.results) == n_spectra
         assert fg.data.power_spectra.shape == spectra_shape[1:]
+
+def test_fit_settings_sweep():
+
+    n_spectra = 3
+    xs, ys = sim_group_power_spectra(n_spectra, *default_group_params())
+
+    tfg = SpectralGroupModel(verbose=False)
+    settings = {'peak_width_limits' : [[1, 6], [2, 8]], 'peak_threshold' : [1.5, 2.]}
+    combinations, results = fit_settings_sweep(tfg, settings, xs, ys, bands=2, chunk_size=2)
+
+    assert len(combinations) == 4
+    assert combinations[1] == {'peak_width_limits' : [1, 6], 'peak_threshold' : 2.}
+    for label in ['offset', 'exponent', 'cf_0', 'n_peaks']:
+        assert results[label].shape == (len(combinations), n_spectra)
+
+    # Check settings of the object are unchanged, & results match a direct fit
+    assert tfg.algorithm.settings.peak_threshold == 2.
+    tfg2 = SpectralGroupModel(**combinations[1], verbose=False)
+    tfg2.fit(xs, ys)
+    assert np.array_equal(results['n_peaks'][1], tfg2.results.n_peaks)
+    assert np.allclose(results['exponent'][1], tfg2.results.get_params('aperiodic', 'exponent'))
+
+    # Check with a list of settings, including private settings
+    combinations, results = fit_settings_sweep(\
+        tfg, [{'peak_threshold' : 1.5}, {'ap_percentile_thresh' : 0.05}])
+    assert results['offset'].shape == (2, n_spectra)
+
+    # Check private settings of the object, that are not swept, are used
+    tfg3 = SpectralGroupModel(ap_fit_method='varpro', verbose=False)
+    combinations, results = fit_settings_sweep(tfg3, {'peak_threshold' : [2.]}, xs, ys)
+    tfg3.fit()
+    assert np.array_equal(results['exponent'][0], tfg3.results.get_params('aperiodic', 'exponent'))
+
+    with raises(ValueError):
+        fit_settings_sweep(tfg, {'not_a_setting' : [1, 2]})
+
+    with raises(NoDataError):
+        fit_settings_sweep(SpectralGroupModel(verbose=False), {'peak_threshold' : [1.5, 2.]})
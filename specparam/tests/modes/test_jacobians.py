@@ -31,3 +31,13 @@ def test_jacobian_expo_nk():
     jacobian = jacobian_expo_nk(xs, off, exp)
     assert isinstance(jacobian, np.ndarray)
     assert jacobian.shape == (len(xs), 2)
+
+def test_jacobian_gauss_batch():
+
+    xs = np.arange(1, 100)
+    params = np.array([[50, 5, 10], [30, 2, 5]])
+
+    jacobian = jacobian_gauss(xs, *params.T[:, :, None])
+    assert jacobian.shape == (2, len(xs), 3)
+    for ind, cparams in enumerate(params):
+        assert np.allclose(jacobian[ind], jacobian_gauss(xs, *cparams))
@@ -1,14 +1,31 @@
 """Tests for specparam.results.utils."""
 
+import os
+from time import sleep
+
+import numpy as np
+
+from specparam.modutils.errors import ParallelError
+
 from specparam.results.utils import *
+from specparam.results.utils import _EventChunks
 
 ###################################################################################################
 ###################################################################################################
 
-# Test func for parallel tests
+# Test funcs for parallel tests
 def inc(val):
     return val + 1
 
+def inc_faulty(val):
+    if val == 2:
+        sleep(60)
+    if val == 3:
+        os._exit(1)
+    if val == 4:
+        raise ValueError('Test error.')
+    return val + 1
+
 def test_run_parallel():
 
     data = [1, 2, 3, 4]
@@ -19,6 +36,47 @@ def test_run_parallel():
     results2 = run_parallel(inc, data, -1, None)
     assert results2 == [2, 3, 4, 5]
 
+def test_run_parallel_costs():
+
+    data = [1, 2, 3, 4]
+    costs = [1, 4, 2, 3]
+
+    outputs = []
+    results = run_parallel(inc, data, 2, None, costs=costs,
+                           callback=lambda ind, result : outputs.append((ind, result)))
+    assert results == [2, 3, 4, 5]
+    assert sorted(outputs) == [(0, 2), (1, 3), (2, 4), (3, 5)]
+
+    assert run_parallel(inc, data, 2, None, retries=1, costs=costs) == [2, 3, 4, 5]
+
+def test_run_parallel_managed():
+
+    data = [1, 2, 3, 4, 5]
+
+    outputs = []
+    results = run_parallel(inc_faulty, data, 2, None, timeout=1, retries=1,
+                           callback=lambda ind, result : outputs.append((ind, result)))
+
+    assert results[0] == 2
+    assert results[4] == 6
+    for ind in [1, 2, 3]:
+        assert isinstance(results[ind], ParallelError)
+    assert sorted(outputs) == [(0, 2), (4, 6)]
+
+    assert run_parallel(inc, data, 2, None, retries=1) == [2, 3, 4, 5, 6]
+
+def test_event_chunks():
+
+    n_freqs, n_windows = 4, 5
+    data = [np.random.rand(n_freqs, n_windows) for _ in range(3)]
+    spectra = np.hstack(data).T
+
+    for bounds in [[(0, 15)], [(0, 4), (4, 8), (8, 12), (12, 15)], [(0, 5), (5, 6), (6, 15)]]:
+        chunks = _EventChunks(data, bounds)
+        assert len(chunks) == len(bounds)
+        for chunk, (start, stop) in zip(chunks, bounds):
+            assert np.array_equal(chunk, spectra[start:stop])
+
 def test_pbar_no_tqdm():
 
     iterable = [1, 2, 3, 4]
@@ -85,3 +85,16 @@ def test_gen_model():
     ys = gen_model(xs, 'fixed', np.array([1, 1]), 'gaussian', np.array([10, 0.5, 1]))
 
     assert np.all(ys)
+
+def test_gen_group_power_vals():
+
+    xs = gen_freqs([3, 50], 0.5)
+
+    ap_params = np.array([[1, 1], [0.5, 2]])
+    peaks = np.array([[0, 10, 0.5, 1], [1, 10, 0.5, 1], [1, 20, 0.25, 2]])
+    nlvs = np.array([0, 0])
+
+    ys = gen_group_power_vals(xs, 'fixed', ap_params, 'gaussian', peaks, nlvs)
+    assert ys.shape == (2, len(xs))
+    assert np.allclose(ys[1], gen_power_vals(xs, 'fixed', [0.5, 2], 'gaussian',
+                                             [10, 0.5, 1, 20, 0.25, 2], 0))
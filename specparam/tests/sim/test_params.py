@@ -137,3 +137,18 @@ def test_param_jitter():
     jitterer = param_jitter(params, [0, 0.5])
     for ind, jits in zip(range(3), jitterer):
         assert jits[0] == params[1]
+
+def test_param_sampler_rng():
+
+    pos = [[1, 1], [2, 1], [3, 1]]
+
+    outs1 = [next(param_sampler(pos, rng=13)) for _ in range(5)]
+    outs2 = [next(param_sampler(pos, rng=13)) for _ in range(5)]
+    assert outs1 == outs2
+
+def test_param_jitter_rng():
+
+    gen1 = param_jitter([1, 1], [0.5, 0.5], rng=np.random.default_rng(13))
+    gen2 = param_jitter([1, 1], [0.5, 0.5], rng=np.random.default_rng(13))
+    for _, jits1, jits2 in zip(range(3), gen1, gen2):
+        assert jits1 == jits2
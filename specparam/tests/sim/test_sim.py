@@ -98,3 +98,50 @@ def test_sim_spectrogram():
     assert np.all(ys)
     assert ys.ndim == 2
     assert ys.shape[1] == n_windows
+
+def test_sim_group_power_spectra_arr():
+
+    n_spectra = 4
+    aps = np.array([[1, 1], [1, 1.5], [0.5, 2], [1, 2]])
+    pes = [[], [10, 0.5, 1], [[10, 0.5, 1], [20, 0.25, 2]], [8, 0.3, 1.5]]
+    nlvs = [0.01, 0.02, 0.0, 0.05]
+
+    np.random.seed(21)
+    xs, ys = sim_group_power_spectra(n_spectra, [3, 50], {'fixed' : aps}, {'gaussian' : pes}, nlvs)
+    assert ys.shape == (n_spectra, len(xs))
+
+    # Check vectorized simulation matches simulating each spectrum in turn
+    np.random.seed(21)
+    for ind in range(n_spectra):
+        _, cys = sim_power_spectrum([3, 50], {'fixed' : aps[ind]},
+                                    {'gaussian' : pes[ind]}, nlvs[ind])
+        assert np.allclose(ys[ind], cys)
+
+def test_sim_group_power_spectra_rng():
+
+    aps = {'fixed' : [1, 1]}
+    pes = {'gaussian' : [10, 0.5, 1]}
+
+    _, ys1 = sim_group_power_spectra(3, [3, 50], aps, pes, rng=13)
+    _, ys2 = sim_group_power_spectra(3, [3, 50], aps, pes, rng=np.random.default_rng(13))
+    assert array_equal(ys1, ys2)
+
+def test_sim_group_power_spectra_chunked():
+
+    n_spectra = 25
+    aps = {'fixed' : [1, 1]}
+    pes = {'gaussian' : [[10, 0.5, 1], [20, 0.25, 2]]}
+
+    xs, ys1 = sim_group_power_spectra_chunked(n_spectra, [3, 50], aps, pes,
+                                              rng=13, chunk_size=10, n_jobs=1)
+    _, ys2, sps = sim_group_power_spectra_chunked(n_spectra, [3, 50], aps, pes,
+                                                  rng=13, chunk_size=10, n_jobs=2,
+                                                  return_params=True)
+    assert ys1.shape == (n_spectra, len(xs))
+    assert array_equal(ys1, ys2)
+    assert len(sps) == n_spectra
+
+    # Check with a rotation applied
+    _, ys3 = sim_group_power_spectra_chunked(n_spectra, [3, 50], {'fixed' : [None, 1]}, pes,
+                                             f_rotation=20, rng=13, chunk_size=10)
+    assert np.all(ys3)
@@ -1,5 +1,7 @@
 """Tests for specparam.utils.array."""
 
+from pytest import raises
+
 import numpy as np
 
 from specparam.utils.array import *
@@ -35,3 +37,31 @@ def test_compute_arr_desc():
     minv, maxv, meanv = compute_arr_desc(data1_nan)
     for val in [minv, maxv, meanv]:
         assert isinstance(val, float)
+
+def test_select_view():
+
+    arr = np.arange(12).reshape(3, 4)
+
+    view = select_view(arr, range(0, 4, 2), axis=1)
+    assert np.array_equal(view, arr[:, [0, 2]])
+    assert np.shares_memory(view, arr)
+    assert not view.flags.writeable
+
+    out = select_view(arr, [2, 0])
+    assert np.array_equal(out, arr[[2, 0]])
+    assert not np.shares_memory(out, arr)
+
+    for inds in [range(0, 5), [2, 3], [3, 0]]:
+        with raises(IndexError):
+            select_view(arr, inds)
+
+def test_make_writeable():
+
+    arr = np.arange(4)
+    assert make_writeable(arr) is arr
+
+    view = select_view(arr, range(2))
+    out = make_writeable(view)
+    out[0] = 10
+    assert out.flags.writeable
+    assert arr[0] == 0
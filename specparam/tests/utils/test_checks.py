@@ -123,3 +123,14 @@ def test_check_all_none():
     assert not check_all_none([])
     assert not check_all_none([1, None])
     assert not check_all_none([1, 2, 3])
+
+def test_check_rng():
+
+    assert check_rng() is np.random
+
+    rng = np.random.default_rng(13)
+    assert check_rng(rng) is rng
+
+    for seed in [13, np.random.SeedSequence(13)]:
+        assert isinstance(check_rng(seed), np.random.Generator)
+    assert check_rng(13).normal() == check_rng(np.random.SeedSequence(13)).normal()
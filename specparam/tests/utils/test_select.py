@@ -69,3 +69,27 @@ def test_list_insert():
     lstb = [1, 4]
     outb = list_insert(lstb, [2, 3], 1)
     assert outb == [1, 2, 3, 4]
+
+def test_inds_to_slice():
+
+    lst = list(range(10))
+    for inds in [range(2, 8, 2), [2, 4, 6], [3]]:
+        assert lst[inds_to_slice(inds)] == list(inds)
+    assert inds_to_slice(slice(1, 3)) == slice(1, 3)
+    for inds in [[2, 1], [0, 1, 3], [], [-1, 0]]:
+        assert inds_to_slice(inds) is None
+
+    for inds in [range(0, 20), range(8, 12), [8, 9, 10, 11], [12]]:
+        with raises(IndexError):
+            inds_to_slice(inds, len(lst))
+    assert inds_to_slice(range(8, 10), len(lst)) == slice(8, 10, 1)
+
+def test_list_select():
+
+    lst = ['a', 'b', 'c', 'd']
+    assert list_select(lst, range(0, 4, 2)) == ['a', 'c']
+    assert list_select(lst, [3, 0]) == ['d', 'a']
+
+    for inds in [range(2, 6), [1, 2, 3, 4], [4, 0]]:
+        with raises(IndexError):
+            list_select(lst, inds)
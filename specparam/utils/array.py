@@ -2,6 +2,8 @@
 
 import numpy as np
 
+from specparam.utils.select import inds_to_slice
+
 ###################################################################################################
 ###################################################################################################
 
@@ -64,3 +66,60 @@ def compute_arr_desc(data):
     mean_val = np.nanmean(data)
 
     return min_val, max_val, mean_val
+
+
+def select_view(arr, inds, axis=0):
+    """Select indices from an array, as a read-only view if possible.
+
+    Parameters
+    ----------
+    arr : ndarray
+        Array to select from.
+    inds : slice or range or array_like of int
+        Indices to select.
+    axis : int, optional, default: 0
+        Axis to select along.
+
+    Returns
+    -------
+    ndarray
+        Selected values.
+        If the indices are evenly spaced, this is a read-only view of the input array.
+        Otherwise, this is a copy.
+
+    Raises
+    ------
+    IndexError
+        If any of the indices are out of bounds.
+
+    Notes
+    -----
+    Views share memory with the input array, and so are read-only, such that the input array
+    is not changed. To modify selected values in place, first get a copy with `make_writeable`.
+    """
+
+    slc = inds_to_slice(inds, arr.shape[axis])
+    if slc is None:
+        return np.take(arr, inds, axis=axis)
+
+    view = arr[(slice(None),) * (axis % arr.ndim) + (slc,)]
+    view.flags.writeable = False
+
+    return view
+
+
+def make_writeable(arr):
+    """Get an array that can be modified in place, copying the array if it is read-only.
+
+    Parameters
+    ----------
+    arr : ndarray
+        Array, which may be a read-only view from `select_view`.
+
+    Returns
+    -------
+    ndarray
+        The input array, if writeable, or a copy of it.
+    """
+
+    return arr if arr.flags.writeable else arr.copy()
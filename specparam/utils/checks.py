@@ -234,3 +234,28 @@ def check_all_none(collection):
         output = len(items) == 1 and items == {None}
 
     return output
+
+
+def check_rng(rng=None):
+    """Check a random number generator definition, and convert it to a usable generator.
+
+    Parameters
+    ----------
+    rng : None or int or np.random.SeedSequence or np.random.Generator, optional
+        Definition of the random number generator.
+        If None, the global numpy random state is used.
+        If an int or SeedSequence, a new Generator is initialized from it.
+        If a Generator (or RandomState), it is returned as is.
+
+    Returns
+    -------
+    rng : np.random.Generator or np.random.RandomState or module
+        Random number generator, supporting `normal` and `choice` methods.
+    """
+
+    if rng is None:
+        rng = np.random
+    elif isinstance(rng, (int, np.integer, np.random.SeedSequence)):
+        rng = np.random.default_rng(rng)
+
+    return rng
@@ -143,3 +143,79 @@ def list_insert(lst, inserts, ind):
         lst.insert(ind, inserts)
 
     return lst
+
+
+def inds_to_slice(inds, length=None):
+    """Convert indices to an equivalent slice, if the indices are evenly spaced.
+
+    Parameters
+    ----------
+    inds : slice or range or array_like of int
+        Indices to convert.
+    length : int, optional
+        Length of the sequence the indices select from, to check the indices against.
+
+    Returns
+    -------
+    slice or None
+        Slice equivalent to the indices, or None if the indices are not evenly spaced,
+        in increasing order.
+
+    Raises
+    ------
+    IndexError
+        If the length is provided, and the indices are out of bounds.
+
+    Notes
+    -----
+    Selecting with a slice, rather than with an array of indices, returns a view of an array,
+    rather than a copy, and a copy of a list without indexing each element.
+    """
+
+    if isinstance(inds, slice):
+        return inds
+
+    if isinstance(inds, range):
+        if inds.start < 0 or inds.step <= 0 or not len(inds):
+            return None
+        slc = slice(inds.start, inds.stop, inds.step)
+
+    else:
+        inds = np.asarray(inds)
+        if inds.ndim != 1 or not len(inds) or inds.dtype.kind not in 'iu' or inds[0] < 0:
+            return None
+        step = inds[1] - inds[0] if len(inds) > 1 else 1
+        if step <= 0 or np.any(np.diff(inds) != step):
+            return None
+        slc = slice(int(inds[0]), int(inds[-1] + 1), int(step))
+
+    if length is not None and inds[-1] >= length:
+        raise IndexError("Index {} is out of bounds for length {}.".format(inds[-1], length))
+
+    return slc
+
+
+def list_select(lst, inds):
+    """Select elements from a list.
+
+    Parameters
+    ----------
+    lst : list
+        List to select elements from.
+    inds : slice or range or array_like of int
+        Indices of the elements to select.
+
+    Returns
+    -------
+    list
+        Selected elements.
+
+    Raises
+    ------
+    IndexError
+        If any of the indices are out of bounds.
+    """
+
+    slc = inds_to_slice(inds, len(lst))
+
+    return lst[slc] if slc is not None else [lst[ind] for ind in inds]